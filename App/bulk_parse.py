@@ -0,0 +1,165 @@
+# App/bulk_parse.py
+import gzip
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from App.config import STAT_COLUMNS
+from App.match_storage import STRING_COLUMNS, DICTIONARY_COLUMNS
+from App.page_archive import match_id_for, match_info_from_columns, match_params, zstandard
+from App.stats_store import PlayerStatStore
+
+PAGE_SUFFIXES = ('.html', '.htm', '.html.gz', '.html.zst')
+
+# Per-process scraper, created once by the pool initializer
+_worker_scraper = None
+
+
+def _init_worker(parser):
+    global _worker_scraper
+    from App.scraper import LENScraper
+    _worker_scraper = LENScraper(parser=parser)
+
+
+def read_page(path, compression=None):
+    """Raw bytes of a saved page, decompressing .gz / .zst files"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if compression == 'gzip' or (compression is None and path.endswith('.gz')):
+        return gzip.decompress(data)
+    if compression == 'zstd' or (compression is None and path.endswith('.zst')):
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def columns_to_batch(columns):
+    """
+    Compact columnar batch of a parsed match (LENScraper.parse_match_columns):
+    text columns as lists, stat columns as int32 arrays. Much cheaper to send
+    back from a worker than every scraped text column.
+    """
+    batch = {name: [str(value) for value in columns[name]]
+             for name in STRING_COLUMNS + DICTIONARY_COLUMNS if name in columns}
+    for name in STAT_COLUMNS:
+        if name in columns:
+            batch[name] = np.asarray(columns[name], dtype=np.int32)
+    return batch
+
+
+def parse_page_job(job):
+    """
+    Worker: parse one saved page
+
+    Args:
+        job: (match_id, match_url, path, compression)
+
+    Returns:
+        (match_id, match_info, columns), match_info and columns are None when
+        the page has no player stats
+    """
+    match_id, match_url, path, compression = job
+    if _worker_scraper is None:
+        _init_worker(None)
+
+    # Straight to columns, no DataFrame is built in the worker
+    columns = _worker_scraper.parse_match_columns(read_page(path, compression), match_url)
+    if not columns:
+        return match_id, None, None
+
+    entry = {'url': match_url, 'params': match_params(match_url)}
+    return match_id, match_info_from_columns(entry, columns), columns_to_batch(columns)
+
+
+def bulk_parse(jobs, max_workers=None, parser=None, chunksize=4):
+    """
+    Parse saved pages across a process pool
+
+    Yields:
+        (match_id, match_info, columns) in job order
+    """
+    jobs = list(jobs)
+    if max_workers == 1 or len(jobs) <= 1:
+        _init_worker(parser)
+        for job in jobs:
+            yield parse_page_job(job)
+        return
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(parser,)) as executor:
+        yield from executor.map(parse_page_job, jobs, chunksize=chunksize)
+
+
+def directory_jobs(directory, urls=None):
+    """
+    Jobs for every saved page in a directory
+
+    Match URLs come from the urls dict or a urls.json ({file name: match URL})
+    in the directory; pages without one are parsed with the file name as match id.
+    """
+    if urls is None:
+        urls_path = os.path.join(directory, 'urls.json')
+        urls = {}
+        if os.path.exists(urls_path):
+            with open(urls_path, encoding='utf-8') as f:
+                urls = json.load(f)
+
+    jobs = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(PAGE_SUFFIXES):
+            continue
+        match_url = urls.get(name, '')
+        match_id = match_id_for(match_url) if match_url else name.split('.')[0]
+        jobs.append((match_id, match_url, os.path.join(directory, name), None))
+    return jobs
+
+
+def archive_jobs(archive, entries=None):
+    """
+    Jobs for pages of a PageArchive, read straight from its object files
+
+    entries: index entries to parse, in job order; every archived page (by key) when None
+    """
+    if entries is None:
+        entries = sorted(archive.entries().values(), key=lambda e: e['key'])
+    return [
+        (match_id_for(entry['url']), entry['url'],
+         archive.object_path(entry['sha256'], entry['compression']), entry['compression'])
+        for entry in entries
+    ]
+
+
+def bulk_parse_to_store(jobs, store=None, max_workers=None, parser=None):
+    """
+    Parse saved pages in parallel and merge the batches into a PlayerStatStore
+
+    Returns:
+        (store, {match_id: match_info})
+    """
+    store = store or PlayerStatStore()
+    infos = {}
+    matches = []
+    for match_id, match_info, columns in bulk_parse(jobs, max_workers, parser):
+        if columns is None:
+            print(f"No player stats in saved page for {match_id}")
+            continue
+        infos[match_id] = match_info
+        matches.append((match_id, match_info['name'], columns))
+
+    store.add_matches(matches)
+    return store, infos
+
+
+if __name__ == "__main__":
+    # Bulk re-parse a directory of saved pages: python -m App.bulk_parse <directory> [workers] [parser]
+    directory = sys.argv[1]
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    parser = sys.argv[3] if len(sys.argv) > 3 else None
+
+    jobs = directory_jobs(directory)
+    start = time.perf_counter()
+    store, infos = bulk_parse_to_store(jobs, max_workers=workers, parser=parser)
+    print(f"Parsed {len(jobs)} pages ({len(infos)} with stats, {len(store)} player rows) "
+          f"in {time.perf_counter() - start:.2f}s")
@@ -1,4 +1,6 @@
 # App/config.py
+import os
+
 SCORING_RULES = {
     "Goal": 5,
     "Assist": 3,
@@ -98,4 +100,119 @@ POSITION_FLEXIBILITY = {
         'center': 2,      # Max 2 Cs total
         'field': 7        # Max 7 Field total (5 starters + 2 bench)
     }
-}
\ No newline at end of file
+}
+
+# Share of a player's points that counts toward the user's weekly score
+LINEUP_WEIGHTS = {
+    'starter': 1,
+    'bench': 0       # Bench players only score when subbed in
+}
+
+# Bench players replace starters who did not play (no stat row for the week,
+# or 0 seconds in a match that records minutes). A bench player can come in for
+# a starter whose position lists the bench player's position.
+AUTO_SUBSTITUTION = {
+    'enabled': True,
+    'compatible': {
+        'goalkeeper': ['goalkeeper'],
+        'center': ['center', 'field'],
+        'field': ['field', 'center']
+    }
+}
+
+# PLAYER STAT STORE
+STAT_COLUMNS = ['goals', 'assists', 'steals', 'blocks', 'saves', 'exclusions_drawn',
+                'shots', 'seconds_played', 'turnover_fouls', 'sprints_won', 'exclusions',
+                'penalties', 'shots_faced']
+
+# PLAYER PROJECTIONS
+PROJECTION_SETTINGS = {
+    'window': 4,          # Matches in the rolling average
+    'halflife': 2.0,      # Matches for an observation's EWMA weight to halve
+    'prior_matches': 2    # Position baseline counts as this many matches of shrinkage
+}
+
+# SEASON SIMULATION (playoff odds)
+SIMULATION_SETTINGS = {
+    'trials': 20000,       # Simulated seasons per league
+    'chunk_trials': 2000,  # Trials sampled per batch (bounds memory)
+    'workers': None,       # Processes for the batches, None for one per CPU core
+    'playoff_teams': 4     # Top seeds in a single-elimination playoff
+}
+
+# Stat column scored by each SCORING_RULES entry
+SCORING_STAT_COLUMNS = {
+    "Goal": 'goals',
+    "Assist": 'assists',
+    "Steal": 'steals',
+    "Block": 'blocks',
+    "Save": 'saves',
+    "Exclusion Drawn": 'exclusions_drawn'
+}
+
+# MATCH STORAGE (Arrow IPC files partitioned by season and week)
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Data')
+CURRENT_SEASON = '2526'
+STATS_STORAGE_DIR = os.path.join(DATA_DIR, 'stats')
+
+# SCRAPER
+SCRAPER_SETTINGS = {
+    'max_concurrent_fetches': 8,  # Match pages fetched in parallel per round
+    'request_timeout': (5, 30),   # (connect, read) seconds for every request
+    'final_match_status': '2',    # "st" match URL parameter of finished matches
+    'html_parser': 'lxml',        # 'html.parser', 'lxml' or 'selectolax' (falls back to html.parser)
+    'parser_version': 2,          # Bump when parsing changes, cached parses of older versions are redone
+    'archive_compression': 'zstd', # 'zstd' (falls back to gzip without zstandard) or 'gzip'
+    'requests_per_second': 5,     # Token bucket rate shared by all fetch workers
+    'request_burst': 8,           # Requests allowed at once before pacing kicks in
+    'max_retries': 3,             # Retries on 5xx / 429 / timeouts / connection errors
+    'backoff_base': 0.5,          # Seconds, doubled per retry (full jitter)
+    'backoff_max': 8.0,           # Cap on a single backoff wait
+    'breaker_failures': 5,        # Consecutive failures that open a host's circuit
+    'breaker_reset': 60.0,        # Seconds an open circuit rejects requests before a probe
+    'live_poll_interval': 30      # Seconds between live match-day polls
+}
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, 'http_cache')
+
+# Fantasy week -> LEN rounds played in it (the "gr" match URL parameter). The
+# results page lists the whole season; a week's refresh only keeps its rounds.
+# Week 1 is round 2 (NBG - JSP on 02.12.2025, gr=2); add weeks as rounds are scheduled.
+WEEK_ROUNDS = {
+    1: ['2'],
+}
+
+# Raw match page archive and scrape manifest, entries keyed by these match URL parameters
+PAGE_ARCHIVE_DIR = os.path.join(DATA_DIR, 'pages')
+SCRAPE_MANIFEST_PATH = os.path.join(DATA_DIR, 'scrape_manifest.json')
+ARCHIVE_KEY_PARAMS = ['c', 'g', 't', 's1', 's2', 'sch']
+
+# LEN stats table header -> (column name(s), kind)
+# kinds: text, int, minutes ("MM:SS" -> seconds), made_attempted ("3/6" -> two columns)
+# Headers not listed here are kept as text columns named col_<header>
+PLAYER_TABLE_HEADERS = {
+    'N.': ('jersey', 'text'),
+    'PLAYER': ('player', 'text'),
+    'MIN': ('seconds_played', 'minutes'),
+    'TOTAL': (('goals', 'shots'), 'made_attempted'),
+    'A': (('action_goals', 'action_shots'), 'made_attempted'),
+    'C': (('centre_goals', 'centre_shots'), 'made_attempted'),
+    'X': (('extra_player_goals', 'extra_player_shots'), 'made_attempted'),
+    '6M': (('six_metre_goals', 'six_metre_shots'), 'made_attempted'),
+    'PS': (('penalty_goals', 'penalty_shots'), 'made_attempted'),
+    'CA': (('counter_attack_goals', 'counter_attack_shots'), 'made_attempted'),
+    'PSO': (('shootout_goals', 'shootout_shots'), 'made_attempted'),
+    'AS': ('assists', 'int'),
+    'TF': ('turnover_fouls', 'int'),
+    'ST': ('steals', 'int'),
+    'BL': ('blocks', 'int'),
+    'SP': ('sprints_won', 'int'),
+    'EX': ('exclusions', 'int'),
+    'P': ('penalties', 'int'),
+}
+
+GOALKEEPER_TABLE_HEADERS = {
+    'N.': ('jersey', 'text'),
+    'PLAYER': ('player', 'text'),
+    'MIN': ('seconds_played', 'minutes'),
+    'TOTAL': (('saves', 'shots_faced'), 'made_attempted'),
+}
@@ -1,13 +1,118 @@
 # App/data_manager.py - COMPLETE UPDATED VERSION WITH ALL STATS FROM WEBSITE
+import numpy as np
 import pandas as pd
+from App.config import CURRENT_SEASON
+from App.match_storage import match_storage
+from App.projections import ProjectionEngine
+from App.stats_store import PlayerStatStore, PlayerPointsLookup
 
 
 class MatchDataManager:
     """Manages match data from multiple games with ALL STATS"""
 
-    def __init__(self):
+    def __init__(self, storage=None, season=CURRENT_SEASON):
         self.all_matches = {}
-        self.load_default_matches()
+        self.storage = storage or match_storage
+        self.season = season
+        self.loaded_weeks = []
+        self.projections = None  # ProjectionEngine over every stored week, see get_projections()
+
+        # Prefer the latest stored week, fall back to the built-in Week 1 data
+        if not self.load_weeks(self.storage.weeks(season)[-1:]):
+            self.load_default_matches()
+
+    def load_weeks(self, weeks, season=None):
+        """
+        Load only the given weeks from match storage
+
+        Returns False (and keeps the current data) if none of the weeks are stored
+        """
+        season = season or self.season
+        weeks = sorted(set(int(week) for week in weeks))
+        if weeks and weeks == self.loaded_weeks and season == self.season:
+            return True
+
+        stored = list(self.storage.read_weeks(season, weeks)) if weeks else []
+        if not stored:
+            return False
+
+        if season != self.season:
+            self.projections = None
+        self.season = season
+        self.loaded_weeks = weeks
+        self.all_matches = {match_id: info for match_id, info, _ in stored}
+        self.build_store((match_id, info['name'], columns) for match_id, info, columns in stored)
+        return True
+
+    def refresh_week(self, week, scraper=None, manifest=None):
+        """
+        Incrementally scrape a week and store the matches that are new or changed
+
+        Only the changed matches are rewritten in storage; the week is then reloaded.
+        The default scraper caches responses and archives every fetched match
+        page with its week, so the week can be re-parsed offline later
+        (python -m App.page_archive).
+
+        Returns:
+            list of match ids updated
+        """
+        from App.http_cache import HTTPCache
+        from App.page_archive import PageArchive, match_info_from_frame, match_params
+        from App.scrape_manifest import ScrapeManifest
+        from App.scraper import LENScraper
+
+        scraper = scraper or LENScraper(cache=HTTPCache(), archive=PageArchive())
+        manifest = manifest or ScrapeManifest()
+
+        updated = []
+        for match_url, df in scraper.refresh_week(week, manifest).items():
+            if df.empty:
+                continue
+            match_id = manifest.get(match_url)['match_id']
+            match_info = match_info_from_frame({'url': match_url, 'params': match_params(match_url)}, df)
+            self.storage.write_match(self.season, week, match_id, match_info, df)
+            updated.append(match_id)
+
+        if updated:
+            if self.projections is not None and week in self.projections.weeks:
+                self.projections = None  # a week already folded in changed
+            self.loaded_weeks = []  # force the week to be read again
+            self.load_weeks([week])
+        return updated
+
+    def apply_live_deltas(self, deltas):
+        """
+        Apply LivePoller stat deltas to the loaded store without rebuilding it
+
+        Only the changed players are rescored; new matches are added with their
+        live score. Cached views are dropped so the next read sees the update.
+
+        Returns:
+            list of deltas that couldn't be applied (see PlayerStatStore.apply_deltas)
+        """
+        unplaced = self.store.apply_deltas(deltas)
+
+        touched = {}
+        for delta in deltas:
+            touched.setdefault(delta['match_id'], delta['match_name'])
+        for match_id, match_name in touched.items():
+            if match_id not in self.store.match_rows:
+                continue
+            rows = self.store.match_rows[match_id]
+            team_codes = np.asarray(self.store.categoricals['team_code'][rows], dtype=object)
+            team_full = np.asarray(self.store.categoricals['team_full'][rows], dtype=object)
+            goals = self.store.stat('goals')[rows]
+            codes = list(dict.fromkeys(team_codes))
+
+            info = self.all_matches.setdefault(match_id, {'id': match_id, 'name': match_name, 'date': ''})
+            info['teams'] = [team_full[team_codes == code][0] for code in codes]
+            info['score'] = '-'.join(str(int(goals[team_codes == code].sum())) for code in codes)
+
+        self._match_frames = {}
+        self._all_players_frame = None
+        self._points_lookups = {}
+        self._played_lookup = None
+        return unplaced
 
     def load_default_matches(self):
         """Load all eight matches for Week 1 with complete stats"""
@@ -350,6 +455,25 @@ class MatchDataManager:
             }
         }
 
+        self.loaded_weeks = [1]
+        self.build_store()
+
+    def build_store(self, matches=None):
+        """
+        Build the columnar stat store and drop cached views
+
+        matches: iterable of (match_id, match_name, columns), defaults to all_matches
+        """
+        if matches is None:
+            self.store = PlayerStatStore.from_matches(self.all_matches)
+        else:
+            self.store = PlayerStatStore()
+            self.store.add_matches(matches)
+        self._match_frames = {}
+        self._all_players_frame = None
+        self._points_lookups = {}
+        self._played_lookup = None
+
     def get_match_ids(self):
         """Return list of available match IDs"""
         return list(self.all_matches.keys())
@@ -365,92 +489,124 @@ class MatchDataManager:
         if match_id not in self.all_matches:
             return pd.DataFrame()
 
-        match = self.all_matches[match_id]
-        players = match['players']
-
-        df = pd.DataFrame(players, columns=[
-            'jersey', 'player', 'team_code', 'goals', 'assists', 'steals',
-            'blocks', 'saves', 'position', 'team_full'
-        ])
+        if match_id not in self._match_frames:
+            rows = self.store.match_rows[match_id]
+            # Sort by points
+            order = self.store.sorted_rows(np.arange(rows.start, rows.stop),
+                                           ['fantasy_points', 'goals', 'assists'])
+            df = self.store.frame().iloc[order].drop(columns=['match_id', 'match_name'])
+            df.index = order - rows.start
+            self._match_frames[match_id] = df
 
-        # Calculate fantasy points
-        df['fantasy_points'] = (
-                df['goals'] * 5 +
-                df['assists'] * 3 +
-                df['steals'] * 2 +
-                df['blocks'] * 2 +
-                df['saves'] * 2
-        )
-
-        # Sort by points
-        df = df.sort_values(['fantasy_points', 'goals', 'assists'], ascending=[False, False, False])
-
-        return df
+        return self._match_frames[match_id]
 
     def get_all_players_dataframe(self):
         """Get all players from all matches combined - SORTED GLOBALLY"""
-        all_dfs = []
-        for match_id in self.get_match_ids():
-            match = self.all_matches[match_id]
-            players = match['players']
-
-            # Create DataFrame for this match
-            df = pd.DataFrame(players, columns=[
-                'jersey', 'player', 'team_code', 'goals', 'assists', 'steals',
-                'blocks', 'saves', 'position', 'team_full'
-            ])
-
-            # Calculate fantasy points
-            df['fantasy_points'] = (
-                    df['goals'] * 5 +
-                    df['assists'] * 3 +
-                    df['steals'] * 2 +
-                    df['blocks'] * 2 +
-                    df['saves'] * 2
-            )
-
-            df['match_id'] = match_id
-            df['match_name'] = match['name']
-            all_dfs.append(df)
-
-        if all_dfs:
-            combined_df = pd.concat(all_dfs, ignore_index=True)
+        if len(self.store) == 0:
+            return pd.DataFrame()
+
+        if self._all_players_frame is None:
             # Sort ALL players by fantasy points GLOBALLY
-            combined_df = combined_df.sort_values(
-                ['fantasy_points', 'goals', 'assists', 'steals', 'saves'],
-                ascending=[False, False, False, False, False]
-            ).reset_index(drop=True)
-            return combined_df
-        return pd.DataFrame()
+            order = self.store.sorted_rows(np.arange(len(self.store)),
+                                           ['fantasy_points', 'goals', 'assists', 'steals', 'saves'])
+            self._all_players_frame = self.store.frame().iloc[order].reset_index(drop=True)
+
+        return self._all_players_frame
 
     def get_player_pool(self):
         """Get combined player pool from all matches for team building"""
         return self.get_all_players_dataframe()
 
+    def get_projections(self):
+        """
+        Projected points for every player from the season's stored weeks
+
+        The ProjectionEngine is kept between calls and only the weeks stored
+        since the last call are folded in. Without stored weeks the loaded
+        (built-in) matches are used as week 1.
+        """
+        stored = self.storage.weeks(self.season)
+        if self.projections is not None:
+            new_weeks = [week for week in stored if week not in self.projections.weeks]
+            if new_weeks and min(new_weeks) < max(self.projections.weeks):
+                self.projections = None  # an earlier week landed late, replay in order
+
+        if self.projections is None:
+            self.projections = ProjectionEngine()
+            if not stored:
+                self.projections.add_week(1, (PlayerStatStore.columns_from_rows(match['players'])
+                                              for match in self.all_matches.values() if 'players' in match))
+
+        for week in stored:
+            if week not in self.projections.weeks:
+                self.projections.add_week(week, (columns for _, _, columns in
+                                                 self.storage.read_weeks(self.season, [week])))
+        return self.projections.frame()
+
+    def get_projection_pool(self):
+        """Player pool with a projected_points column (0 for players without a projection)"""
+        projections = self.get_projections()[['player', 'team_code', 'projected_points', 'points_std']]
+        pool = self.get_player_pool().merge(projections, on=['player', 'team_code'], how='left')
+        return pool.fillna({'projected_points': 0.0, 'points_std': 0.0})
+
+    def get_points_lookup(self, match_id=None):
+        """
+        Get the shared {(player, team_code): fantasy_points} lookup
+
+        match_id: restrict to one match, or None / "all" for every loaded match
+        """
+        if match_id == "all":
+            match_id = None
+        if match_id is not None and match_id not in self.all_matches:
+            match_id = None
+
+        if match_id not in self._points_lookups:
+            self._points_lookups[match_id] = PlayerPointsLookup(self.store, match_id)
+        return self._points_lookups[match_id]
+
+    def get_played_lookup(self):
+        """
+        {(player, team_code): played} for every player in the loaded matches
+
+        A player with a row played unless their match records minutes and they
+        have 0 seconds (the built-in data has no minutes, so every row counts).
+        Players without a row aren't in the lookup and didn't play.
+        """
+        if self._played_lookup is None:
+            store = self.store
+            seconds = store.stat('seconds_played')
+            match_has_minutes = np.zeros(len(store), dtype=bool)
+            for rows in store.match_rows.values():
+                match_has_minutes[rows] = seconds[rows].any()
+            row_played = ~match_has_minutes | (seconds > 0)
+
+            played = np.zeros(len(store.player_names), dtype=bool)
+            np.logical_or.at(played, store.player_id, row_played)
+            self._played_lookup = {key: bool(played[player_id]) for key, player_id in store.player_keys.items()}
+        return self._played_lookup
+
     def calculate_weekly_totals(self, selected_players):
         """
         Calculate total fantasy points for selected players across all matches
         selected_players: list of (player_name, team_code) tuples
         """
-        all_players_df = self.get_all_players_dataframe()
+        points_lookup = self.get_points_lookup()
+        match_names = self.store.categoricals['match_name']
 
         total_points = 0
         player_details = []
 
         for player_name, team_code in selected_players:
-            player_data = all_players_df[
-                (all_players_df['player'] == player_name) &
-                (all_players_df['team_code'] == team_code)
-                ]
-
-            if not player_data.empty:
-                player_row = player_data.iloc[0]
-                total_points += player_row['fantasy_points']
+            row = points_lookup.row((player_name, team_code))
+
+            if row >= 0:
+                points = self.store.fantasy_points[row].item()
+                total_points += points
                 player_details.append({
                     'player': player_name,
                     'team': team_code,
-                    'points': player_row['fantasy_points'],
-                    'match': player_row['match_name']
+                    'points': points,
+                    'match': match_names[row]
                 })
 
         return total_points, player_details
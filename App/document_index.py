@@ -0,0 +1,106 @@
+# App/document_index.py
+import re
+
+GOALKEEPER_SECTION = re.compile(r'GOALKEEPER', re.I)
+FIELD_TABLE_CLASSES = re.compile(r'player-stats|stats-table', re.I)
+GOALKEEPER_TABLE_CLASSES = re.compile(r'goalkeeper|gk', re.I)
+TEAM_NAME_CLASSES = re.compile(r'team-name|team-title', re.I)
+
+
+class MatchDocumentIndex:
+    """
+    Stats tables of a match page with their team and role
+
+    Built from one walk over the page outline (headings, team/section titles
+    and tables in document order, see backend.outline()). A team heading starts
+    that team's section and a "GOALKEEPERS" heading switches it to goalkeeper
+    tables, so every table gets its team and role without searching the table
+    markup or the elements before it.
+
+    The first two team name elements are the match header (home, away); they
+    give the team names but don't start a section. Tables that come before any
+    team heading are assigned by order: first home, then away.
+    """
+
+    def __init__(self, backend, document, home_code='', away_code='', home_full='', away_full=''):
+        self.backend = backend
+        self.team_names = {'home': '', 'away': ''}
+        self.tables = []  # [{'table', 'team_code', 'team_full', 'role'}] in document order
+        self._by_team_role = {}
+
+        outline = [(node, backend.tag(node), backend.classes(node)) for node in backend.outline(document)]
+
+        # Team names from the first two team name/title elements
+        titles = [i for i, (node, tag, classes) in enumerate(outline)
+                  if tag != 'table' and TEAM_NAME_CLASSES.search(classes)][:2]
+        if len(titles) == 2:
+            self.team_names['home'], self.team_names['away'] = (backend.text(outline[i][0]) for i in titles)
+            # Back to back they are the match header rather than section headings
+            if not any(tag == 'table' for _, tag, _ in outline[titles[0]:titles[1]]):
+                outline = [entry for i, entry in enumerate(outline) if i not in titles]
+
+        self.teams = [
+            (home_code, home_full or self.team_names['home'] or home_code),
+            (away_code, away_full or self.team_names['away'] or away_code),
+        ]
+        self._index(outline)
+
+    def _match_team(self, text):
+        """Team index (0 home, 1 away) a heading names, or None"""
+        text = text.upper()
+        for i, (code, full) in enumerate(self.teams):
+            if code and re.search(rf'\b{re.escape(code.upper())}\b', text):
+                return i
+            if full and (full.upper() in text or (len(text) > 3 and text in full.upper())):
+                return i
+        return None
+
+    def _index(self, outline):
+        team = None
+        role = 'field'
+        seen = {'field': 0, 'goalkeeper': 0}
+
+        for node, tag, classes in outline:
+            if tag != 'table':
+                text = self.backend.text(node)
+                if GOALKEEPER_SECTION.search(text):
+                    role = 'goalkeeper'
+                    continue
+                named = self._match_team(text)
+                if named is not None:
+                    team = named
+                    role = 'field'
+                continue
+
+            table_role = self._table_role(node, classes, role)
+            if table_role is None:
+                continue
+
+            # Without a team heading, the n-th table of a role belongs to the n-th team
+            table_team = team if team is not None else min(seen[table_role], 1)
+            seen[table_role] += 1
+
+            code, full = self.teams[table_team]
+            entry = {'table': node, 'team_code': code, 'team_full': full, 'role': table_role}
+            self.tables.append(entry)
+            self._by_team_role.setdefault((code, table_role), []).append(entry)
+
+    def _table_role(self, node, classes, section_role):
+        """'field' / 'goalkeeper' for stats tables, None for any other table"""
+        if GOALKEEPER_TABLE_CLASSES.search(classes):
+            return 'goalkeeper'
+        if FIELD_TABLE_CLASSES.search(classes):
+            return section_role
+        # Unclassed tables count when their header row names players
+        rows = self.backend.rows(node)
+        if rows and any(self.backend.text(cell).upper() == 'PLAYER' for cell in rows[0]):
+            return section_role
+        return None
+
+    def lookup(self, team_code, role='field'):
+        """Tables of one team and role"""
+        return [entry['table'] for entry in self._by_team_role.get((team_code, role), [])]
+
+    def role_tables(self, role):
+        """Index entries of every table with the given role"""
+        return [entry for entry in self.tables if entry['role'] == role]
@@ -0,0 +1,141 @@
+# App/html_backends.py
+import re
+
+from bs4 import BeautifulSoup
+from App.config import SCRAPER_SETTINGS
+
+# Elements that structure a match page: headings, team/section titles and tables
+OUTLINE_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'table']
+OUTLINE_CLASSES = ['team-name', 'team-title', 'section-title']
+
+
+class SoupBackend:
+    """BeautifulSoup tree built with html.parser or lxml"""
+
+    is_soup = True
+
+    def __init__(self, features):
+        self.name = features
+        self.features = features
+        if features == 'lxml':
+            import lxml  # noqa: F401 - fail early when lxml isn't installed
+
+    def parse(self, content):
+        return BeautifulSoup(content, self.features)
+
+    def tables(self, document):
+        return document.find_all('table')
+
+    def outline(self, document):
+        """Headings, team/section titles and tables in document order"""
+        class_pattern = re.compile('|'.join(OUTLINE_CLASSES))
+        return document.find_all(
+            lambda tag: tag.name in OUTLINE_TAGS or bool(class_pattern.search(' '.join(tag.get('class', []))))
+        )
+
+    def links(self, document):
+        return [a['href'] for a in document.find_all('a', href=True)]
+
+    def tag(self, node):
+        return node.name
+
+    def classes(self, node):
+        return ' '.join(node.get('class', []))
+
+    def rows(self, table):
+        """Cell nodes of every row of a table"""
+        return [row.find_all(['td', 'th']) for row in table.find_all('tr')]
+
+    def text(self, cell):
+        return cell.get_text(strip=True)
+
+    def table_rows(self, table):
+        """Cell texts of every row of a table"""
+        return [[self.text(cell) for cell in row] for row in self.rows(table)]
+
+
+class SelectolaxBackend:
+    """selectolax (lexbor) tree - C parser, no BeautifulSoup API"""
+
+    is_soup = False
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def parse(self, content):
+        return self._parser(content)
+
+    def tables(self, document):
+        return document.css('table')
+
+    def outline(self, document):
+        """Headings, team/section titles and tables in document order"""
+        selector = ', '.join(OUTLINE_TAGS + [f'[class*="{name}"]' for name in OUTLINE_CLASSES])
+        # lexbor returns a node once per selector it matches
+        nodes = {}
+        for node in document.css(selector):
+            nodes.setdefault(node.mem_id, node)
+        return list(nodes.values())
+
+    def links(self, document):
+        return [node.attributes.get('href') for node in document.css('a[href]')]
+
+    def tag(self, node):
+        return node.tag
+
+    def classes(self, node):
+        return node.attributes.get('class') or ''
+
+    def rows(self, table):
+        """Cell nodes of every row of a table"""
+        return [row.css('td, th') for row in table.css('tr')]
+
+    def text(self, cell):
+        return cell.text(strip=True)
+
+    def table_rows(self, table):
+        """Cell texts of every row of a table"""
+        return [[self.text(cell) for cell in row] for row in self.rows(table)]
+
+
+PARSER_BACKENDS = {
+    'html.parser': lambda: SoupBackend('html.parser'),
+    'lxml': lambda: SoupBackend('lxml'),
+    'selectolax': SelectolaxBackend,
+}
+
+
+def available_backends():
+    """Names of the parser backends whose dependencies are installed"""
+    names = []
+    for name, factory in PARSER_BACKENDS.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend(name=None, require_soup=False):
+    """
+    Get a parser backend by name, defaults to SCRAPER_SETTINGS['html_parser']
+
+    Falls back to the pure-Python html.parser when the requested backend's
+    dependency is missing (or isn't BeautifulSoup-based and require_soup is set).
+    """
+    name = name or SCRAPER_SETTINGS['html_parser']
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend '{name}', choose from {list(PARSER_BACKENDS)}")
+
+    try:
+        backend = PARSER_BACKENDS[name]()
+    except ImportError:
+        print(f"HTML parser backend '{name}' is not installed, using html.parser")
+        return SoupBackend('html.parser')
+
+    if require_soup and not backend.is_soup:
+        return get_backend('lxml')
+    return backend
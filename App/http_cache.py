@@ -0,0 +1,113 @@
+# App/http_cache.py
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+from App.config import HTTP_CACHE_DIR, SCRAPER_SETTINGS
+
+
+class HTTPCache:
+    """
+    On-disk response cache keyed by URL
+
+    Each entry keeps the body plus ETag / Last-Modified so refetches can be
+    conditional GETs. Entries marked final (finished matches) are served
+    straight from disk together with their parsed DataFrame, so re-scoring a
+    finished round costs no bandwidth and no parsing.
+
+    Layout: <root>/<sha256(url)>.json (metadata), .body (raw bytes),
+    .parsed.v<parser_version>.pkl (so a parser change never serves old parses)
+    """
+
+    def __init__(self, root=HTTP_CACHE_DIR):
+        self.root = root
+
+    def _path(self, url, suffix):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.root, f"{key}{suffix}")
+
+    def _write(self, path, data, mode='wb'):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, mode) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, url):
+        """Metadata for a cached URL, or None"""
+        path = self._path(url, '.json')
+        if not os.path.exists(path) or not os.path.exists(self._path(url, '.body')):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def read_body(self, url):
+        with open(self._path(url, '.body'), 'rb') as f:
+            return f.read()
+
+    def is_final(self, url):
+        entry = self.get(url)
+        return bool(entry and entry.get('final'))
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since headers for a cached URL"""
+        entry = self.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, response, final=False):
+        """Store a 200 response body with its validators"""
+        self._write(self._path(url, '.body'), response.content)
+        # A new body invalidates any earlier parse of this URL
+        parsed_path = self._parsed_path(url)
+        if os.path.exists(parsed_path):
+            os.remove(parsed_path)
+        self._write_entry(url, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'size': len(response.content),
+            'fetched_at': time.time(),
+            'validated_at': time.time(),
+            'final': final
+        })
+
+    def touch(self, url, final=None):
+        """Record a 304 revalidation (and optionally finality) for a cached URL"""
+        entry = self.get(url)
+        if entry is None:
+            return
+        entry['validated_at'] = time.time()
+        if final is not None:
+            entry['final'] = final
+        self._write_entry(url, entry)
+
+    def mark_final(self, url, final=True):
+        self.touch(url, final=final)
+
+    def _write_entry(self, url, entry):
+        self._write(self._path(url, '.json'), json.dumps(entry), mode='w')
+
+    def _parsed_path(self, url):
+        return self._path(url, f".parsed.v{SCRAPER_SETTINGS['parser_version']}.pkl")
+
+    def store_parsed(self, url, df):
+        """Keep the parsed DataFrame of a cached page (empty or failed parses are not kept)"""
+        if df is None or df.empty or self.get(url) is None:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        df.to_pickle(self._parsed_path(url))
+
+    def read_parsed(self, url):
+        """Parsed DataFrame of a cached page from the current parser version, or None"""
+        path = self._parsed_path(url)
+        if not os.path.exists(path):
+            return None
+        return pd.read_pickle(path)
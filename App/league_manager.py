@@ -1,7 +1,10 @@
 # App/league_manager.py
 import streamlit as st
 from datetime import datetime  # ADD THIS IMPORT
+from App.live_scoring import LiveScoringService
 from App.matchup_manager import MatchupManager
+from App.schedule import SeasonSchedule
+from App.season_simulator import SeasonSimulator
 
 
 class FantasyLeague:
@@ -11,6 +14,7 @@ class FantasyLeague:
         self.league_name = league_name
         self.users = {}  # {user_id: {name: "", team_name: "", lineups: {}}}
         self.matchup_manager = MatchupManager()
+        self._playoff_odds = None  # (key, projections, odds), see get_playoff_odds()
         self.load_from_session()
 
     def load_from_session(self):
@@ -28,14 +32,21 @@ class FantasyLeague:
         self.matchup_manager.matchups = league_data.get('matchups', [])
         self.matchup_manager.scores = league_data.get('scores', {})
         self.matchup_manager.current_week = league_data.get('current_week', 1)
+        schedule = league_data.get('schedule')
+        self.matchup_manager.schedule = SeasonSchedule.from_dict(schedule) if schedule else None
+        self.matchup_manager.reset_standings()
+        self._playoff_odds = None
 
     def save_to_session(self):
         """Save league data to Streamlit session state"""
+        # Every change to users, lineups, matchups or scores is saved through here
+        self._playoff_odds = None
         st.session_state.fantasy_league = {
             'users': self.users,
             'matchups': self.matchup_manager.matchups,
             'scores': self.matchup_manager.scores,
-            'current_week': self.matchup_manager.current_week
+            'current_week': self.matchup_manager.current_week,
+            'schedule': self.matchup_manager.schedule.to_dict() if self.matchup_manager.schedule else None
         }
 
     def add_user(self, user_id, name, team_name=""):
@@ -93,6 +104,12 @@ class FantasyLeague:
                 week_lineups[user_id] = lineup
         return week_lineups
 
+    def create_season_schedule(self, double=False, start_week=1, seed=None):
+        """Generate the season's schedule for the current users"""
+        schedule = self.matchup_manager.create_season_schedule(list(self.users.keys()), double, start_week, seed)
+        self.save_to_session()
+        return schedule
+
     def create_weekly_matchups(self, week=None):
         """Create matchups for a week"""
         user_ids = list(self.users.keys())
@@ -101,17 +118,16 @@ class FantasyLeague:
         # Store matchups
         if week is not None:
             # Remove existing matchups for this week
-            self.matchup_manager.matchups = [
-                m for m in self.matchup_manager.matchups if m['week'] != week
-            ]
+            if self.matchup_manager.remove_week(week):
+                self.matchup_manager.reset_standings()
 
-        self.matchup_manager.matchups.extend(matchups)
+        self.matchup_manager.add_matchups(matchups)
         self.save_to_session()
 
         return matchups
 
-    def calculate_weekly_scores(self, week, player_points_data):
-        """Calculate scores for all users in a week"""
+    def calculate_weekly_scores(self, week, player_points_data, played=None):
+        """Calculate scores for all users in a week (played: see MatchupManager.calculate_matchup_scores)"""
         lineups = {}
         for user_id in self.users:
             lineup_data = self.get_lineup(user_id, week)
@@ -122,15 +138,52 @@ class FantasyLeague:
             week,
             list(self.users.keys()),
             lineups,
-            player_points_data
+            player_points_data,
+            played=played
         )
         self.save_to_session()
         return scores
 
+    def start_live_scoring(self, week, player_points_data, service=None):
+        """
+        Keep the week's scores, matchups and standings live
+
+        Registers the league's lineups with a LiveScoringService (a new one, or a
+        shared one covering other leagues) and seeds only this league's rosters
+        with the points so far. Feed it LivePoller deltas with service.apply_deltas().
+        """
+        service = service or LiveScoringService(week)
+        service.add_league(self.league_name, self.matchup_manager, self.users, self.get_all_lineups(week))
+        service.seed(player_points_data, league_id=self.league_name)
+        return service
+
     def get_standings(self):
         """Get current league standings"""
         return self.matchup_manager.get_standings(self.users, self.matchup_manager.matchups)
 
+    def get_playoff_odds(self, projections, trials=None, seed=None):
+        """
+        Playoff and title odds from a Monte Carlo season simulation
+
+        Cached until the next save (lineup, matchup or user change), the next
+        score update (the matchup manager's score_version, bumped by weekly and
+        live scoring) or new projections. data_manager.get_projections() returns
+        the same frame until a new week is stored, so the frame itself is the
+        projections version.
+
+        Args:
+            projections: player projections, e.g. data_manager.get_projections()
+
+        Returns:
+            {user_id: {'playoff_odds', 'title_odds', 'mean_wins', 'mean_points'}}
+        """
+        key = (trials, seed, self.matchup_manager.score_version)
+        cached = self._playoff_odds
+        if cached is None or cached[0] != key or cached[1] is not projections:
+            odds = SeasonSimulator.for_league(self, projections).simulate(trials, seed)
+            self._playoff_odds = (key, projections, odds)
+        return self._playoff_odds[2]
+
     def get_weekly_matchups(self, week=None):
         """Get matchups for a specific week"""
         return self.matchup_manager.get_weekly_matchups(week)
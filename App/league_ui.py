@@ -1,8 +1,11 @@
 # App/league_ui.py - FIXED VERSION WITH STABLE SELECTIONS
 import streamlit as st
+import numpy as np
 import pandas as pd
+from App.data_manager import data_manager
 from App.league_manager import league_manager
 from App.lineup_manager import lineup_manager
+from App.roster_scoring import RosterMatrix
 from App.ui_components import render_selected_player
 from App.config import TEAM_SIZE
 
@@ -255,12 +258,18 @@ def render_team_builder(player_pool, user_id=None):
 
     # Save Roster Button
     st.markdown("---")
-    col_save, col_reset = st.columns([3, 1])
+    col_save, col_fill, col_reset = st.columns([3, 1, 1])
 
     with col_save:
         if st.button("💾 Save Full Roster (Starters + Bench)", type="primary", use_container_width=True,
                      key=f"{user_id}_save"):
-            save_current_roster(user_id)
+            save_current_roster(user_id, player_pool)
+
+    with col_fill:
+        if st.button("⚡ Auto-fill Optimal", type="secondary", use_container_width=True, key=f"{user_id}_autofill"):
+            if autofill_optimal_roster(player_pool, user_id):
+                st.rerun()
+            st.error("❌ Not enough players to fill a roster")
 
     with col_reset:
         if st.button("🔄 Clear Selections", type="secondary", use_container_width=True, key=f"{user_id}_clear"):
@@ -268,7 +277,7 @@ def render_team_builder(player_pool, user_id=None):
             st.rerun()
 
 
-def save_current_roster(user_id="current_user"):
+def save_current_roster(user_id="current_user", player_pool=None):
     """Save the current team builder selections as a full roster"""
     roster_players = []
 
@@ -330,13 +339,28 @@ def save_current_roster(user_id="current_user"):
                 bench_points = sum(p.get('fantasy_points', 0) for p in bench)
 
                 # Show points summary
-                col_points = st.columns(3)
+                col_points = st.columns(4)
                 with col_points[0]:
                     st.metric("Total Points", f"{total_points}")
                 with col_points[1]:
                     st.metric("Starters", f"{starters_points}")
                 with col_points[2]:
                     st.metric("Bench", f"{bench_points}")
+                    roster_matrix = RosterMatrix([user_id], {user_id: roster_players})
+                    counted = roster_matrix.score(data_manager.get_points_lookup(),
+                                                  data_manager.get_played_lookup())[user_id]
+                    substitutes = roster_matrix.substitutes[0]
+                    for out_slot in np.flatnonzero(substitutes >= 0):
+                        st.caption(f"🔁 {roster_players[substitutes[out_slot]]['player']} in for "
+                                   f"{roster_players[out_slot]['player']}")
+                    if (substitutes >= 0).any():
+                        st.caption(f"Counted with auto-subs: {counted}")
+                with col_points[3]:
+                    # Best roster anyone could have picked this week
+                    optimal = lineup_manager.optimal_roster(player_pool) if player_pool is not None else None
+                    if optimal:
+                        st.metric("Optimal in Hindsight", f"{optimal['starter_points']}",
+                                  f"{starters_points - optimal['starter_points']}")
 
                 # Player details
                 col1, col2 = st.columns(2)
@@ -377,6 +401,26 @@ def save_current_roster(user_id="current_user"):
         st.write(f"**Debug:** Found {len(roster_players)} players (need {TEAM_SIZE['total']})")
 
 
+def autofill_optimal_roster(player_pool, user_id="current_user"):
+    """Fill the team builder selections with the highest scoring valid roster"""
+    # Only players the builder offers (0-point players are filtered out there)
+    optimal = lineup_manager.optimal_roster(player_pool[player_pool['fantasy_points'] > 0])
+    if optimal is None:
+        return False
+
+    starters = optimal['starters']
+    clear_selections(user_id)
+    st.session_state[f'{user_id}_selected_gk'] = next(p for p in starters if p['position'] == 'goalkeeper')
+    st.session_state[f'{user_id}_selected_center'] = next(p for p in starters if p['position'] == 'center')
+    st.session_state[f'{user_id}_selected_fields'] = [p for p in starters if p['position'] == 'field']
+    st.session_state[f'{user_id}_selected_bench'] = optimal['bench']
+
+    # Drop the dropdowns' own state so they pick up the new selections
+    for key in [f"{user_id}_gk_select", f"{user_id}_center_select"]:
+        st.session_state.pop(key, None)
+    return True
+
+
 def clear_selections(user_id="current_user"):
     """Clear all selections for a user"""
     keys_to_clear = [
@@ -571,7 +615,10 @@ def render_matchup_management(match_data):
         st.info(f"Player points data: {len(player_points)} players")
 
         if player_points:
-            weekly_scores = league_manager.calculate_weekly_scores(week_to_view, player_points)
+            # Rows with 0 seconds in matches that record minutes count as not played
+            played_lookup = data_manager.get_played_lookup()
+            played = {key: played_lookup.get(key, True) for key in player_points}
+            weekly_scores = league_manager.calculate_weekly_scores(week_to_view, player_points, played)
             st.success(f"✅ Calculated scores for {len(weekly_scores)} teams!")
 
             # Show the actual scores
@@ -675,6 +722,8 @@ def render_standings():
         if len(standings) >= 3:
             with col3:
                 st.metric("3rd Place", standings[2]['team_name'], f"{standings[2]['total_points']} pts")
+
+        render_playoff_odds(standings)
     else:
         st.info("No standings data yet. Calculate scores first!")
 
@@ -685,4 +734,22 @@ def render_standings():
         2. **Set Matchups**: Go to League Setup → Create Weekly Matchups
         3. **Calculate Scores**: Go to Weekly Matchups → Calculate Week Scores
         4. **View Standings**: Return here to see the updated standings
-        """)
\ No newline at end of file
+        """)
+
+
+def render_playoff_odds(standings):
+    """Render simulated playoff and title odds for the remaining season"""
+    st.markdown("### 🎲 Playoff Odds")
+    if not st.button("Simulate Season", key="simulate_season"):
+        st.caption("Simulates the rest of the season from player projections and current lineups")
+        return
+
+    odds = league_manager.get_playoff_odds(data_manager.get_projections())
+    odds_df = pd.DataFrame([{
+        'Team': team['team_name'],
+        'Playoffs': f"{odds[team['user_id']]['playoff_odds']:.1%}",
+        'Title': f"{odds[team['user_id']]['title_odds']:.1%}",
+        'Proj W': round(odds[team['user_id']]['mean_wins'], 1),
+        'Proj Pts': round(odds[team['user_id']]['mean_points'], 1)
+    } for team in standings if team['user_id'] in odds])
+    st.dataframe(odds_df, use_container_width=True, hide_index=True)
@@ -1,6 +1,7 @@
 # App/lineup_manager.py
 import streamlit as st
 from App.config import REQUIRED_POSITIONS, TEAM_SIZE, POSITION_FLEXIBILITY
+from App.lineup_solver import lineup_solver
 
 
 class LineupManager:
@@ -66,7 +67,12 @@ class LineupManager:
         return True, "Lineup is valid"
 
     def calculate_lineup_points(self, lineup_players, player_points_data):
-        """Calculate total points for a lineup"""
+        """
+        Calculate total points for a lineup
+
+        player_points_data: {(player, team_code): points} mapping, normally the shared
+        index from data_manager.get_points_lookup()
+        """
         total_points = 0
         player_details = []
 
@@ -93,12 +99,27 @@ class LineupManager:
         points_dict = {}
 
         if player_data is not None and not player_data.empty:
-            for _, row in player_data.iterrows():
-                key = (row['player'], row['team_code'])
-                points_dict[key] = row['fantasy_points']
+            keys = zip(player_data['player'], player_data['team_code'])
+            points_dict = dict(zip(keys, player_data['fantasy_points'].tolist()))
 
         return points_dict
 
+    def optimal_roster(self, player_pool, points_column='fantasy_points', club_cap=None, locked=(), excluded=()):
+        """
+        Best possible roster from a player pool (see App/lineup_solver.py)
+
+        With actual points this is the optimal-in-hindsight roster, with a
+        projection column it is an auto-fill. Returns the solver's result dict
+        ('roster' in save order, 'points', ...) or None when no roster fits.
+        """
+        if player_pool is None or player_pool.empty:
+            return None
+
+        result = lineup_solver.solve(player_pool, points_column, club_cap, locked, excluded)
+        if result is None:
+            print("No roster satisfies the position, club and lock constraints")
+        return result
+
 
 # Create a singleton instance
 lineup_manager = LineupManager()
\ No newline at end of file
@@ -0,0 +1,266 @@
+# App/lineup_solver.py
+import itertools
+
+import numpy as np
+from App.config import LINEUP_WEIGHTS, POSITION_FLEXIBILITY, REQUIRED_POSITIONS, TEAM_SIZE
+
+# Added per bench point so equal rosters prefer the stronger bench (bench weight may be 0)
+BENCH_TIE_BREAK = 1e-9
+
+
+class LineupSolver:
+    """
+    Points-maximizing roster under the starter / bench rules
+
+    A roster is REQUIRED_POSITIONS starters plus TEAM_SIZE['bench'] bench
+    players of any position, with at most POSITION_FLEXIBILITY['max_per_position']
+    players of a position in total. Its value is LINEUP_WEIGHTS['starter'] x
+    starter points + LINEUP_WEIGHTS['bench'] x bench points (starter weight >=
+    bench weight), ties broken toward the stronger bench.
+
+    Locked players must be on the roster but take a starter or bench slot at
+    their real value. Within a position (and club) the players taken are the
+    locked ones plus the best unlocked ones, and the best of those start.
+
+    - No club cap: per-position top-K. Every split of the bench over the
+      positions (a handful) is scored and the best one kept.
+    - Club cap: dynamic programming over clubs. A state counts the filled
+      starter and bench slots per position (a couple of hundred states); each
+      club contributes its locked plus top players of each position it fills,
+      so the DP only ever looks at per-club prefixes.
+    """
+
+    def __init__(self, required=None, max_per_position=None, bench_size=None, weights=None):
+        self.required = dict(required or REQUIRED_POSITIONS)
+        self.positions = list(self.required)
+        max_per_position = max_per_position or POSITION_FLEXIBILITY['max_per_position']
+        self.bench_room = [max_per_position[p] - self.required[p] for p in self.positions]
+        self.bench_size = TEAM_SIZE['bench'] if bench_size is None else bench_size
+        self.weights = weights or LINEUP_WEIGHTS
+        self._dp_tables = {}  # {club_cap: (states, deltas, transitions)}
+
+    def _candidates(self, pool, points, locked=(), excluded=()):
+        """Pool rows with a position code, value and lock flag, one row per (player, team_code) (the best one)"""
+        frame = pool[pool['position'].isin(self.positions)]
+        frame = frame.sort_values(points, ascending=False, kind='stable')
+        frame = frame.drop_duplicates(['player', 'team_code'])
+        if excluded:
+            excluded = set(excluded)
+            frame = frame[[key not in excluded for key in zip(frame['player'], frame['team_code'])]]
+
+        values = frame[points].to_numpy(dtype=np.float64)
+        locked = set(locked)
+        is_locked = np.array([key in locked for key in zip(frame['player'], frame['team_code'])], dtype=bool)
+        position_codes = frame['position'].map({p: i for i, p in enumerate(self.positions)}).to_numpy()
+        return frame, position_codes, values, is_locked
+
+    def solve(self, pool, points='fantasy_points', club_cap=None, locked=(), excluded=()):
+        """
+        Best roster from a player pool
+
+        Args:
+            pool: DataFrame with player, team_code, position and the points column
+                  (e.g. data_manager.get_player_pool())
+            points: column to maximize, actual points or a projection
+            club_cap: most players allowed from one club (team_code), None for no cap
+            locked: (player, team_code) keys that must be on the roster
+            excluded: (player, team_code) keys that can't be picked
+
+        Returns:
+            {'roster': players in roster order (starters GK / C / field, then bench),
+             'starters', 'bench': lists of player dicts, 'points': weighted value,
+             'starter_points', 'bench_points'}, or None when no roster satisfies
+            the constraints
+        """
+        frame, position_codes, values, is_locked = self._candidates(pool, points, locked, excluded)
+        if club_cap is None:
+            picks = self._top_k(position_codes, values, is_locked)
+        else:
+            picks = self._club_dp(frame['team_code'].to_numpy(), position_codes, values, is_locked, club_cap)
+        if picks is None:
+            return None
+
+        starters, bench = picks
+        if locked:
+            chosen = set(zip(frame['player'].iloc[starters + bench], frame['team_code'].iloc[starters + bench]))
+            if not set(locked) <= chosen:
+                return None
+
+        records = frame.to_dict('records')
+        starter_rows = [records[i] for i in sorted(starters, key=lambda i: (position_codes[i], -values[i]))]
+        bench_rows = [records[i] for i in bench]
+        starter_points = sum(row[points] for row in starter_rows)
+        bench_points = sum(row[points] for row in bench_rows)
+        return {
+            'roster': starter_rows + bench_rows,
+            'starters': starter_rows,
+            'bench': bench_rows,
+            'points': self.weights['starter'] * starter_points + self.weights['bench'] * bench_points,
+            'starter_points': starter_points,
+            'bench_points': bench_points,
+        }
+
+    def _ordered_rows(self, rows, values, is_locked):
+        """Locked rows first, then unlocked, each by value: taking the first t takes every lock and the best rest"""
+        return rows[np.lexsort((-values[rows], ~is_locked[rows]))]
+
+    def _split(self, rows, values, n_starters):
+        """(starter rows, bench rows) of the players taken: the n_starters best start"""
+        rows = rows[np.argsort(-values[rows], kind='stable')]
+        return rows[:n_starters], rows[n_starters:]
+
+    def _top_k(self, position_codes, values, is_locked):
+        """Row positions of (starters, bench) by per-position top-K, trying every bench split"""
+        w_starter, w_bench = self.weights['starter'], self.weights['bench'] + BENCH_TIE_BREAK
+        ordered = [self._ordered_rows(np.flatnonzero(position_codes == p), values, is_locked)
+                   for p in range(len(self.positions))]
+
+        best, best_picks = -np.inf, None
+        for bench_counts in itertools.product(*(range(room + 1) for room in self.bench_room)):
+            if sum(bench_counts) != self.bench_size:
+                continue
+            total, picks = 0.0, []
+            for p, position in enumerate(self.positions):
+                rows = ordered[p]
+                taken = self.required[position] + bench_counts[p]
+                if taken > len(rows) or taken < is_locked[rows].sum():
+                    break
+                starters, bench = self._split(rows[:taken], values, self.required[position])
+                total += w_starter * values[starters].sum() + w_bench * values[bench].sum()
+                picks.append((starters, bench))
+            else:
+                if total > best:
+                    best, best_picks = total, picks
+
+        if best_picks is None:
+            return None
+        starters = [row for rows, _ in best_picks for row in rows.tolist()]
+        bench = np.concatenate([rows for _, rows in best_picks])
+        return starters, bench[np.argsort(-values[bench], kind='stable')].tolist()
+
+    def _dp_table(self, club_cap):
+        """States, per-club slot deltas and the state transition table for a club cap"""
+        if club_cap not in self._dp_tables:
+            bounds = [self.required[p] for p in self.positions] + self.bench_room
+            n = len(self.positions)
+
+            def slot_vectors(limit):
+                return [v for v in itertools.product(*(range(b + 1) for b in bounds))
+                        if sum(v[n:]) <= self.bench_size and sum(v) <= limit]
+
+            states = slot_vectors(sum(bounds))
+            index = {state: i for i, state in enumerate(states)}
+            deltas = slot_vectors(club_cap)
+            transitions = np.array([[index.get(tuple(s + d for s, d in zip(state, delta)), -1) for state in states]
+                                    for delta in deltas], dtype=np.int64)
+            self._dp_tables[club_cap] = (states, np.array(deltas, dtype=np.int64), transitions)
+        return self._dp_tables[club_cap]
+
+    def _club_dp(self, clubs, position_codes, values, is_locked, club_cap):
+        """Row positions of (starters, bench) by DP over clubs"""
+        states, deltas, transitions = self._dp_table(club_cap)
+        n = len(self.positions)
+        w_starter, w_bench = self.weights['starter'], self.weights['bench'] + BENCH_TIE_BREAK
+
+        best = np.full(len(states), -np.inf)
+        best[0] = 0.0
+        history = []  # per club: (club rows by position, chosen delta and previous state per state)
+        for club in dict.fromkeys(clubs):
+            club_rows = []
+            delta_values = np.zeros(len(deltas))
+            for p in range(n):
+                rows = self._ordered_rows(np.flatnonzero((clubs == club) & (position_codes == p)), values, is_locked)
+                club_rows.append(rows)
+                starter_count, taken = deltas[:, p], deltas[:, p] + deltas[:, n + p]
+
+                # Starter / bench sums of taking the first t rows with s starting
+                max_taken = min(len(rows), taken.max())
+                starter_sums = np.zeros((starter_count.max() + 1, max_taken + 1))
+                bench_sums = np.zeros_like(starter_sums)
+                for t in range(max_taken + 1):
+                    prefix = np.concatenate([[0.0], np.cumsum(-np.sort(-values[rows[:t]]))])
+                    s = np.minimum(np.arange(len(starter_sums)), t)
+                    starter_sums[:, t] = prefix[s]
+                    bench_sums[:, t] = prefix[t] - prefix[s]
+
+                feasible = (taken <= len(rows)) & (taken >= is_locked[rows].sum())
+                t = np.minimum(taken, max_taken)
+                delta_values += np.where(feasible, w_starter * starter_sums[starter_count, t]
+                                         + w_bench * bench_sums[starter_count, t], -np.inf)
+
+            candidates = best[None, :] + delta_values[:, None]
+            valid = (transitions >= 0) & np.isfinite(candidates)
+            delta_index, source = np.nonzero(valid)
+            target = transitions[delta_index, source]
+            score = candidates[delta_index, source]
+
+            # Best (delta, source) per target: sort by target, then score, keep the last of each run
+            order = np.lexsort((score, target))
+            last = np.r_[target[order][1:] != target[order][:-1], True]
+            keep = order[last]
+            best = np.full(len(states), -np.inf)
+            best[target[keep]] = score[keep]
+            chosen = np.full((len(states), 2), -1, dtype=np.int64)
+            chosen[target[keep]] = np.stack([delta_index[keep], source[keep]], axis=1)
+            history.append((club_rows, chosen))
+
+        final = [i for i, state in enumerate(states)
+                 if list(state[:n]) == [self.required[p] for p in self.positions]
+                 and sum(state[n:]) == self.bench_size]
+        state = max(final, key=lambda i: best[i])
+        if not np.isfinite(best[state]):
+            return None
+
+        starters, bench = [], []
+        for club_rows, chosen in reversed(history):
+            delta_index, state = chosen[state]
+            delta = deltas[delta_index]
+            for p, rows in enumerate(club_rows):
+                club_starters, club_bench = self._split(rows[:delta[p] + delta[n + p]], values, delta[p])
+                starters.extend(club_starters.tolist())
+                bench.extend(club_bench.tolist())
+        bench.sort(key=lambda i: -values[i])
+        return starters, bench
+
+    def solve_batch(self, position_codes, values):
+        """
+        Per-position top-K for many teams at once (no club cap)
+
+        Args:
+            position_codes: (players,) index into self.positions for each pool row
+            values: (teams, players) points or projections per team, -inf for
+                    players a team can't pick
+
+        Returns:
+            (starters (teams x starters) row indices ordered by position,
+             bench (teams x bench) row indices, weighted points per team), or
+            None if the pool can't fill every starter and bench slot
+        """
+        values = np.asarray(values, dtype=np.float64)
+        starters = []
+        bench_candidates = []
+        for p, position in enumerate(self.positions):
+            rows = np.flatnonzero(np.asarray(position_codes) == p)
+            if len(rows) < self.required[position]:
+                return None
+            take = self.required[position] + self.bench_room[p]
+            order = np.argsort(-values[:, rows], axis=1, kind='stable')[:, :take]
+            ranked = rows[order]
+            starters.append(ranked[:, :self.required[position]])
+            bench_candidates.append(ranked[:, self.required[position]:])
+
+        starters = np.concatenate(starters, axis=1)
+        bench_candidates = np.concatenate(bench_candidates, axis=1)
+        if bench_candidates.shape[1] < self.bench_size:
+            return None
+        teams = np.arange(len(values))[:, None]
+        bench_order = np.argsort(-values[teams, bench_candidates], axis=1, kind='stable')[:, :self.bench_size]
+        bench = np.take_along_axis(bench_candidates, bench_order, axis=1)
+
+        points = (self.weights['starter'] * values[teams, starters].sum(axis=1)
+                  + self.weights['bench'] * values[teams, bench].sum(axis=1))
+        return starters, bench, points
+
+
+# Create a singleton instance
+lineup_solver = LineupSolver()
@@ -0,0 +1,150 @@
+# App/live_poller.py
+import hashlib
+import threading
+
+import numpy as np
+from App.config import SCRAPER_SETTINGS, STAT_COLUMNS
+from App.page_archive import archive_key, match_id_for, match_info_from_frame, match_params
+from App.scoring import scoring_engine
+
+IDENTITY_COLUMNS = ['jersey', 'position', 'team_full']
+
+
+class LivePoller:
+    """
+    Match-day poller emitting per-player stat deltas
+
+    Re-fetches in-progress match pages (through LENScraper, so requests are
+    paced, retried and conditional when a cache is set), skips pages whose
+    content didn't change, and diffs each parsed page against the previous
+    snapshot of that match. Each delta carries only the stats that changed and
+    the fantasy points they are worth, so consumers (PlayerStatStore.apply_deltas,
+    MatchDataManager.apply_live_deltas) update just those players.
+
+    Snapshots are keyed by the match URL parameters without the status, so a
+    match keeps its snapshot when its URL turns final; after that final poll it
+    is no longer fetched.
+    """
+
+    def __init__(self, scraper, interval=None, stat_columns=None, scoring=None):
+        self.scraper = scraper
+        self.interval = interval or SCRAPER_SETTINGS['live_poll_interval']
+        self.stat_columns = list(stat_columns or STAT_COLUMNS)
+        self.scoring = scoring or scoring_engine
+        self.snapshots = {}  # {match key: {(player, team_code): stats array}}
+        self.hashes = {}  # {match key: sha256 of the last page parsed}
+        self.finished = set()  # match keys polled after they turned final
+        self._stop = threading.Event()
+        self._thread = None
+
+    def seed(self, match_url, df):
+        """Start a match from stats already ingested (e.g. stored), so only later changes become deltas"""
+        self.diff(match_url, df)
+
+    def poll_once(self, match_urls):
+        """
+        Fetch every unfinished match once and diff it against its last snapshot
+
+        Returns:
+            list of delta dicts (see diff())
+        """
+        pending = [url for url in match_urls if archive_key(url) not in self.finished]
+        deltas = []
+        for match_url, content, error in self.scraper.fetch_match_pages(pending):
+            if error is not None:
+                print(f"Live poll failed for {match_url}: {error}")
+                continue
+
+            key = archive_key(match_url)
+            digest = hashlib.sha256(content).hexdigest()
+            if self.hashes.get(key) != digest:
+                df = self.scraper.parse_match_html(content, match_url)
+                if not df.empty:
+                    self.hashes[key] = digest
+                    deltas.extend(self.diff(match_url, df))
+
+            if self.scraper._is_final_match_url(match_url):
+                self.finished.add(key)
+        return deltas
+
+    def diff(self, match_url, df):
+        """
+        Per-player changes between a parsed page and the match's last snapshot
+
+        Players seen for the first time always get a delta (their stats count
+        from zero) so consumers learn the full roster. Players missing from the
+        page since the last snapshot get a delta subtracting their last stats
+        (identity columns empty).
+
+        Returns:
+            [{'match_id', 'match_name', 'player', 'team_code', 'jersey', 'position',
+              'team_full', 'stats': {column: change}, 'points': change in fantasy points}]
+        """
+        key = archive_key(match_url)
+        previous = self.snapshots.get(key, {})
+        match_id = match_id_for(match_url)
+        match_name = match_info_from_frame({'url': match_url, 'params': match_params(match_url)}, df)['name']
+
+        stats = np.zeros((len(df), len(self.stat_columns)), dtype=np.int32)
+        for j, name in enumerate(self.stat_columns):
+            if name in df:
+                stats[:, j] = df[name].to_numpy()
+        players = list(zip(df['player'], df['team_code']))
+
+        zero = np.zeros(len(self.stat_columns), dtype=np.int32)
+        before = np.vstack([previous.get(player, zero) for player in players]) if players else stats
+        change = stats - before
+        is_new = np.array([player not in previous for player in players], dtype=bool)
+
+        # Players dropped from the page (e.g. a corrected box score) give back their last stats
+        current = set(players)
+        gone = [player for player, last in previous.items() if player not in current and last.any()]
+        if gone:
+            change = np.vstack([change, -np.vstack([previous[player] for player in gone])])
+            is_new = np.concatenate([is_new, np.zeros(len(gone), dtype=bool)])
+        points = self.scoring.rule_set_column(self.scoring.score(change, self.stat_columns))
+
+        changed = np.flatnonzero(change.any(axis=1) | is_new)
+        deltas = []
+        for i in changed:
+            player, team_code = players[i] if i < len(players) else gone[i - len(players)]
+            delta = {
+                'match_id': match_id,
+                'match_name': match_name,
+                'player': player,
+                'team_code': team_code,
+                'stats': {name: int(change[i, j]) for j, name in enumerate(self.stat_columns) if change[i, j]},
+                'points': points[i].item(),
+            }
+            for name in IDENTITY_COLUMNS:
+                delta[name] = df[name].iloc[i] if name in df and i < len(players) else ''
+            deltas.append(delta)
+
+        self.snapshots[key] = {player: stats[i] for i, player in enumerate(players)}
+        return deltas
+
+    def run(self, get_match_urls, on_deltas):
+        """
+        Poll until stop(): every interval, fetch get_match_urls() and pass any deltas to on_deltas
+        """
+        while not self._stop.is_set():
+            try:
+                deltas = self.poll_once(get_match_urls())
+                if deltas:
+                    on_deltas(deltas)
+            except Exception as e:
+                print(f"Live poll error: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self, get_match_urls, on_deltas):
+        """Run the poller on a background thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, args=(get_match_urls, on_deltas), daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,182 @@
+# App/live_scoring.py
+import threading
+
+import numpy as np
+from App.roster_scoring import RosterMatrix
+
+
+class LiveScoringService:
+    """
+    Live weekly scores for many leagues, updated from per-player deltas
+
+    Every registered roster is a row of one RosterMatrix; its coordinate arrays
+    are regrouped by player (CSR) into a reverse index from (player, team_code)
+    to the rows holding that player and their slot weights. A batch of
+    LivePoller deltas is applied as
+
+        scores[rows of player] += weight * points change
+
+    so a goal costs O(rosters owning the scorer), not a rescore of every
+    roster. Only the affected users' scores, matchup rows and standings
+    ledger entries are touched, and the changes are published to subscribers.
+
+    Scores count the lineups as set (starter / bench weights); auto-subs are
+    settled when the week's scores are calculated. Create the week's matchups
+    before going live so the stored matchup rows are the ones updated.
+    """
+
+    def __init__(self, week, weights=None):
+        self.week = week
+        self.weights = weights
+        self.leagues = {}  # {league_id: (matchup_manager, users)}
+        self.roster_ids = []  # row -> (league_id, user_id)
+        self.roster_rows = {}  # (league_id, user_id) -> row
+        self.lineups = {}  # {(league_id, user_id): lineup}
+        self.scores = np.zeros(0)
+        self.subscribers = []  # callbacks(week, updates)
+        self._matrix = None
+        self._lock = threading.Lock()
+
+    def add_league(self, league_id, matchup_manager, users, lineups):
+        """
+        Register a league for live scoring
+
+        Args:
+            matchup_manager: the league's MatchupManager (scores, matchups, ledger)
+            users: {user_id: user data} as kept by FantasyLeague
+            lineups: {user_id: lineup} for the week (see RosterMatrix)
+        """
+        with self._lock:
+            self.leagues[league_id] = (matchup_manager, users)
+            for user_id in users:
+                roster_id = (league_id, user_id)
+                if roster_id not in self.roster_rows:
+                    self.roster_rows[roster_id] = len(self.roster_ids)
+                    self.roster_ids.append(roster_id)
+                self.lineups[roster_id] = lineups.get(user_id)
+            self._matrix = None
+
+    def subscribe(self, callback):
+        """Call callback(week, updates) after every change (see _publish for updates)"""
+        self.subscribers.append(callback)
+
+    def _index(self):
+        """RosterMatrix over all registered rosters and its player -> rows reverse index"""
+        if self._matrix is None:
+            matrix = RosterMatrix(self.roster_ids, self.lineups, self.week, self.weights)
+            order = np.argsort(matrix.player_index, kind='stable')
+            self.owner_rows = matrix.user_index[order].astype(np.int64)
+            self.owner_weights = matrix.weights[order]
+            counts = np.bincount(matrix.player_index, minlength=matrix.shape[1])
+            self.owner_ptr = np.concatenate([[0], np.cumsum(counts)])
+            # Rosters added since the last build start at 0 until seeded
+            scores = np.zeros(len(self.roster_ids))
+            scores[:len(self.scores)] = self.scores
+            self.scores = scores
+            self._matrix = matrix
+        return self._matrix
+
+    def seed(self, player_points_data, league_id=None):
+        """
+        Set rosters' scores from the points so far (one sparse product)
+
+        Args:
+            player_points_data: {(player, team_code): points}, e.g. data_manager.get_points_lookup()
+            league_id: seed (and publish) only this league's rosters, e.g. one
+                just added to a shared service; None seeds every roster
+        """
+        with self._lock:
+            matrix = self._index()
+            if league_id is None:
+                rows = np.arange(len(self.roster_ids))
+            else:
+                roster_ids = [(league_id, user_id) for user_id in self.leagues[league_id][1]]
+                rows = np.array([self.roster_rows[roster_id] for roster_id in roster_ids], dtype=np.int64)
+                matrix = RosterMatrix(roster_ids, self.lineups, self.week, self.weights)
+            self.scores[rows] = matrix.score_vector(matrix.points_vector(player_points_data))
+            updates = self._publish(rows)
+        self._notify(updates)
+        return updates
+
+    def apply_deltas(self, deltas):
+        """
+        Apply LivePoller deltas to the rosters that own the players
+
+        Usable as the poller's on_deltas callback (after
+        data_manager.apply_live_deltas for the stored stats).
+
+        Returns:
+            {league_id: update} for the leagues that changed (see _publish)
+        """
+        with self._lock:
+            matrix = self._index()
+            changes = {}
+            for delta in deltas:
+                column = matrix.columns.get((delta['player'], delta['team_code']))
+                if column is not None and delta.get('points'):
+                    changes[column] = changes.get(column, 0) + delta['points']
+            if not changes:
+                return {}
+
+            columns = np.fromiter(changes, dtype=np.int64, count=len(changes))
+            points = np.fromiter(changes.values(), dtype=np.float64, count=len(changes))
+
+            # Gather every owner of the changed players from the CSR index
+            starts = self.owner_ptr[columns]
+            counts = self.owner_ptr[columns + 1] - starts
+            positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            rows = self.owner_rows[positions]
+            np.add.at(self.scores, rows, self.owner_weights[positions] * np.repeat(points, counts))
+            updates = self._publish(np.unique(rows))
+        self._notify(updates)
+        return updates
+
+    def score(self, league_id, user_id):
+        """A user's live score (int when whole)"""
+        self._index()
+        return self._value(self.roster_rows[(league_id, user_id)])
+
+    def _value(self, row):
+        value = self.scores[row].item()
+        return int(round(value)) if self._matrix.integral and value == round(value) else value
+
+    def _publish(self, rows):
+        """
+        Write the rows' scores to their leagues (called with the lock held)
+
+        Bumps each changed league's score_version, which drops its cached
+        playoff odds.
+
+        Returns:
+            {league_id: {'scores': {user_id: score}, 'matchups': [changed matchups],
+                         'standings': standings rows}}
+        """
+        updates = {}
+        for row in rows.tolist():
+            league_id, user_id = self.roster_ids[row]
+            manager, _ = self.leagues[league_id]
+            score = self._value(row)
+
+            manager.scores.setdefault(self.week, {})[user_id] = score
+            if manager.ledger is not None:
+                manager.ledger.record_score(self.week, user_id, score)
+
+            update = updates.setdefault(league_id, {'scores': {}, 'matchups': []})
+            update['scores'][user_id] = score
+            matchup = manager.get_user_matchup(user_id, self.week)
+            if matchup is not None:
+                matchup['team1_score' if matchup['team1'] == user_id else 'team2_score'] = score
+                if not any(m is matchup for m in update['matchups']):
+                    update['matchups'].append(matchup)
+
+        for league_id, update in updates.items():
+            manager, users = self.leagues[league_id]
+            manager.score_version += 1
+            update['standings'] = manager.get_standings(users, manager.matchups)
+        return updates
+
+    def _notify(self, updates):
+        """Call subscribers outside the lock, so they may call back into the service"""
+        if updates:
+            for callback in self.subscribers:
+                callback(self.week, updates)
@@ -0,0 +1,179 @@
+# App/match_storage.py
+import json
+import os
+
+import numpy as np
+import pyarrow as pa
+from App.config import STAT_COLUMNS, CURRENT_SEASON, STATS_STORAGE_DIR
+from App.stats_store import PlayerStatStore
+
+STRING_COLUMNS = ['jersey', 'player']
+DICTIONARY_COLUMNS = ['team_code', 'position', 'team_full']
+MATCH_INFO_KEYS = ['id', 'name', 'date', 'score', 'teams', 'url']
+
+
+class MatchStatStorage:
+    """
+    Season-scale storage of match player stats
+
+    One uncompressed Arrow IPC file per match, partitioned by season and week:
+        <root>/season=2526/week=01/nbg_jad.arrow
+        <root>/season=2526/week=01/matches.json   (match ids in write order)
+
+    Files are opened memory-mapped, so numeric stat columns are read without
+    copying and only the weeks that are asked for are touched.
+    """
+
+    def __init__(self, root=STATS_STORAGE_DIR, stat_columns=None):
+        self.root = root
+        self.stat_columns = list(stat_columns or STAT_COLUMNS)
+        self.schema = pa.schema(
+            [(name, pa.string()) for name in STRING_COLUMNS] +
+            [(name, pa.dictionary(pa.int16(), pa.string())) for name in DICTIONARY_COLUMNS] +
+            [(name, pa.int32()) for name in self.stat_columns]
+        )
+
+    def week_dir(self, season, week):
+        return os.path.join(self.root, f"season={season}", f"week={int(week):02d}")
+
+    def match_path(self, season, week, match_id):
+        return os.path.join(self.week_dir(season, week), f"{match_id}.arrow")
+
+    def weeks(self, season=CURRENT_SEASON):
+        """Sorted list of weeks stored for a season"""
+        season_dir = os.path.join(self.root, f"season={season}")
+        if not os.path.isdir(season_dir):
+            return []
+
+        weeks = []
+        for name in os.listdir(season_dir):
+            if name.startswith('week='):
+                try:
+                    weeks.append(int(name[len('week='):]))
+                except ValueError:
+                    continue
+        return sorted(weeks)
+
+    def match_ids(self, season, week):
+        """Match ids stored for a week, in the order they were first written"""
+        week_dir = self.week_dir(season, week)
+        if not os.path.isdir(week_dir):
+            return []
+
+        stored = sorted(name[:-len('.arrow')] for name in os.listdir(week_dir) if name.endswith('.arrow'))
+        ordered = [match_id for match_id in self._read_week_index(week_dir) if match_id in stored]
+        return ordered + [match_id for match_id in stored if match_id not in ordered]
+
+    def _read_week_index(self, week_dir):
+        index_path = os.path.join(week_dir, 'matches.json')
+        if not os.path.exists(index_path):
+            return []
+        with open(index_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _add_to_week_index(self, week_dir, match_id):
+        match_ids = self._read_week_index(week_dir)
+        if match_id not in match_ids:
+            match_ids.append(match_id)
+            with open(os.path.join(week_dir, 'matches.json'), 'w', encoding='utf-8') as f:
+                json.dump(match_ids, f)
+
+    def write_match(self, season, week, match_id, match_info, columns):
+        """
+        Write one match's player stats
+
+        Args:
+            match_info: dict with name, date, score, teams (as in MatchDataManager.all_matches)
+            columns: DataFrame or dict of column -> values; missing stat columns are stored as 0
+        """
+        n_rows = len(columns['player'])
+        arrays = []
+        for field in self.schema:
+            if field.name in columns:
+                values = columns[field.name]
+            elif field.name in self.stat_columns:
+                values = np.zeros(n_rows, dtype=np.int32)
+            else:
+                values = [''] * n_rows
+
+            if field.name in self.stat_columns:
+                arrays.append(pa.array(np.asarray(values, dtype=np.int32), type=pa.int32()))
+            elif field.name in DICTIONARY_COLUMNS:
+                arrays.append(pa.array([str(v) for v in values], type=pa.string()).dictionary_encode()
+                              .cast(field.type))
+            else:
+                arrays.append(pa.array([str(v) for v in values], type=pa.string()))
+
+        info = {key: match_info[key] for key in MATCH_INFO_KEYS if key in match_info}
+        info['id'] = match_id
+        info['season'] = season
+        info['week'] = int(week)
+        table = pa.Table.from_arrays(arrays, schema=self.schema.with_metadata(
+            {'match_info': json.dumps(info)}
+        ))
+
+        path = self.match_path(season, week, match_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        self._add_to_week_index(os.path.dirname(path), match_id)
+        return path
+
+    def read_match(self, season, week, match_id):
+        """
+        Read one match memory-mapped
+
+        Returns:
+            (match_info, columns) where stat columns are zero-copy NumPy views of the file
+        """
+        source = pa.memory_map(self.match_path(season, week, match_id), 'r')
+        table = pa.ipc.open_file(source).read_all().combine_chunks()
+        info = json.loads(table.schema.metadata[b'match_info'])
+
+        columns = {}
+        for name in table.column_names:
+            array = table.column(name).chunk(0) if table.num_rows else table.column(name)
+            if name in self.stat_columns:
+                columns[name] = array.to_numpy(zero_copy_only=False)
+            else:
+                columns[name] = array.to_pylist()
+        return info, columns
+
+    def read_weeks(self, season=CURRENT_SEASON, weeks=None):
+        """
+        Read the given weeks (all stored weeks if None)
+
+        Yields:
+            (match_id, match_info, columns) for every stored match of those weeks
+        """
+        if weeks is None:
+            weeks = self.weeks(season)
+        for week in weeks:
+            for match_id in self.match_ids(season, week):
+                info, columns = self.read_match(season, week, match_id)
+                yield match_id, info, columns
+
+    def import_matches(self, all_matches, season=CURRENT_SEASON, week=1):
+        """Write {match_id: match_info} dicts with literal 'players' rows to storage"""
+        paths = []
+        for match_id, match in all_matches.items():
+            columns = PlayerStatStore.columns_from_rows(match['players'])
+            paths.append(self.write_match(season, match.get('week', week), match_id, match, columns))
+        return paths
+
+
+# Create a singleton instance
+match_storage = MatchStatStorage()
+
+
+if __name__ == "__main__":
+    # Seed storage with the built-in Week 1 matches
+    from App.data_manager import MatchDataManager
+
+    manager = MatchDataManager(storage=match_storage)
+    manager.load_default_matches()
+    written = match_storage.import_matches(manager.all_matches)
+    print(f"Wrote {len(written)} matches to {match_storage.root}")
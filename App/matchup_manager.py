@@ -2,57 +2,104 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+from App.config import AUTO_SUBSTITUTION
+from App.roster_scoring import RosterMatrix
+from App.schedule import SeasonSchedule
+from App.standings import StandingsLedger
 
 class MatchupManager:
-    """Manages weekly matchups and scoring"""
+    """
+    Manages weekly matchups and scoring
+
+    matchups is the flat list saved to the session; it is indexed by week and
+    by (week, user) so week and user lookups don't scan it. Add and remove
+    matchups with add_matchups() / remove_week() (assigning a new list reindexes it).
+    """
 
     def __init__(self):
         self.matchups = []
         self.scores = {}
+        self.score_version = 0  # bumped whenever scores change, keys caches built on them
         self.current_week = 1
+        self.ledger = None  # StandingsLedger, rebuilt from scores/matchups when None
+        self.schedule = None  # SeasonSchedule the weekly matchups are taken from
+
+    @property
+    def matchups(self):
+        return self._matchups
+
+    @matchups.setter
+    def matchups(self, matchups):
+        self._matchups = matchups
+        self._reindex()
+
+    def _reindex(self):
+        self._by_week = {}  # {week: [matchup, ...]}
+        self._by_user = {}  # {(week, user_id): matchup}
+        for matchup in self._matchups:
+            self._index(matchup)
+        self._indexed = len(self._matchups)
+
+    def _index(self, matchup):
+        self._by_week.setdefault(matchup['week'], []).append(matchup)
+        for user_id in (matchup['team1'], matchup.get('team2')):
+            if user_id is not None:
+                self._by_user.setdefault((matchup['week'], user_id), matchup)
+
+    def _ensure_index(self):
+        """Reindex if the list was appended to or shrunk behind the index's back"""
+        if self._indexed != len(self._matchups):
+            self._reindex()
+
+    def add_matchups(self, matchups):
+        """Append matchups to the list and the indexes"""
+        self._ensure_index()
+        for matchup in matchups:
+            self._matchups.append(matchup)
+            self._index(matchup)
+        self._indexed = len(self._matchups)
+
+    def remove_week(self, week):
+        """Drop every matchup of a week, returns them"""
+        self._ensure_index()
+        removed = self._by_week.pop(week, [])
+        if removed:
+            for matchup in removed:
+                for user_id in (matchup['team1'], matchup.get('team2')):
+                    if self._by_user.get((week, user_id)) is matchup:
+                        del self._by_user[(week, user_id)]
+            self._matchups[:] = [m for m in self._matchups if m['week'] != week]
+            self._indexed = len(self._matchups)
+        return removed
+
+    def create_season_schedule(self, user_ids, double=False, start_week=1, seed=None):
+        """
+        Generate the whole season's pairings at once (see App/schedule.py)
+
+        Circle-method round robin, optionally double, with byes rotating through
+        the league when the number of users is odd. seed shuffles who plays whom.
+        """
+        self.schedule = SeasonSchedule.generate(user_ids, double, start_week, seed)
+        return self.schedule
 
-    # In matchup_manager.py, update the create_round_robin_matchups method:
     def create_round_robin_matchups(self, user_ids, week=None):
-        """Create round-robin matchups for a week - works with any even number"""
+        """
+        Create round-robin matchups for a week - works with any number of users
+
+        Pairings come from the season schedule, so opponents and byes change
+        from week to week. Without a schedule for these users, the default
+        (unshuffled) schedule of user_ids is used.
+        """
         if week is None:
             week = self.current_week
 
         if len(user_ids) < 2:
             return []
 
-        matchups = []
-
-        # Make a copy to avoid modifying original
-        working_ids = user_ids.copy()
-
-        # If odd number, one team gets bye
-        if len(working_ids) % 2 == 1:
-            matchups.append({
-                'week': week,
-                'team1': working_ids[-1],
-                'team2': None,  # Bye week
-                'team1_score': 0,
-                'team2_score': 0,
-                'completed': True,
-                'is_bye': True,
-                'created_at': datetime.now().isoformat()
-            })
-            working_ids = working_ids[:-1]  # Remove the bye team from pairing
-
-        # Pair remaining teams
-        for i in range(0, len(working_ids), 2):
-            if i + 1 < len(working_ids):
-                matchup = {
-                    'week': week,
-                    'team1': working_ids[i],
-                    'team2': working_ids[i + 1],
-                    'team1_score': 0,
-                    'team2_score': 0,
-                    'completed': False,
-                    'is_bye': False,
-                    'created_at': datetime.now().isoformat()
-                }
-                matchups.append(matchup)
+        schedule = self.schedule
+        if schedule is None or set(schedule.user_ids) != set(user_ids):
+            schedule = SeasonSchedule.generate(user_ids)
+        matchups = schedule.week_matchups(week)
 
         # Ensure matchups are saved to session
         if hasattr(self, 'save_to_session'):
@@ -60,93 +107,81 @@ class MatchupManager:
 
         return matchups
 
-    def calculate_matchup_scores(self, week, users, lineups, player_points_data):
-        """Calculate scores for all matchups in a week"""
-        if week not in self.scores:
-            self.scores[week] = {}
-
-        # Calculate each user's score
-        for user_id in users:
-            lineup = lineups.get(user_id, {}).get(week, {}).get('players', [])
-            total_points = 0
-
-            for player in lineup:
-                player_name = player.get('player')
-                team_code = player.get('team_code')
-
-                if player_name and team_code:
-                    key = (player_name, team_code)
-                    total_points += player_points_data.get(key, 0)
-
-            self.scores[week][user_id] = total_points
+    def calculate_matchup_scores(self, week, users, lineups, player_points_data, weights=None, played=None):
+        """
+        Calculate scores for all matchups in a week
+
+        lineups: {user_id: lineup} as passed by FantasyLeague.calculate_weekly_scores
+        ({'players': [...], 'set_time': ...}); {user_id: {week: lineup}} is read too
+        player_points_data: {(player, team_code): points} mapping, normally the shared
+        index from data_manager.get_points_lookup()
+        weights: starter / bench weights, defaults to LINEUP_WEIGHTS
+        played: {(player, team_code): played} for auto-substitution (see
+        data_manager.get_played_lookup()); by default players missing from
+        player_points_data didn't play
+        """
+        if played is None:
+            played = player_points_data.keys()
+
+        # Every user's score from one sparse users x players product
+        roster_matrix = RosterMatrix(users, lineups, week, weights)
+        self.scores[week] = roster_matrix.score(player_points_data,
+                                                played if AUTO_SUBSTITUTION['enabled'] else None)
+        self.score_version += 1
 
         # Update matchup scores
-        for matchup in self.matchups:
-            if matchup['week'] == week:
-                matchup['team1_score'] = self.scores[week].get(matchup['team1'], 0)
-                if matchup['team2']:
-                    matchup['team2_score'] = self.scores[week].get(matchup['team2'], 0)
-                    matchup['completed'] = True
+        self._ensure_index()
+        for matchup in self._by_week.get(week, []):
+            matchup['team1_score'] = self.scores[week].get(matchup['team1'], 0)
+            if matchup['team2']:
+                matchup['team2_score'] = self.scores[week].get(matchup['team2'], 0)
+                matchup['completed'] = True
+            if self.ledger is not None:
+                self.ledger.record_matchup(matchup)
+
+        if self.ledger is not None:
+            for user_id, points in self.scores[week].items():
+                self.ledger.record_score(week, user_id, points)
 
         return self.scores[week]
 
+    def reset_standings(self):
+        """Drop the standings ledger after matchups or scores were replaced wholesale"""
+        self.ledger = None
+
     def get_weekly_matchups(self, week=None):
         """Get matchups for a specific week"""
         if week is None:
             week = self.current_week
 
-        return [m for m in self.matchups if m['week'] == week]
+        self._ensure_index()
+        if week in self._by_week:
+            return list(self._by_week[week])
+        # Weeks not created yet are read from the season schedule
+        if self.schedule is not None:
+            return self.schedule.week_matchups(week)
+        return []
 
     def get_user_matchup(self, user_id, week=None):
         """Get a specific user's matchup for a week"""
         if week is None:
             week = self.current_week
 
-        for matchup in self.matchups:
-            if matchup['week'] == week:
-                if matchup['team1'] == user_id or matchup['team2'] == user_id:
-                    return matchup
+        self._ensure_index()
+        if week in self._by_week:
+            return self._by_user.get((week, user_id))
+        if self.schedule is not None:
+            return self.schedule.user_matchup(user_id, week)
         return None
 
     def get_standings(self, users, matchups):
-        """Calculate league standings"""
-        standings = []
-
-        for user_id, user_data in users.items():
-            total_points = 0
-            wins = 0
-            losses = 0
-
-            # Calculate total points from all weeks
-            for week, scores in self.scores.items():
-                if user_id in scores:
-                    total_points += scores[user_id]
-
-            # Calculate wins/losses from matchups
-            for matchup in matchups:
-                if matchup.get('completed') and matchup.get('team2'):
-                    if matchup['team1'] == user_id:
-                        if matchup['team1_score'] > matchup['team2_score']:
-                            wins += 1
-                        elif matchup['team1_score'] < matchup['team2_score']:
-                            losses += 1
-                    elif matchup['team2'] == user_id:
-                        if matchup['team2_score'] > matchup['team1_score']:
-                            wins += 1
-                        elif matchup['team2_score'] < matchup['team1_score']:
-                            losses += 1
-
-            standings.append({
-                'user_id': user_id,
-                'name': user_data.get('name', 'Unknown'),
-                'team_name': user_data.get('team_name', 'Unknown'),
-                'total_points': total_points,
-                'wins': wins,
-                'losses': losses,
-                'win_pct': wins / max(wins + losses, 1)
-            })
-
-        # Sort by wins, then points
-        standings.sort(key=lambda x: (x['wins'], x['total_points']), reverse=True)
-
-        return standings
\ No newline at end of file
+        """
+        Calculate league standings
+
+        Read from the StandingsLedger, which calculate_matchup_scores keeps up to
+        date; it is only rebuilt from scores and matchups when missing or when
+        the league's users changed.
+        """
+        if self.ledger is None or self.ledger.users.keys() != users.keys():
+            self.ledger = StandingsLedger.from_history(users, self.scores, matchups)
+        return self.ledger.standings()
@@ -0,0 +1,269 @@
+# App/page_archive.py
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlsplit, parse_qsl
+
+from App.config import PAGE_ARCHIVE_DIR, ARCHIVE_KEY_PARAMS, SCRAPER_SETTINGS, CURRENT_SEASON
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_SUFFIXES = {'zstd': '.html.zst', 'gzip': '.html.gz'}
+
+
+def match_params(url):
+    """Query parameters of a match URL"""
+    return dict(parse_qsl(urlsplit(url).query))
+
+
+def archive_key(url):
+    """Archive key of a match URL, e.g. 'c=ASM&g=1&t=A01&s1=NBG&s2=JSP&sch=02122025'"""
+    params = match_params(url)
+    return '&'.join(f"{name}={params.get(name, '')}" for name in ARCHIVE_KEY_PARAMS)
+
+
+def match_id_for(url):
+    """
+    Match id used by the stats store, e.g. 'nbg_jsp_g1_02122025'
+
+    The game number and schedule date keep repeat fixtures between the same
+    clubs apart.
+    """
+    params = match_params(url)
+    match_id = f"{params.get('s1', '')}_{params.get('s2', '')}"
+    if params.get('g'):
+        match_id += f"_g{params['g']}"
+    if params.get('sch'):
+        match_id += f"_{params['sch']}"
+    return match_id.lower()
+
+
+class PageArchive:
+    """
+    Compressed, content-addressed archive of raw match pages
+
+    Page bodies are stored once per content hash, so refetching an unchanged
+    page costs no space:
+        <root>/objects/ab/ab12...ef.html.zst
+        <root>/index.jsonl   one line per change, the last line for a key wins
+
+    Entries are keyed by the match URL parameters in ARCHIVE_KEY_PARAMS and
+    hold the URL, content hash, sizes, fetch time and (when known) the week.
+    """
+
+    def __init__(self, root=PAGE_ARCHIVE_DIR, compression=None):
+        compression = compression or SCRAPER_SETTINGS['archive_compression']
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unknown compression '{compression}', choose from {list(COMPRESSION_SUFFIXES)}")
+        if compression == 'zstd' and zstandard is None:
+            compression = 'gzip'
+
+        self.root = root
+        self.compression = compression
+        self.index_path = os.path.join(root, 'index.jsonl')
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def object_path(self, sha256, compression):
+        return os.path.join(self.root, 'objects', sha256[:2], f"{sha256}{COMPRESSION_SUFFIXES[compression]}")
+
+    def _compress(self, content):
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor(level=10).compress(content)
+        return gzip.compress(content, compresslevel=9, mtime=0)
+
+    def _decompress(self, data, compression):
+        if compression == 'zstd':
+            if zstandard is None:
+                raise ImportError("zstandard is needed to read zstd archive entries")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def entries(self):
+        """{archive key: entry} for every archived page"""
+        if self._entries is None:
+            entries = {}
+            if os.path.exists(self.index_path):
+                with open(self.index_path, encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            entries[entry['key']] = entry
+            self._entries = entries
+        return self._entries
+
+    def __len__(self):
+        return len(self.entries())
+
+    def __contains__(self, url):
+        return archive_key(url) in self.entries()
+
+    def _append(self, entry):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        self.entries()[entry['key']] = entry
+
+    def store(self, url, content, week=None):
+        """
+        Archive a fetched page body
+
+        Returns:
+            the page's entry; nothing is written when the key already holds this content
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        sha256 = hashlib.sha256(content).hexdigest()
+        key = archive_key(url)
+
+        with self._lock:
+            current = self.entries().get(key)
+            if current and current['sha256'] == sha256 and (week is None or current.get('week') == week):
+                return current
+
+            existing = [c for c in COMPRESSION_SUFFIXES if os.path.exists(self.object_path(sha256, c))]
+            compression = existing[0] if existing else self.compression
+            path = self.object_path(sha256, compression)
+            if not existing:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(self._compress(content))
+                os.replace(tmp_path, path)
+
+            entry = {
+                'key': key,
+                'url': url,
+                'params': {name: match_params(url).get(name, '') for name in ARCHIVE_KEY_PARAMS},
+                'sha256': sha256,
+                'compression': compression,
+                'size': len(content),
+                'stored_size': os.path.getsize(path),
+                'fetched_at': time.time(),
+                'week': week if week is not None else (current or {}).get('week'),
+            }
+            self._append(entry)
+            return entry
+
+    def set_week(self, url, week):
+        """Record the week (round) an archived page belongs to"""
+        with self._lock:
+            entry = self.entries().get(archive_key(url))
+            if entry is None or entry.get('week') == week:
+                return
+            self._append(dict(entry, week=week))
+
+    def read(self, url_or_entry):
+        """Raw body of an archived page (by match URL or index entry)"""
+        entry = url_or_entry if isinstance(url_or_entry, dict) else self.entries()[archive_key(url_or_entry)]
+        with open(self.object_path(entry['sha256'], entry['compression']), 'rb') as f:
+            return self._decompress(f.read(), entry['compression'])
+
+    def find(self, **params):
+        """Entries whose URL parameters match, e.g. find(s1='NBG') or find(week=1)"""
+        found = []
+        for entry in self.entries().values():
+            fields = dict(entry['params'], week=entry.get('week'))
+            if all(fields.get(name) == value for name, value in params.items()):
+                found.append(entry)
+        return found
+
+
+def match_info_from_frame(entry, df):
+    """match_info dict (as in MatchDataManager.all_matches) for a parsed archived page"""
+    columns = {name: df[name].tolist() for name in ('team_code', 'team_full', 'goals')} if not df.empty else {}
+    return match_info_from_columns(entry, columns)
+
+
+def match_info_from_columns(entry, columns):
+    """match_info dict for a page parsed into columns (LENScraper.parse_match_columns)"""
+    params = entry['params']
+    home, away = params.get('s1', ''), params.get('s2', '')
+    team_codes = columns.get('team_code', [])
+    teams = []
+    goals = []
+    for code in (home, away):
+        rows = [i for i, team_code in enumerate(team_codes) if team_code == code]
+        teams.append(columns['team_full'][rows[0]] if rows else code)
+        goals.append(int(sum(columns['goals'][i] for i in rows)))
+
+    date = params.get('sch', '')
+    return {
+        'name': f"{teams[0]} vs {teams[1]}",
+        'date': f"{date[4:]}-{date[2:4]}-{date[:2]}" if len(date) == 8 else date,
+        'score': f"{goals[0]}-{goals[1]}",
+        'teams': teams,
+        'url': entry['url'],
+    }
+
+
+def reparse_archive(archive=None, storage=None, season=CURRENT_SEASON, parser=None, default_week=None,
+                    max_workers=None):
+    """
+    Rebuild the stats storage from archived pages, without any network access
+
+    Every archived match page is parsed again with the current parser, spread
+    over a process pool (see App/bulk_parse.py), and written to MatchStatStorage
+    (replacing the earlier file for that match). Pages archived without a week
+    are skipped and reported, unless default_week is given, and so are pages
+    whose match ids collide.
+
+    Returns:
+        list of (week, match_id) written
+    """
+    from App.bulk_parse import archive_jobs, bulk_parse
+    from App.match_storage import match_storage
+
+    archive = archive or PageArchive()
+    storage = storage or match_storage
+    entries = []
+    unassigned = []
+    for entry in archive.entries().values():
+        week = entry.get('week') or default_week
+        if week is None:
+            unassigned.append(entry['key'])
+        else:
+            entries.append(dict(entry, week=week))
+    if unassigned:
+        print(f"Skipping {len(unassigned)} archived pages without a week: {', '.join(sorted(unassigned))}")
+
+    # Pages that differ only in parameters the match id leaves out (competition, group)
+    # would overwrite each other in storage
+    keys_by_id = {}
+    for entry in entries:
+        keys_by_id.setdefault(match_id_for(entry['url']), []).append(entry['key'])
+    for match_id, keys in keys_by_id.items():
+        if len(keys) > 1:
+            print(f"Skipping archived pages sharing match id {match_id}: {', '.join(sorted(keys))}")
+    entries = [entry for entry in entries if len(keys_by_id[match_id_for(entry['url'])]) == 1]
+    entries.sort(key=lambda e: e['key'])
+
+    written = []
+    results = bulk_parse(archive_jobs(archive, entries), max_workers, parser)
+    for entry, (match_id, match_info, columns) in zip(entries, results):
+        if columns is None:
+            print(f"No player stats in archived page for {match_id}")
+            continue
+        storage.write_match(season, entry['week'], match_id, match_info, columns)
+        written.append((entry['week'], match_id))
+    return written
+
+
+if __name__ == "__main__":
+    # Re-parse every archived page into the stats storage:
+    #   python -m App.page_archive [season] [parser] [workers]
+    season = sys.argv[1] if len(sys.argv) > 1 else CURRENT_SEASON
+    parser = sys.argv[2] if len(sys.argv) > 2 else None
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    start = time.perf_counter()
+    written = reparse_archive(season=season, parser=parser, max_workers=workers)
+    print(f"Re-parsed {len(written)} archived matches into season {season} "
+          f"in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,95 @@
+# App/pipeline.py
+from App.config import CURRENT_SEASON
+from App.page_archive import match_id_for, match_info_from_columns, match_params
+from App.stats_store import PlayerStatStore
+
+
+def match_url_stage(scraper, week_number=None):
+    """Round's match URLs (duplicates dropped) as the results page is read"""
+    seen = set()
+    for match in scraper.iter_weekly_matches(week_number):
+        if match['match_url'] not in seen:
+            seen.add(match['match_url'])
+            yield match['match_url']
+
+
+def parse_stage(scraper, match_urls, max_workers=None):
+    """
+    Fetch and parse pages as they arrive
+
+    Yields:
+        batch dicts {'match_id', 'match_url', 'match_info', 'columns'}; pages
+        without player stats are reported and dropped
+    """
+    pages = scraper.iter_match_pages(match_urls, max_workers)
+    for match_url, columns in scraper.iter_match_columns(pages):
+        if not columns:
+            print(f"No player stats for {match_url}")
+            continue
+        entry = {'url': match_url, 'params': match_params(match_url)}
+        yield {
+            'match_id': match_id_for(match_url),
+            'match_url': match_url,
+            'match_info': match_info_from_columns(entry, columns),
+            'columns': columns,
+        }
+
+
+def score_stage(batches, store):
+    """Add each batch's stat matrix and fantasy points (rows x rule sets) with the store's scoring"""
+    for batch in batches:
+        stats = store.stat_matrix(batch['columns'])
+        batch['stats'] = stats
+        batch['points'] = store.scoring.score(stats, store.stat_columns)
+        yield batch
+
+
+def store_stage(batches, store, storage=None, season=CURRENT_SEASON, week=None):
+    """
+    Append each scored batch to the PlayerStatStore (and write it to
+    MatchStatStorage when given) as soon as it arrives, then pass it on
+
+    Matches already in the store are written to storage but not added again.
+    """
+    for batch in batches:
+        match_id = batch['match_id']
+        if storage is not None and week is not None:
+            storage.write_match(season, week, match_id, batch['match_info'], batch['columns'])
+
+        if match_id in store.match_rows:
+            print(f"Match {match_id} is already in the store")
+        else:
+            store.add_matches([(match_id, batch['match_info']['name'], batch['columns'])], points=batch['points'])
+        yield batch
+
+
+def stream_week(scraper, week_number=None, store=None, storage=None, season=CURRENT_SEASON, max_workers=None):
+    """
+    Streaming fetch -> parse -> score -> store pipeline for one round
+
+    Every stage is a generator, so a match is parsed, scored and stored as soon
+    as its page arrives while the rest of the round is still downloading, and
+    only the pages in flight are held in memory.
+
+    Yields:
+        scored batches (see parse_stage, plus 'stats' and 'points') once stored
+    """
+    store = store if store is not None else PlayerStatStore()
+    match_urls = match_url_stage(scraper, week_number)
+    batches = parse_stage(scraper, match_urls, max_workers)
+    yield from store_stage(score_stage(batches, store), store, storage, season, week_number)
+
+
+def run_week(scraper, week_number=None, store=None, storage=None, season=CURRENT_SEASON, max_workers=None):
+    """
+    Drain stream_week()
+
+    Returns:
+        (store, {match_id: match_info})
+    """
+    store = store if store is not None else PlayerStatStore()
+    infos = {}
+    for batch in stream_week(scraper, week_number, store, storage, season, max_workers):
+        infos[batch['match_id']] = batch['match_info']
+    return store, infos
+
@@ -0,0 +1,188 @@
+# App/projections.py
+import numpy as np
+import pandas as pd
+from App.config import PROJECTION_SETTINGS, REQUIRED_POSITIONS, STAT_COLUMNS
+from App.scoring import scoring_engine
+
+
+class ProjectionEngine:
+    """
+    Per-player stat projections built up one week at a time
+
+    Every player's history is kept as running state instead of raw rows:
+    - a ring buffer of the last `window` matches (rolling means)
+    - EWMA numerator / denominator (pandas ewm(halflife, adjust=True))
+    - per-position stat and points sums (position baselines)
+
+    add_week() folds a week's rows into that state for all players at once, so
+    a new week costs O(rows in the week) and the history is never replayed.
+    A player's projection is their EWMA shrunk toward the position baseline
+    by prior_matches, scored with the ScoringEngine for every rule set.
+    """
+
+    def __init__(self, stat_columns=None, scoring=None, window=None, halflife=None, prior_matches=None):
+        self.stat_columns = list(stat_columns or STAT_COLUMNS)
+        self.scoring = scoring or scoring_engine
+        self.window = window or PROJECTION_SETTINGS['window']
+        halflife = halflife or PROJECTION_SETTINGS['halflife']
+        self.decay = 0.5 ** (1.0 / halflife)
+        self.prior_matches = PROJECTION_SETTINGS['prior_matches'] if prior_matches is None else prior_matches
+        self.positions = list(REQUIRED_POSITIONS)
+
+        n_stats = len(self.stat_columns)
+        self.weeks = []
+        self.player_keys = {}  # {(player, team_code): index}
+        self.players = []  # index -> (player, team_code)
+        self.position = np.zeros(0, dtype=np.int64)  # latest position code per player
+        self.matches = np.zeros(0, dtype=np.int64)
+        self.buffer = np.zeros((0, self.window, n_stats))
+        self.rolling_sum = np.zeros((0, n_stats))
+        self.ewm_num = np.zeros((0, n_stats))
+        self.ewm_den = np.zeros(0)
+        self.position_sum = np.zeros((len(self.positions), n_stats))
+        self.position_points_sq = np.zeros(len(self.positions))
+        self.position_count = np.zeros(len(self.positions))
+        self._frame = None
+
+    @property
+    def weights(self):
+        return self.scoring.weight_matrix(self.stat_columns)
+
+    def add_week(self, week, matches):
+        """
+        Fold a week of matches into the projections
+
+        Args:
+            week: week number, recorded in self.weeks
+            matches: iterable of column dicts (player, team_code, position and stat
+                     columns), e.g. the columns from MatchStatStorage.read_weeks()
+        """
+        batches = [columns for columns in matches if len(columns['player'])]
+        self.weeks.append(week)
+        self._frame = None
+        if not batches:
+            return
+
+        keys = [key for columns in batches for key in zip(columns['player'], columns['team_code'])]
+        ids = np.array([self._player_index(key) for key in keys], dtype=np.int64)
+        position_codes = {p: i for i, p in enumerate(self.positions)}
+        positions = np.array([position_codes.get(p, -1) for columns in batches for p in columns['position']])
+        stats = np.zeros((len(ids), len(self.stat_columns)))
+        for j, name in enumerate(self.stat_columns):
+            stats[:, j] = np.concatenate([np.asarray(columns.get(name, np.zeros(len(columns['player']))),
+                                                     dtype=np.float64) for columns in batches])
+
+        # A player with several matches in the week is folded in match order:
+        # one vectorized step per occurrence (almost always a single step)
+        order = np.argsort(ids, kind='stable')
+        sorted_ids = ids[order]
+        starts = np.r_[0, np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1]
+        occurrence = np.empty(len(ids), dtype=np.int64)
+        occurrence[order] = np.arange(len(ids)) - np.repeat(starts, np.diff(np.r_[starts, len(ids)]))
+        for level in range(occurrence.max() + 1):
+            rows = np.flatnonzero(occurrence == level)
+            self._observe(ids[rows], positions[rows], stats[rows])
+
+    def _player_index(self, key):
+        if key not in self.player_keys:
+            self.player_keys[key] = len(self.players)
+            self.players.append(key)
+        return self.player_keys[key]
+
+    def _grow(self):
+        """Extend the per-player state to cover newly seen players"""
+        n_new = len(self.players) - len(self.matches)
+        if n_new <= 0:
+            return
+        n_stats = len(self.stat_columns)
+        self.position = np.concatenate([self.position, np.full(n_new, -1)])
+        self.matches = np.concatenate([self.matches, np.zeros(n_new, dtype=np.int64)])
+        self.buffer = np.concatenate([self.buffer, np.zeros((n_new, self.window, n_stats))])
+        self.rolling_sum = np.concatenate([self.rolling_sum, np.zeros((n_new, n_stats))])
+        self.ewm_num = np.concatenate([self.ewm_num, np.zeros((n_new, n_stats))])
+        self.ewm_den = np.concatenate([self.ewm_den, np.zeros(n_new)])
+
+    def _observe(self, ids, positions, stats):
+        """One match for each of ids (unique) with the given stat rows"""
+        self._grow()
+        slots = self.matches[ids] % self.window
+        self.rolling_sum[ids] += stats - self.buffer[ids, slots]
+        self.buffer[ids, slots] = stats
+        self.ewm_num[ids] = stats + self.decay * self.ewm_num[ids]
+        self.ewm_den[ids] = 1.0 + self.decay * self.ewm_den[ids]
+        self.matches[ids] += 1
+
+        known = positions >= 0
+        self.position[ids[known]] = positions[known]
+        np.add.at(self.position_sum, positions[known], stats[known])
+        points = stats[known] @ self.weights[:, 0]
+        np.add.at(self.position_points_sq, positions[known], points ** 2)
+        self.position_count += np.bincount(positions[known], minlength=len(self.positions))
+
+    def rolling_mean(self):
+        """(players x stats) mean of each player's last `window` matches"""
+        return self.rolling_sum / np.maximum(np.minimum(self.matches, self.window), 1)[:, None]
+
+    def ewma(self):
+        """(players x stats) exponentially weighted mean over each player's matches"""
+        return self.ewm_num / np.maximum(self.ewm_den, 1e-12)[:, None]
+
+    def position_baseline(self):
+        """(positions x stats) mean stats per match of each position"""
+        return self.position_sum / np.maximum(self.position_count, 1)[:, None]
+
+    def projected_stats(self):
+        """(players x stats) EWMA shrunk toward the position baseline"""
+        baseline = self.position_baseline()[np.maximum(self.position, 0)]
+        matches = self.matches[:, None].astype(np.float64)
+        return (matches * self.ewma() + self.prior_matches * baseline) / (matches + self.prior_matches)
+
+    def projected_points(self):
+        """(players x rule sets) projected points for every rule set"""
+        return self.scoring.score(self.projected_stats(), self.stat_columns)
+
+    def points_std(self):
+        """
+        Per-match points standard deviation (default rule set)
+
+        The spread of the player's rolling window, shrunk toward their position's
+        spread like the projection itself.
+        """
+        weights = self.weights[:, 0]
+        counts = np.minimum(self.matches, self.window)
+        valid = np.arange(self.window)[None, :] < counts[:, None]
+        window_points = np.where(valid, self.buffer @ weights, 0.0)
+        mean = window_points.sum(axis=1) / np.maximum(counts, 1)
+        variance = np.where(valid, (window_points - mean[:, None]) ** 2, 0.0).sum(axis=1) / np.maximum(counts, 1)
+
+        position_mean = self.position_baseline() @ weights
+        position_variance = np.maximum(
+            self.position_points_sq / np.maximum(self.position_count, 1) - position_mean ** 2, 0.0)
+        prior = position_variance[np.maximum(self.position, 0)]
+        return np.sqrt((counts * variance + self.prior_matches * prior) / (counts + self.prior_matches))
+
+    def frame(self):
+        """
+        Projections as a DataFrame, one row per (player, team_code)
+
+        Columns: player, team_code, position, matches, the projected stat columns,
+        rolling_points, ewma_points, projected_points (default rule set) and
+        points_std. Built once per add_week().
+        """
+        if self._frame is None:
+            weights = self.weights[:, 0]
+            projected = self.projected_stats()
+            data = {
+                'player': [player for player, _ in self.players],
+                'team_code': [team_code for _, team_code in self.players],
+                'position': np.asarray(self.positions + [None], dtype=object)[self.position],
+                'matches': self.matches,
+            }
+            for j, name in enumerate(self.stat_columns):
+                data[name] = projected[:, j]
+            data['rolling_points'] = self.rolling_mean() @ weights
+            data['ewma_points'] = self.ewma() @ weights
+            data['projected_points'] = self.scoring.rule_set_column(self.projected_points())
+            data['points_std'] = self.points_std()
+            self._frame = pd.DataFrame(data)
+        return self._frame
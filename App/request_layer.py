@@ -0,0 +1,224 @@
+# App/request_layer.py
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from App.config import SCRAPER_SETTINGS
+from App.scraper_metrics import current_phases, reset_phases
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RequestFailed(Exception):
+    """A request that failed for good; reason says why ('timeout', 'http_503', 'circuit_open', ...)"""
+
+    def __init__(self, url, reason, attempts=0):
+        super().__init__(f"{reason} after {attempts} attempt(s): {url}")
+        self.url = url
+        self.reason = reason
+        self.attempts = attempts
+
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens per second, up to burst at once"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, waiting for it if the bucket is empty"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: opens after failure_threshold consecutive failures and
+    rejects requests for reset_timeout seconds, then lets one probe through
+    (half-open) and closes again on its success
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.probe_thread = None
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        with self.lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.probing:
+                self.probing = True
+                self.probe_thread = threading.get_ident()
+                return True
+            return False
+
+    def release(self):
+        """End this thread's probe if it finished without recording an outcome (e.g. it raised)"""
+        with self.lock:
+            if self.probing and self.probe_thread == threading.get_ident():
+                self.probing = False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+class RequestLayer:
+    """
+    Paced, retrying GETs over a shared requests.Session
+
+    - token bucket rate limit shared by every worker thread
+    - jittered exponential backoff ("full jitter") on 5xx, 429, timeouts and
+      connection errors; Retry-After is honoured when the server sends one
+    - per-host circuit breaker so a failing site fails fast instead of tying
+      up every worker
+    - failures: {url: reason} of the requests that failed for good
+    - metrics: optional ScraperMetrics recording every attempt's status,
+      phase timings and size
+    """
+
+    def __init__(self, session, timeout=None, rate=None, burst=None, max_retries=None,
+                 backoff_base=None, backoff_max=None, breaker_failures=None, breaker_reset=None, metrics=None):
+        self.session = session
+        self.metrics = metrics
+        self.timeout = timeout or SCRAPER_SETTINGS['request_timeout']
+        self.bucket = TokenBucket(rate or SCRAPER_SETTINGS['requests_per_second'],
+                                  burst or SCRAPER_SETTINGS['request_burst'])
+        self.max_retries = SCRAPER_SETTINGS['max_retries'] if max_retries is None else max_retries
+        self.backoff_base = backoff_base if backoff_base is not None else SCRAPER_SETTINGS['backoff_base']
+        self.backoff_max = backoff_max if backoff_max is not None else SCRAPER_SETTINGS['backoff_max']
+        self.breaker_failures = breaker_failures or SCRAPER_SETTINGS['breaker_failures']
+        self.breaker_reset = breaker_reset if breaker_reset is not None else SCRAPER_SETTINGS['breaker_reset']
+        self.breakers = {}
+        self.failures = {}
+        self.lock = threading.Lock()
+
+    def breaker(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.breaker_failures, self.breaker_reset)
+            return self.breakers[host]
+
+    def backoff(self, attempt, retry_after=None):
+        """Seconds to wait before retry number attempt (0-based)"""
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _fail(self, url, reason, attempts):
+        with self.lock:
+            self.failures[url] = reason
+        if self.metrics is not None:
+            self.metrics.observe_failure(url, reason)
+        raise RequestFailed(url, reason, attempts)
+
+    def _attempt(self, url, headers):
+        """One GET, recorded in metrics (raises like session.get)"""
+        if self.metrics is None:
+            return self.session.get(url, timeout=self.timeout, headers=headers)
+
+        reset_phases()
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout, headers=headers)
+        except requests.Timeout:
+            self.metrics.observe_request(url, 'timeout', time.perf_counter() - start)
+            raise
+        except requests.ConnectionError:
+            self.metrics.observe_request(url, 'connection_error', time.perf_counter() - start)
+            raise
+        self.metrics.observe_request(url, response.status_code, time.perf_counter() - start, response,
+                                     current_phases())
+        return response
+
+    def get(self, url, headers=None):
+        """
+        GET a URL, returns the response (2xx or 304)
+
+        Raises:
+            RequestFailed with the reason once retries are exhausted, on a
+            non-retryable status, or while the host's circuit is open
+        """
+        breaker = self.breaker(url)
+        try:
+            return self._get(url, headers, breaker)
+        finally:
+            # A probe that raised anything unexpected must not keep the circuit half-open forever
+            breaker.release()
+
+    def _get(self, url, headers, breaker):
+        """Retry loop of get()"""
+        reason = None
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                self._fail(url, 'circuit_open', attempt)
+
+            self.bucket.acquire()
+            retry_after = None
+            try:
+                response = self._attempt(url, headers)
+            except requests.Timeout:
+                reason = 'timeout'
+            except requests.ConnectionError:
+                reason = 'connection_error'
+            else:
+                if response.status_code < 400:
+                    breaker.record_success()
+                    with self.lock:
+                        self.failures.pop(url, None)
+                    return response
+                reason = f"http_{response.status_code}"
+                if response.status_code not in RETRY_STATUSES:
+                    # The server answered; a 404 says nothing about the host's health
+                    breaker.record_success()
+                    self._fail(url, reason, attempt + 1)
+                retry_after = response.headers.get('Retry-After')
+
+            breaker.record_failure()
+            if attempt < self.max_retries:
+                if self.metrics is not None:
+                    self.metrics.observe_retry(url)
+                time.sleep(self.backoff(attempt, retry_after))
+
+        self._fail(url, reason, self.max_retries + 1)
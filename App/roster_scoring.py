@@ -0,0 +1,186 @@
+# App/roster_scoring.py
+from collections.abc import Mapping
+
+import numpy as np
+from App.config import AUTO_SUBSTITUTION, LINEUP_WEIGHTS, REQUIRED_POSITIONS, TEAM_SIZE
+
+
+def lineup_players(lineup, week=None):
+    """
+    Player list of a stored lineup
+
+    Accepts what FantasyLeague.get_lineup() returns ({'players': [...], 'set_time': ...}),
+    a {week: lineup} dict of those, or a bare player list.
+    """
+    if not lineup:
+        return []
+    if isinstance(lineup, list):
+        return lineup
+    if 'players' in lineup:
+        return lineup['players'] or []
+    return lineup_players(lineup.get(week), week)
+
+
+class RosterMatrix:
+    """
+    Sparse users x players membership matrix of a week's lineups
+
+    Stored as coordinate arrays (row = user, column = player, value = lineup
+    weight), so a week is scored for every user with one weighted sparse
+    product against the players' points vector:
+
+        scores = np.bincount(user_index, weights * points[player_index])
+
+    Columns are the distinct (player, team_code) keys across all lineups, so the
+    points vector only has to be gathered once per player, not once per roster slot.
+
+    With auto-substitution the slot weights are recomputed for every roster at
+    once from a played mask (see auto_sub_weights).
+    """
+
+    def __init__(self, user_ids, lineups, week=None, weights=None):
+        """
+        Args:
+            user_ids: users in row order (users without a lineup score 0)
+            lineups: {user_id: lineup} in any form accepted by lineup_players()
+            week: week to read from {week: lineup} dicts
+            weights: {'starter': w, 'bench': w}, defaults to LINEUP_WEIGHTS
+        """
+        weights = weights or LINEUP_WEIGHTS
+        self.lineup_weights = weights
+        self.user_ids = list(user_ids)
+        self.player_keys = []  # column -> (player, team_code)
+        columns = {}
+
+        position_codes = {position: i for i, position in enumerate(REQUIRED_POSITIONS)}
+        user_index = []
+        player_index = []
+        slot_index = []
+        slot_positions = []
+        slot_weights = []
+        for row, user_id in enumerate(self.user_ids):
+            for slot, player in enumerate(lineup_players(lineups.get(user_id), week)):
+                key = (player.get('player'), player.get('team_code'))
+                if not key[0] or not key[1]:
+                    continue
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = len(self.player_keys)
+                    self.player_keys.append(key)
+                user_index.append(row)
+                player_index.append(column)
+                slot_index.append(slot)
+                slot_positions.append(position_codes.get(player.get('position'), -1))
+                slot_weights.append(weights['starter'] if slot < TEAM_SIZE['starters'] else weights['bench'])
+
+        self.columns = columns  # {(player, team_code): column}
+        self.user_index = np.asarray(user_index, dtype=np.int32)
+        self.player_index = np.asarray(player_index, dtype=np.int32)
+        self.slot_index = np.asarray(slot_index, dtype=np.int32)
+        self.slot_positions = np.asarray(slot_positions, dtype=np.int32)
+        self.weights = np.asarray(slot_weights)
+        self.integral = all(float(weight).is_integer() for weight in weights.values())
+
+    @property
+    def shape(self):
+        return len(self.user_ids), len(self.player_keys)
+
+    def points_vector(self, player_points_data):
+        """Points per column from a {(player, team_code): points} mapping (0 when missing)"""
+        return np.asarray([player_points_data.get(key, 0) for key in self.player_keys], dtype=np.float64)
+
+    def played_vector(self, played):
+        """
+        Played flag per column
+
+        Args:
+            played: {(player, team_code): bool} (data_manager.get_played_lookup()), or a
+                    set of the keys that have a stat row, e.g. points_lookup.keys();
+                    missing keys didn't play
+        """
+        if isinstance(played, Mapping):
+            return np.asarray([bool(played.get(key, False)) for key in self.player_keys], dtype=bool)
+        return np.asarray([key in played for key in self.player_keys], dtype=bool)
+
+    def auto_sub_weights(self, played, compatible=None):
+        """
+        Slot weights after bench players replace starters who did not play
+
+        Works on (users x roster slots) arrays for every roster at once. Each bench
+        slot, in bench order, takes the first starter slot that didn't play, isn't
+        already replaced and has a compatible position; the bench player must
+        have played. The starter drops to the bench weight and the bench player
+        gets the starter weight.
+
+        Args:
+            played: bool per column (see played_vector)
+            compatible: {starter position: [bench positions]}, defaults to
+                        AUTO_SUBSTITUTION['compatible']
+        """
+        compatible = compatible or AUTO_SUBSTITUTION['compatible']
+        positions = list(REQUIRED_POSITIONS)
+        n_starters = TEAM_SIZE['starters']
+        n_slots = max(TEAM_SIZE['total'], int(self.slot_index.max()) + 1 if len(self.slot_index) else 0)
+
+        # Dense rosters: -1 marks an empty slot or unknown position
+        slot_player = np.full((len(self.user_ids), n_slots), -1, dtype=np.int64)
+        slot_player[self.user_index, self.slot_index] = self.player_index
+        slot_position = np.full(slot_player.shape, -1, dtype=np.int64)
+        slot_position[self.user_index, self.slot_index] = self.slot_positions
+        slot_played = np.zeros(slot_player.shape, dtype=bool)
+        slot_played[self.user_index, self.slot_index] = played[self.player_index]
+
+        # allowed[starter position, bench position]
+        allowed = np.zeros((len(positions) + 1, len(positions) + 1), dtype=bool)
+        for i, position in enumerate(positions):
+            for bench_position in compatible.get(position, []):
+                if bench_position in positions:
+                    allowed[i, positions.index(bench_position)] = True
+
+        starter_position = slot_position[:, :n_starters]
+        open_slots = ~slot_played[:, :n_starters]
+        subbed_in = np.zeros(slot_player.shape, dtype=bool)
+        subbed_out = np.zeros(slot_player.shape, dtype=bool)
+        substitutes = np.full((len(self.user_ids), n_starters), -1, dtype=np.int64)
+        for bench_slot in range(n_starters, n_slots):
+            bench_position = slot_position[:, bench_slot]
+            eligible = open_slots & allowed[starter_position, bench_position[:, None]]
+            eligible &= (slot_played[:, bench_slot] & (bench_position >= 0))[:, None]
+            users = np.flatnonzero(eligible.any(axis=1))
+            replaced = eligible[users].argmax(axis=1)
+            subbed_in[users, bench_slot] = True
+            subbed_out[users, replaced] = True
+            substitutes[users, replaced] = bench_slot
+            open_slots[users, replaced] = False
+
+        weights = self.weights.copy()
+        weights[subbed_in[self.user_index, self.slot_index]] = self.lineup_weights['starter']
+        weights[subbed_out[self.user_index, self.slot_index]] = self.lineup_weights['bench']
+        self.substitutes = substitutes  # (users x starter slots) bench slot that came in, or -1
+        return weights
+
+    def score_vector(self, points, weights=None):
+        """Weighted sparse product: every user's score for a points vector over the columns"""
+        weights = self.weights if weights is None else weights
+        totals = np.bincount(self.user_index, weights=weights * points[self.player_index],
+                             minlength=len(self.user_ids))
+        if self.integral and np.all(np.mod(points, 1) == 0):
+            return np.rint(totals).astype(np.int64)
+        return totals
+
+    def score(self, player_points_data, played=None):
+        """
+        Score every user
+
+        Args:
+            player_points_data: {(player, team_code): points}, normally the shared
+                                lookup from data_manager.get_points_lookup()
+            played: apply auto-substitution with this played lookup or key set
+                    (see played_vector), None scores the lineups as set
+
+        Returns:
+            {user_id: score}
+        """
+        weights = None if played is None else self.auto_sub_weights(self.played_vector(played))
+        totals = self.score_vector(self.points_vector(player_points_data), weights)
+        return dict(zip(self.user_ids, totals.tolist()))
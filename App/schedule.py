@@ -0,0 +1,157 @@
+# App/schedule.py
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+BYE = -1
+
+
+@lru_cache(maxsize=None)
+def round_robin_template(n_teams, double=False):
+    """
+    Circle-method round robin for n_teams, as team positions
+
+    Position 0 stays put while the others rotate one seat per round, so every
+    pair meets exactly once per cycle. With an odd number of teams a phantom
+    team is added and whoever meets it has the bye, so byes rotate through the
+    league (one each per cycle). The fixed team alternates home and away. A
+    double round robin repeats the cycle with home and away swapped.
+
+    Returns:
+        read-only int16 array (rounds, pairs per round, 2) of [home, away]
+        positions, away is BYE (-1) for the bye
+    """
+    if n_teams < 1:
+        empty = np.zeros((0, 0, 2), dtype=np.int16)
+        empty.setflags(write=False)
+        return empty
+
+    n = n_teams + n_teams % 2
+    rounds = n - 1
+    seats = (np.arange(rounds)[:, None] + np.arange(n - 1)[None, :]) % (n - 1) + 1
+    circle = np.concatenate([np.zeros((rounds, 1), dtype=np.int16), seats.astype(np.int16)], axis=1)
+
+    pairs = np.stack([circle[:, :n // 2], circle[:, ::-1][:, :n // 2]], axis=-1)
+    # Fixed team alternates home / away; with the rotation this keeps every
+    # team's home and away games within one of each other
+    pairs[0::2, 0] = pairs[0::2, 0, ::-1]
+
+    if n != n_teams:
+        pairs[pairs == n - 1] = BYE
+        byes = pairs[..., 0] == BYE
+        pairs[byes] = pairs[byes][:, ::-1]
+
+    if double:
+        second = pairs[..., ::-1].copy()
+        byes = second[..., 0] == BYE
+        second[byes] = second[byes][:, ::-1]
+        pairs = np.concatenate([pairs, second])
+
+    pairs.setflags(write=False)
+    return pairs
+
+
+@lru_cache(maxsize=None)
+def template_slots(n_teams, double=False):
+    """(rounds, n_teams) array: index of the pair each position plays in each round"""
+    pairs = round_robin_template(n_teams, double)
+    slots = np.zeros((len(pairs), n_teams), dtype=np.int16)
+    rounds, pair_index = np.nonzero(pairs[..., 0] >= 0)
+    slots[rounds, pairs[rounds, pair_index, 0]] = pair_index
+    away = pairs[rounds, pair_index, 1]
+    real = away >= 0
+    slots[rounds[real], away[real]] = pair_index[real]
+    slots.setflags(write=False)
+    return slots
+
+
+class SeasonSchedule:
+    """
+    A league's season of weekly pairings
+
+    pairings holds positions into user_ids (see round_robin_template) and is
+    shared between every league of the same size; a league only owns its user
+    order. Week lookups are an index into the array, and past the last round
+    the schedule starts over.
+    """
+
+    def __init__(self, user_ids, pairings, start_week=1, double=False):
+        self.user_ids = list(user_ids)
+        self.pairings = pairings
+        self.start_week = start_week
+        self.double = double
+        self.positions = {user_id: i for i, user_id in enumerate(self.user_ids)}
+
+    @classmethod
+    def generate(cls, user_ids, double=False, start_week=1, seed=None):
+        """Schedule for a league, user order shuffled when a seed (or Generator) is given"""
+        user_ids = list(user_ids)
+        if seed is not None:
+            rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+            user_ids = [user_ids[i] for i in rng.permutation(len(user_ids))]
+        return cls(user_ids, round_robin_template(len(user_ids), double), start_week, double)
+
+    @property
+    def n_weeks(self):
+        return len(self.pairings)
+
+    def week_pairings(self, week):
+        """[home, away] positions for a week, an empty array before the season starts"""
+        if week < self.start_week or not self.n_weeks:
+            return self.pairings[:0].reshape(0, 2)
+        return self.pairings[(week - self.start_week) % self.n_weeks]
+
+    def week_matchups(self, week):
+        """Matchup dicts for a week, in the layout MatchupManager stores"""
+        return [self._matchup(week, home, away) for home, away in self.week_pairings(week).tolist()]
+
+    def user_matchup(self, user_id, week):
+        """A user's matchup dict for a week, or None"""
+        position = self.positions.get(user_id)
+        if position is None or week < self.start_week or not self.n_weeks:
+            return None
+        round_index = (week - self.start_week) % self.n_weeks
+        pair_index = template_slots(len(self.user_ids), self.double)[round_index, position]
+        home, away = self.pairings[round_index, pair_index].tolist()
+        return self._matchup(week, home, away)
+
+    def _matchup(self, week, home, away):
+        is_bye = away == BYE
+        return {
+            'week': week,
+            'team1': self.user_ids[home],
+            'team2': None if is_bye else self.user_ids[away],
+            'team1_score': 0,
+            'team2_score': 0,
+            'completed': is_bye,
+            'is_bye': is_bye,
+            'created_at': datetime.now().isoformat()
+        }
+
+    def to_dict(self):
+        """Plain dict for session storage"""
+        return {'user_ids': self.user_ids, 'start_week': self.start_week, 'double': self.double}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls.generate(data['user_ids'], data['double'], data['start_week'])
+
+
+def generate_schedules(leagues, double=False, start_week=1, seed=None):
+    """
+    Season schedules for many leagues at once
+
+    One template is built per league size and shared, so the cost per league is
+    a shuffle of its users.
+
+    Args:
+        leagues: {league_id: user_ids}
+        seed: shuffle every league's user order from this seed, None keeps it
+
+    Returns:
+        {league_id: SeasonSchedule}
+    """
+    rng = np.random.default_rng(seed) if seed is not None else None
+    return {league_id: SeasonSchedule.generate(user_ids, double, start_week, rng)
+            for league_id, user_ids in leagues.items()}
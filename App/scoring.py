@@ -0,0 +1,77 @@
+# App/scoring.py
+import numpy as np
+import pandas as pd
+from App.config import SCORING_RULES, SCORING_STAT_COLUMNS
+
+DEFAULT_RULE_SET = 'default'
+
+
+class ScoringEngine:
+    """
+    Vectorized fantasy scoring driven by SCORING_RULES
+
+    One or more rule sets ({rule name: points}) are turned into a weight matrix
+    (stat columns x rule sets) so a whole stat matrix is scored for every rule
+    set with a single matrix product.
+    """
+
+    def __init__(self, rule_sets=None):
+        if rule_sets is None:
+            rule_sets = {DEFAULT_RULE_SET: SCORING_RULES}
+        if not rule_sets:
+            raise ValueError("At least one rule set is required")
+
+        for name, rules in rule_sets.items():
+            unknown = [rule for rule in rules if rule not in SCORING_STAT_COLUMNS]
+            if unknown:
+                raise ValueError(f"Rule set '{name}' has unknown scoring rules: {unknown}")
+
+        self.rule_sets = dict(rule_sets)
+        self.rule_set_names = list(self.rule_sets)
+        self._weights = {}  # {tuple(stat_columns): weight matrix}
+
+    def weight_matrix(self, stat_columns):
+        """Weight matrix of shape (len(stat_columns), number of rule sets)"""
+        key = tuple(stat_columns)
+        if key not in self._weights:
+            values = [points for rules in self.rule_sets.values() for points in rules.values()]
+            integral = all(float(points).is_integer() for points in values)
+            weights = np.zeros((len(key), len(self.rule_set_names)),
+                               dtype=np.int64 if integral else np.float64)
+
+            for j, rules in enumerate(self.rule_sets.values()):
+                for rule, points in rules.items():
+                    stat = SCORING_STAT_COLUMNS[rule]
+                    if stat in key:
+                        weights[key.index(stat), j] = points
+
+            weights.setflags(write=False)
+            self._weights[key] = weights
+        return self._weights[key]
+
+    def score(self, stats, stat_columns):
+        """
+        Score a stat matrix for every rule set
+
+        Args:
+            stats: array of shape (rows, len(stat_columns))
+            stat_columns: names of the stat matrix columns
+
+        Returns:
+            Points matrix of shape (rows, number of rule sets)
+        """
+        return stats @ self.weight_matrix(stat_columns)
+
+    def score_frame(self, stats, stat_columns, index=None):
+        """Points as a DataFrame with one column per rule set"""
+        return pd.DataFrame(self.score(stats, stat_columns), columns=self.rule_set_names, index=index)
+
+    def rule_set_column(self, points, rule_set=None):
+        """Column view of one rule set's points in a points matrix"""
+        if rule_set is None:
+            rule_set = self.rule_set_names[0]
+        return points[:, self.rule_set_names.index(rule_set)]
+
+
+# Create a singleton instance
+scoring_engine = ScoringEngine()
@@ -0,0 +1,84 @@
+# App/scrape_manifest.py
+import hashlib
+import json
+import os
+import time
+
+from App.config import SCRAPE_MANIFEST_PATH
+from App.page_archive import archive_key, match_id_for
+
+
+class ScrapeManifest:
+    """
+    Persistent record of every match page scraped
+
+    Keyed by the match URL parameters (same keys as the page archive), each
+    entry holds the match id, week, fetch time, content hash and whether the
+    match was final. An incremental refresh only fetches matches that are new
+    or not final yet, and only re-parses pages whose hash changed.
+    """
+
+    def __init__(self, path=SCRAPE_MANIFEST_PATH):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def get(self, url):
+        return self.entries.get(archive_key(url))
+
+    def needs_fetch(self, url):
+        """New and in-progress matches are fetched, final ones never again"""
+        entry = self.get(url)
+        return entry is None or not entry['final']
+
+    def week_final(self, week):
+        """True once every known match of a week is final"""
+        week_entries = [entry for entry in self.entries.values() if entry.get('week') == week]
+        return bool(week_entries) and all(entry['final'] for entry in week_entries)
+
+    def _sha256(self, content):
+        if content is None:
+            return None
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        return hashlib.sha256(content).hexdigest()
+
+    def changed(self, url, content):
+        """True if the match is new or its page differs from the recorded one"""
+        entry = self.get(url)
+        return entry is None or entry['sha256'] is None or entry['sha256'] != self._sha256(content)
+
+    def record(self, url, content, final=False, week=None):
+        """
+        Record a fetched page
+
+        content None records the match without a page hash (e.g. its page
+        didn't parse), so the next fetch counts as changed.
+
+        Returns:
+            True if the match is new or its page changed since the last fetch
+        """
+        sha256 = self._sha256(content)
+        key = archive_key(url)
+        previous = self.entries.get(key)
+
+        self.entries[key] = {
+            'url': url,
+            'match_id': match_id_for(url),
+            'week': week if week is not None else (previous or {}).get('week'),
+            'fetched_at': time.time(),
+            'sha256': sha256,
+            'final': final,
+        }
+        return previous is None or previous['sha256'] is None or previous['sha256'] != sha256
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp_path, self.path)
@@ -1,10 +1,21 @@
 # app/scraper.py
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import re
+from collections import deque
+from App.config import SCRAPER_SETTINGS, STAT_COLUMNS, WEEK_ROUNDS
+from App.html_backends import get_backend
+from App.request_layer import RequestLayer
+from App.scraper_metrics import TimedHTTPAdapter, scraper_metrics
+from App.table_extractor import extract_table
+from App.document_index import MatchDocumentIndex
+
+# Leading columns of a parsed match page, extra scraped stats follow them
+MATCH_COLUMNS = ['jersey', 'player', 'team_code', 'goals', 'assists', 'steals',
+                 'blocks', 'saves', 'position', 'team_full', 'match_date']
 
 
 class LENScraper:
@@ -15,21 +26,48 @@ class LENScraper:
     1. Weekly match listings from results page
     2. Individual match details with player statistics
     3. Goalkeeper statistics from separate tables
+    4. Concurrent fetching of every match page in a round
+    5. Optional on-disk HTTP cache (conditional GETs, finished matches never refetched)
+    6. Selectable HTML parser backend (see App/html_backends.py)
+    7. Stats columns located from each table's header row (see App/table_extractor.py)
+    8. Tables matched to team and role in one walk of the page (see App/document_index.py)
+    9. Optional raw page archive of every match page fetched (see App/page_archive.py)
+    10. Rate limiting, retries with backoff and a circuit breaker (see App/request_layer.py)
+    11. Request phase timings, sizes, parse times and row counts (see App/scraper_metrics.py)
+    12. Generator stages for a streaming fetch -> parse -> score -> store run (see App/pipeline.py)
     """
 
-    def __init__(self, base_url="https://championsleague.europeanaquatics.org"):
+    def __init__(self, base_url="https://championsleague.europeanaquatics.org",
+                 max_workers=None, timeout=None, cache=None, parser=None, archive=None, max_retries=None,
+                 metrics=None):
         self.base_url = base_url
+        self.metrics = metrics or scraper_metrics
+        self.cache = cache
+        self.archive = archive
+        self.parser_backend = get_backend(parser)
+        self.max_workers = max_workers or SCRAPER_SETTINGS['max_concurrent_fetches']
+        self.timeout = timeout or SCRAPER_SETTINGS['request_timeout']
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
 
+        # Size the connection pool so parallel fetches don't queue for a connection;
+        # its connections time their connect / TLS phases for the metrics
+        adapter = TimedHTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Rate limit, retries with backoff and per-host circuit breaker around the session
+        self.requests = RequestLayer(self.session, timeout=self.timeout, max_retries=max_retries,
+                                     metrics=self.metrics)
+
     def test_connection(self):
         """Test connection to LEN website"""
         try:
             test_url = f"{self.base_url}/match-results-2526/"
-            response = self.session.get(test_url, timeout=10)
-            return response.status_code == 200
+            response = self._get(test_url)
+            return response.status_code in (200, 304)
         except:
             return False
 
@@ -38,7 +76,8 @@ class LENScraper:
         Get all matches for a specific week
 
         Args:
-            week_number: If None, gets current week's matches
+            week_number: fantasy week, its LEN rounds come from WEEK_ROUNDS; None
+                keeps every match on the results page
 
         Returns:
             List of dicts with match information
@@ -53,44 +92,111 @@ class LENScraper:
                 'away_code': 'JSP'
             }]
         """
+        return list(self.iter_weekly_matches(week_number))
+
+    def iter_weekly_matches(self, week_number=None):
+        """
+        Pipeline stage: yield the week's matches (same dicts as get_weekly_matches)
+        one by one as they are read from the results page
+
+        The results page lists the whole season, so with a week_number only
+        links of the week's rounds (WEEK_ROUNDS) are kept; a week without
+        configured rounds yields nothing.
+        """
+        rounds = None
+        if week_number is not None:
+            rounds = {str(round_number) for round_number in WEEK_ROUNDS.get(int(week_number), [])}
+            if not rounds:
+                print(f"No LEN rounds configured for week {week_number} (see WEEK_ROUNDS in App/config.py)")
+                return
+
         results_url = f"{self.base_url}/match-results-2526/"
 
         try:
-            response = self.session.get(results_url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            matches = []
+            document = self.parser_backend.parse(self.fetch_page(results_url))
 
             # Find match cards/containers - this will need adjustment based on actual HTML
             # Using placeholder logic based on your URL pattern knowledge
-            match_links = soup.find_all('a', href=re.compile(r'match-details-2526'))
+            match_links = [href for href in self.parser_backend.links(document)
+                           if re.search(r'match-details-2526', href)]
+        except Exception as e:
+            print(f"Error fetching weekly matches: {e}")
+            return
+
+        for match_url in match_links:
+            if not match_url.startswith('http'):
+                match_url = f"{self.base_url}/{match_url}"
+
+            # Extract info from URL parameters
+            params = self._parse_match_url_params(match_url)
+            if rounds is not None and params.get('gr') not in rounds:
+                continue
 
-            for link in match_links:
-                match_url = link['href']
-                if not match_url.startswith('http'):
-                    match_url = f"{self.base_url}/{match_url}"
+            # This is a simplified version - will need tuning based on actual page structure
+            yield {
+                'match_url': match_url,
+                'home_code': params.get('s1', ''),
+                'away_code': params.get('s2', ''),
+                'match_date': self._parse_date_from_params(params.get('sch', ''))
+            }
 
-                # Extract info from URL parameters
-                params = self._parse_match_url_params(match_url)
+    @property
+    def failures(self):
+        """{url: reason} of requests that failed for good ('timeout', 'http_503', 'circuit_open', ...)"""
+        return self.requests.failures
 
-                # Try to extract from link text or surrounding elements
-                match_text = link.get_text(strip=True)
+    def _get(self, url):
+        """
+        GET through the request layer, conditional when the URL is cached
 
-                # This is a simplified version - will need tuning based on actual page structure
-                match_info = {
-                    'match_url': match_url,
-                    'home_code': params.get('s1', ''),
-                    'away_code': params.get('s2', ''),
-                    'match_date': self._parse_date_from_params(params.get('sch', ''))
-                }
+        Raises RequestFailed (with .reason) when the page can't be fetched
+        """
+        headers = self.cache.conditional_headers(url) if self.cache is not None else {}
+        response = self.requests.get(url, headers=headers)
 
-                matches.append(match_info)
+        if response.status_code == 304 and self.cache is not None:
+            self.cache.touch(url, final=self._is_final_match_url(url) or None)
+            return response
 
-            return matches
+        if self.cache is not None:
+            self.cache.store(url, response, final=self._is_final_match_url(url))
+        return response
 
-        except Exception as e:
-            print(f"Error fetching weekly matches: {e}")
-            return []
+    def fetch_page(self, url):
+        """
+        Fetch a page through the shared session, returns the raw response body
+
+        With a cache, finished matches are read from disk without a request and
+        other pages are revalidated with a conditional GET. With an archive,
+        every match page body is archived (unchanged pages are stored once).
+        """
+        if self.cache is not None and self.cache.is_final(url):
+            content = self.cache.read_body(url)
+        else:
+            response = self._get(url)
+            content = self.cache.read_body(url) if response.status_code == 304 else response.content
+
+        if self.archive is not None and 'match-details' in url:
+            self.archive.store(url, content)
+        return content
+
+    def _is_final_match_url(self, url):
+        """Finished matches carry the final status in the "st" URL parameter"""
+        params = self._parse_match_url_params(url)
+        return 'match-details' in url and params.get('st') == SCRAPER_SETTINGS['final_match_status']
+
+    def _cached_parse(self, match_url):
+        """Parsed DataFrame of a finished match from the cache, or None"""
+        if self.cache is None or not self.cache.is_final(match_url):
+            return None
+        return self.cache.read_parsed(match_url)
+
+    def _parse_and_cache(self, content, match_url):
+        """Parse a fetched page and keep the result when the match is finished"""
+        df = self.parse_match_html(content, match_url)
+        if self.cache is not None and self.cache.is_final(match_url):
+            self.cache.store_parsed(match_url, df)
+        return df
 
     def parse_match_page(self, match_url):
         """
@@ -104,244 +210,309 @@ class LENScraper:
             ['jersey', 'player', 'team_code', 'goals', 'assists', 'steals',
              'blocks', 'saves', 'position', 'team_full', 'match_date']
         """
-        try:
-            response = self.session.get(match_url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Extract match metadata from URL
-            params = self._parse_match_url_params(match_url)
-            match_date = self._parse_date_from_params(params.get('sch', ''))
+        for _, df in self.parse_match_pages([match_url], max_workers=1):
+            return df
+        return pd.DataFrame()
 
-            # Get team names from page
-            team_names = self._extract_team_names(soup)
-            home_team_full = team_names.get('home', params.get('s1', ''))
-            away_team_full = team_names.get('away', params.get('s2', ''))
-            home_code = params.get('s1', '')
-            away_code = params.get('s2', '')
+    def parse_match_html(self, content, match_url):
+        """
+        Parse an already fetched match page
 
-            # Find player statistics tables
-            player_tables = soup.find_all('table', class_=re.compile(r'player-stats|stats-table', re.I))
+        Args:
+            content: HTML of the match details page (bytes or str)
+            match_url: URL the page was fetched from (team codes and date come from it)
 
-            all_players = []
+        Returns:
+            pandas.DataFrame, same columns as parse_match_page()
+        """
+        columns = self.parse_match_columns(content, match_url)
+        if not columns:
+            return pd.DataFrame()
+        return pd.DataFrame(columns)
 
-            # Process each table (typically 2 tables: one per team)
-            for table in player_tables:
-                # Determine which team this table belongs to
-                team_full, team_code = self._identify_team_from_table(table, home_team_full, away_team_full, home_code,
-                                                                      away_code)
+    def parse_match_columns(self, content, match_url):
+        """
+        Pipeline stage: parse a fetched match page straight into columns
 
-                # Parse field players
-                players = self._parse_field_players(table, team_code, team_full)
-                all_players.extend(players)
+        Rows are merged and filled without building any DataFrame: numeric
+        columns missing for a row are 0, text columns ''.
 
-                # Look for goalkeeper data (often in separate table or section)
-                # This will be enhanced based on actual page structure
+        Returns:
+            {column: list of values} in parse_match_page() column order, {} when
+            the page has no player stats
+        """
+        start = time.perf_counter()
+        try:
+            document = self.parser_backend.parse(content)
 
-            # Try to find goalkeeper-specific tables
-            gk_tables = soup.find_all('table', class_=re.compile(r'goalkeeper|gk', re.I))
-            for gk_table in gk_tables:
-                team_full, team_code = self._identify_team_from_table(gk_table, home_team_full, away_team_full,
-                                                                      home_code, away_code)
-                goalkeepers = self._parse_goalkeepers(gk_table, team_code, team_full)
-                all_players.extend(goalkeepers)
+            # Extract match metadata from URL
+            params = self._parse_match_url_params(match_url)
+            match_date = self._parse_date_from_params(params.get('sch', ''))
 
-            # Create DataFrame
-            df = pd.DataFrame(all_players)
+            # One walk of the page gives every stats table its team and role
+            index = MatchDocumentIndex(self.parser_backend, document, params.get('s1', ''), params.get('s2', ''))
 
-            if not df.empty:
-                # Add match date to all rows
-                df['match_date'] = match_date
+            field_rows = []
+            gk_rows = []
+            for entry in index.tables:
+                # Goalkeeper tables carry saves/shots faced for the keepers
+                rows = self._table_rows(entry['table'], entry['team_code'], entry['team_full'], entry['role'])
+                (gk_rows if entry['role'] == 'goalkeeper' else field_rows).extend(rows)
 
-                # Ensure consistent column order
-                column_order = ['jersey', 'player', 'team_code', 'goals', 'assists', 'steals',
-                                'blocks', 'saves', 'position', 'team_full', 'match_date']
-                for col in column_order:
-                    if col not in df.columns:
-                        df[col] = None
+            rows = self._merge_goalkeepers(field_rows, gk_rows)
+            columns = self._rows_to_columns(rows, match_date) if rows else {}
 
-                df = df[column_order]
-
-            return df
+            rows_per_team = {}
+            for team_code in columns.get('team_code', []):
+                rows_per_team[team_code] = rows_per_team.get(team_code, 0) + 1
+            self.metrics.observe_parse(time.perf_counter() - start, len(index.tables), rows_per_team)
+            return columns
 
         except Exception as e:
             print(f"Error parsing match page {match_url}: {e}")
-            return pd.DataFrame()
+            self.metrics.pages_parsed.inc(outcome='error')
+            return {}
 
-    def _parse_match_url_params(self, match_url):
-        """Extract parameters from match URL"""
-        params = {}
-        if '?' in match_url:
-            query_string = match_url.split('?')[1]
-            for param in query_string.split('&'):
-                if '=' in param:
-                    key, value = param.split('=')
-                    params[key] = value
-        return params
+    def fetch_match_pages(self, match_urls, max_workers=None):
+        """
+        Fetch match pages in parallel
 
-    def _parse_date_from_params(self, date_str):
-        """Convert DDMMYYYY to YYYY-MM-DD"""
-        if date_str and len(date_str) == 8:
-            try:
-                return f"{date_str[4:]}-{date_str[2:4]}-{date_str[:2]}"
-            except:
-                return date_str
-        return date_str
+        URLs are taken from match_urls lazily and at most max_workers pages are
+        in flight or waiting to be consumed, so memory stays bounded however
+        many pages there are and however slowly the caller uses them.
 
-    def _extract_team_names(self, soup):
-        """Extract team names from match page"""
-        # This needs to be adapted to actual page structure
-        # Placeholder implementation
-        team_names = {'home': '', 'away': ''}
+        Args:
+            match_urls: URLs to fetch (any iterable, e.g. a pipeline stage)
+            max_workers: concurrency cap, defaults to the scraper's max_workers
 
-        # Look for team name elements
-        team_elements = soup.find_all(['h2', 'h3', 'div'], class_=re.compile(r'team-name|team-title', re.I))
+        Yields:
+            (match_url, content, error) in completion order; content is None on error
+        """
+        match_urls = iter(match_urls)
+        max_workers = max_workers or self.max_workers
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+
+            def submit_next():
+                for url in match_urls:
+                    futures[executor.submit(self.fetch_page, url)] = url
+                    return
+
+            for _ in range(max_workers):
+                submit_next()
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    match_url = futures.pop(future)
+                    submit_next()
+                    try:
+                        content, error = future.result(), None
+                    except Exception as e:
+                        content, error = None, e
+                    yield match_url, content, error
+
+    def iter_match_pages(self, match_urls, max_workers=None):
+        """
+        Pipeline stage: fetch_match_pages() that skips finished matches in the cache
 
-        if len(team_elements) >= 2:
-            team_names['home'] = team_elements[0].get_text(strip=True)
-            team_names['away'] = team_elements[1].get_text(strip=True)
+        Yields:
+            (match_url, content, error) as pages arrive; content is None (and
+            error None) for a finished match in the cache, which isn't fetched
+        """
+        cached = deque()
+
+        def to_fetch():
+            for match_url in match_urls:
+                if self.cache is not None and self.cache.is_final(match_url):
+                    cached.append(match_url)
+                else:
+                    yield match_url
+
+        for page in self.fetch_match_pages(to_fetch(), max_workers):
+            while cached:
+                yield cached.popleft(), None, None
+            yield page
+        while cached:
+            yield cached.popleft(), None, None
+
+    def iter_match_columns(self, pages):
+        """
+        Pipeline stage: parse pages from iter_match_pages() into columns
 
-        return team_names
+        Finished matches come from the parsed cache (and are added to it).
 
-    def _identify_team_from_table(self, table, home_team_full, away_team_full, home_code, away_code):
-        """Identify which team a table belongs to"""
-        # Try to find team identifier in table or surrounding elements
-        table_html = str(table)
+        Yields:
+            (match_url, columns) per page, columns is {} for failed pages and
+            pages without player stats
+        """
+        for match_url, content, error in pages:
+            if error is not None:
+                print(f"Error parsing match page {match_url}: {error}")
+                yield match_url, {}
+                continue
 
-        # Check for team codes in table
-        if home_code and home_code in table_html:
-            return home_team_full, home_code
-        elif away_code and away_code in table_html:
-            return away_team_full, away_code
+            if content is None:
+                cached = self._cached_parse(match_url)
+                if cached is not None:
+                    yield match_url, {name: cached[name].tolist() for name in cached.columns}
+                    continue
+                content = self.fetch_page(match_url)
 
-        # Fallback to checking team names
-        if home_team_full and home_team_full.split()[-1] in table_html:
-            return home_team_full, home_code
-        elif away_team_full and away_team_full.split()[-1] in table_html:
-            return away_team_full, away_code
+            columns = self.parse_match_columns(content, match_url)
+            if columns and self.cache is not None and self.cache.is_final(match_url):
+                self.cache.store_parsed(match_url, pd.DataFrame(columns))
+            yield match_url, columns
 
-        # Default to home team if uncertain
-        return home_team_full, home_code
+    def parse_match_pages(self, match_urls, max_workers=None):
+        """
+        Fetch every match page concurrently and parse each one as it arrives
 
-    def _parse_field_players(self, table, team_code, team_full):
-        """Parse field player statistics from a table row"""
-        players = []
+        Finished matches already in the cache are read from it, without a request.
 
-        # Find all rows (skip header if present)
-        rows = table.find_all('tr')[1:]  # Skip header row
+        Yields:
+            (match_url, DataFrame) in completion order; failed pages give an empty DataFrame
+        """
+        for match_url, columns in self.iter_match_columns(self.iter_match_pages(match_urls, max_workers)):
+            yield match_url, pd.DataFrame(columns)
 
-        for row in rows:
-            cells = row.find_all('td')
+    def scrape_week(self, week_number=None, max_workers=None):
+        """
+        Scrape every match of a round with concurrent page fetches
 
-            if len(cells) < 10:  # Need enough cells for stats
-                continue
+        Returns:
+            {match_url: DataFrame} for every match returned by get_weekly_matches()
+        """
+        matches = self.get_weekly_matches(week_number)
+        match_urls = list(dict.fromkeys(match['match_url'] for match in matches))
+        results = dict(self.parse_match_pages(match_urls, max_workers))
 
-            try:
-                # Extract jersey number (first cell)
-                jersey = cells[0].get_text(strip=True)
-
-                # Extract player name (second cell)
-                player_name = cells[1].get_text(strip=True)
-
-                # Extract stats based on column positions from your analysis
-                # "TOTAL" column (goals/attempts) - format: "3/6"
-                total_text = cells[3].get_text(strip=True)  # Adjust index based on actual table
-                goals = self._extract_goals_from_total(total_text)
-
-                # "AS" = Assists (adjust index based on actual table)
-                assists = self._parse_integer(cells[6].get_text(strip=True))
-
-                # "ST" = Steals (adjust index)
-                steals = self._parse_integer(cells[13].get_text(strip=True))
-
-                # "BL" = Blocked shots (adjust index)
-                blocks = self._parse_integer(cells[14].get_text(strip=True))
-
-                player_data = {
-                    'jersey': jersey,
-                    'player': player_name,
-                    'team_code': team_code,
-                    'team_full': team_full,
-                    'goals': goals,
-                    'assists': assists,
-                    'steals': steals,
-                    'blocks': blocks,
-                    'saves': 0,  # Field players have 0 saves
-                    'position': 'field'
-                }
-
-                players.append(player_data)
-
-            except (IndexError, ValueError) as e:
-                # Skip rows that don't match expected format
-                continue
+        if self.archive is not None and week_number is not None:
+            for match_url in match_urls:
+                self.archive.set_week(match_url, week_number)
+        return results
 
-        return players
+    def refresh_week(self, week_number, manifest, max_workers=None):
+        """
+        Incremental scrape of a round using a ScrapeManifest
 
-    def _parse_goalkeepers(self, table, team_code, team_full):
-        """Parse goalkeeper statistics"""
-        goalkeepers = []
+        Only matches that are new or still in progress are fetched, and only
+        pages whose content changed are parsed. A match is recorded as final
+        only once its page parsed into player rows. Once every match of the
+        round is final the results page isn't fetched either.
 
-        rows = table.find_all('tr')[1:]  # Skip header
+        Returns:
+            {match_url: DataFrame} for the new or changed matches
+        """
+        if manifest.week_final(week_number):
+            return {}
 
-        for row in rows:
-            cells = row.find_all('td')
+        matches = self.get_weekly_matches(week_number)
+        match_urls = list(dict.fromkeys(match['match_url'] for match in matches))
+        pending = [match_url for match_url in match_urls if manifest.needs_fetch(match_url)]
 
-            if len(cells) < 5:
+        updated = {}
+        for match_url, content, error in self.fetch_match_pages(pending, max_workers):
+            if error is not None:
+                print(f"Error fetching match page {match_url}: {error}")
                 continue
+            if self.archive is not None:
+                self.archive.set_week(match_url, week_number)
 
-            try:
-                jersey = cells[0].get_text(strip=True)
-                player_name = cells[1].get_text(strip=True)
-
-                # Extract saves - need to identify correct column
-                # Look for saves data in cells
-                saves = 0
-                for i, cell in enumerate(cells):
-                    cell_text = cell.get_text(strip=True).lower()
-                    if 'saves' in cell_text or 'sv' in cell_text:
-                        # Try to parse saves from this or next cell
-                        saves = self._parse_integer(cell_text)
-                        if saves == 0 and i + 1 < len(cells):
-                            saves = self._parse_integer(cells[i + 1].get_text(strip=True))
-
-                goalkeeper_data = {
-                    'jersey': jersey,
-                    'player': player_name,
-                    'team_code': team_code,
-                    'team_full': team_full,
-                    'goals': 0,
-                    'assists': 0,
-                    'steals': 0,
-                    'blocks': 0,
-                    'saves': saves,
-                    'position': 'goalkeeper'
-                }
-
-                goalkeepers.append(goalkeeper_data)
-
-            except (IndexError, ValueError):
+            final = self._is_final_match_url(match_url)
+            if not manifest.changed(match_url, content):
+                manifest.record(match_url, content, final=final, week=week_number)
                 continue
 
-        return goalkeepers
+            df = self._parse_and_cache(content, match_url)
+            if df.empty:
+                # Not final and no page hash, so it is fetched and parsed again next time
+                print(f"No player stats for {match_url}, retrying on the next refresh")
+                manifest.record(match_url, None, week=week_number)
+                if self.cache is not None:
+                    self.cache.mark_final(match_url, False)
+                continue
+            manifest.record(match_url, content, final=final, week=week_number)
+            updated[match_url] = df
+
+        manifest.save()
+        return updated
+
+    def _parse_match_url_params(self, match_url):
+        """Extract parameters from match URL"""
+        params = {}
+        if '?' in match_url:
+            query_string = match_url.split('?')[1]
+            for param in query_string.split('&'):
+                if '=' in param:
+                    key, value = param.split('=')
+                    params[key] = value
+        return params
 
-    def _extract_goals_from_total(self, total_text):
-        """Extract goals from "3/6" format"""
-        if '/' in total_text:
+    def _parse_date_from_params(self, date_str):
+        """Convert DDMMYYYY to YYYY-MM-DD"""
+        if date_str and len(date_str) == 8:
             try:
-                return int(total_text.split('/')[0])
+                return f"{date_str[4:]}-{date_str[2:4]}-{date_str[:2]}"
             except:
-                return 0
-        else:
-            return self._parse_integer(total_text)
+                return date_str
+        return date_str
 
-    def _parse_integer(self, text):
-        """Safely parse integer from text"""
-        try:
-            # Remove non-numeric characters
-            numeric_text = re.sub(r'[^\d]', '', text)
-            return int(numeric_text) if numeric_text else 0
-        except:
-            return 0
+    def _table_rows(self, table, team_code, team_full, role):
+        """Player rows (dicts) of a stats table, columns located from the table's header row"""
+        columns = extract_table(self.parser_backend, table, role)
+        extra = {'team_code': team_code, 'team_full': team_full, 'position': role}
+        return [dict(zip(columns, values), **extra) for values in zip(*columns.values())]
+
+    def _merge_goalkeepers(self, players, goalkeepers):
+        """
+        Fold goalkeeper table rows into the player rows
+
+        Keepers listed in the player table get the goalkeeper-only columns (saves,
+        shots_faced) and position 'goalkeeper'; keepers missing there are appended.
+        """
+        keepers = {}
+        for row in goalkeepers:
+            keepers.setdefault((row['team_code'], row['jersey']), row)
+        if not players:
+            return list(keepers.values())
+
+        player_columns = {name for row in players for name in row}
+        listed = set()
+        merged = []
+        for row in players:
+            key = (row['team_code'], row['jersey'])
+            keeper = keepers.get(key)
+            if keeper is not None:
+                listed.add(key)
+                row = dict(row, position='goalkeeper')
+                row.update((name, value) for name, value in keeper.items() if name not in player_columns)
+            merged.append(row)
+
+        merged.extend(row for key, row in keepers.items() if key not in listed)
+        return merged
+
+    def _rows_to_columns(self, rows, match_date):
+        """Row dicts to MATCH_COLUMNS-first columns, filling gaps with 0 (numbers) or '' (text)"""
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        names.append('match_date')
+        names = MATCH_COLUMNS + [name for name in names if name not in MATCH_COLUMNS]
+
+        columns = {}
+        for name in names:
+            if name == 'match_date':
+                columns[name] = [match_date] * len(rows)
+                continue
+            values = [row.get(name) for row in rows]
+            present = next((value for value in values if value is not None), None)
+            if present is None:
+                # Column not scraped at all
+                columns[name] = [0 if name in STAT_COLUMNS else None] * len(rows)
+            else:
+                fill = 0 if isinstance(present, int) else ''
+                columns[name] = [fill if value is None else value for value in values]
+        return columns
 
     def scrape_sample_match(self):
         """Scrape the sample match from your proof of concept"""
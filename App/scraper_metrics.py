@@ -0,0 +1,259 @@
+# App/scraper_metrics.py
+import bisect
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1024, 10240, 51200, 102400, 262144, 524288, 1048576, 5242880)
+COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64)
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}  # {label values: count}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self.values.get(tuple(str(labels.get(name, '')) for name in self.labelnames), 0)
+
+    def samples(self):
+        with self.lock:
+            return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in sorted(self.values.items())]
+
+    def snapshot(self):
+        return [{'labels': labels, 'value': value} for _, labels, value in self.samples()]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels (Prometheus semantics)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self.series = {}  # {label values: [bucket counts..., +Inf count, sum]}
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self.lock:
+            series = self.series.setdefault(key, [0] * (len(self.buckets) + 1) + [0.0])
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def count(self, **labels):
+        series = self.series.get(tuple(str(labels.get(name, '')) for name in self.labelnames))
+        return sum(series[:-1]) if series else 0
+
+    def samples(self):
+        samples = []
+        with self.lock:
+            for key, series in sorted(self.series.items()):
+                labels = dict(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    samples.append((f"{self.name}_bucket", dict(labels, le=le), cumulative))
+                samples.append((f"{self.name}_sum", labels, series[-1]))
+                samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+    def snapshot(self):
+        with self.lock:
+            return [
+                {'labels': dict(zip(self.labelnames, key)), 'count': sum(series[:-1]), 'sum': series[-1],
+                 'buckets': dict(zip([repr(b) for b in self.buckets] + ['+Inf'], series[:-1]))}
+                for key, series in sorted(self.series.items())
+            ]
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+# Connection phase timings of the request running on the current thread
+_phases = threading.local()
+
+
+def reset_phases():
+    _phases.values = {}
+
+
+def current_phases():
+    return dict(getattr(_phases, 'values', {}))
+
+
+class _TimedConnectMixin:
+    """Times socket setup: DNS + TCP connect (_new_conn) and the rest of connect() (TLS)"""
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            getattr(_phases, 'values', {})['connect'] = time.perf_counter() - start
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        phases = getattr(_phases, 'values', {})
+        phases['tls'] = max(0.0, time.perf_counter() - start - phases.get('connect', 0.0))
+
+
+class TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections record their connect / TLS time for ScraperMetrics"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+class ScraperMetrics:
+    """
+    Counters and histograms for the scraper's fetches and parses
+
+    Request time is split into connect (DNS + TCP, 0 on a reused connection),
+    tls, wait (server time to first byte) and transfer (body download), so a
+    slow refresh can be put on the site, the network or our own parsing.
+    Read it with render_prometheus() (text exposition format) or snapshot() / to_json().
+    """
+
+    def __init__(self):
+        self.requests = Counter('scraper_requests_total', 'HTTP responses and errors by host and status',
+                                ('host', 'status'))
+        self.retries = Counter('scraper_retries_total', 'Request attempts that were retried', ('host',))
+        self.failures = Counter('scraper_failures_total', 'Requests that failed for good', ('host', 'reason'))
+        self.request_seconds = Histogram('scraper_request_seconds', 'Request time by phase', SECONDS_BUCKETS,
+                                         ('phase',))
+        self.response_bytes = Histogram('scraper_response_bytes', 'Response body size', BYTES_BUCKETS)
+        self.parse_seconds = Histogram('scraper_parse_seconds', 'Match page parse time', SECONDS_BUCKETS)
+        self.tables_found = Histogram('scraper_tables_found', 'Stats tables found per match page', COUNT_BUCKETS)
+        self.rows_extracted = Counter('scraper_rows_extracted_total', 'Player rows extracted by team',
+                                      ('team',))
+        self.pages_parsed = Counter('scraper_pages_parsed_total', 'Match pages parsed by outcome', ('outcome',))
+        self.metrics = [self.requests, self.retries, self.failures, self.request_seconds, self.response_bytes,
+                        self.parse_seconds, self.tables_found, self.rows_extracted, self.pages_parsed]
+
+    def observe_request(self, url, status, total, response=None, phases=None):
+        """Record one request attempt (status is the HTTP status or an error reason)"""
+        host = urlsplit(url).netloc
+        phases = phases or {}
+        self.requests.inc(host=host, status=status)
+        self.request_seconds.observe(total, phase='total')
+
+        if response is not None:
+            headers_at = response.elapsed.total_seconds()
+            setup = phases.get('connect', 0.0) + phases.get('tls', 0.0)
+            self.request_seconds.observe(phases.get('connect', 0.0), phase='connect')
+            self.request_seconds.observe(phases.get('tls', 0.0), phase='tls')
+            self.request_seconds.observe(max(0.0, headers_at - setup), phase='wait')
+            self.request_seconds.observe(max(0.0, total - headers_at), phase='transfer')
+            self.response_bytes.observe(len(response.content))
+
+    def observe_retry(self, url):
+        self.retries.inc(host=urlsplit(url).netloc)
+
+    def observe_failure(self, url, reason):
+        self.failures.inc(host=urlsplit(url).netloc, reason=reason)
+
+    def observe_parse(self, seconds, tables, rows_per_team):
+        self.parse_seconds.observe(seconds)
+        self.tables_found.observe(tables)
+        self.pages_parsed.inc(outcome='rows' if rows_per_team else 'empty')
+        for team, rows in rows_per_team.items():
+            self.rows_extracted.inc(rows, team=team)
+
+    def render_prometheus(self):
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        return {metric.name: metric.snapshot() for metric in self.metrics}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=1)
+
+    def serve(self, port=9108, host='127.0.0.1'):
+        """Serve /metrics (Prometheus text) and /metrics.json on a background thread"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = metrics.render_prometheus().encode(), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, content_type = metrics.to_json().encode(), 'application/json'
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+# Create a singleton instance
+scraper_metrics = ScraperMetrics()
@@ -0,0 +1,172 @@
+# App/season_simulator.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from App.config import SIMULATION_SETTINGS
+from App.roster_scoring import RosterMatrix
+
+
+def _simulate_chunk(task):
+    """
+    Simulate a batch of seasons (module level so worker processes can run it)
+
+    Returns:
+        (playoff counts, title counts, summed wins, summed points) per user
+    """
+    seed, trials, sim = task
+    rng = np.random.default_rng(seed)
+    n_users = len(sim['wins'])
+    n_weeks = sim['n_weeks']
+
+    # Player points for every remaining week, then every roster at once
+    samples = rng.normal(sim['mu'], sim['sd'], size=(trials, n_weeks, len(sim['mu'])))
+    np.maximum(samples, 0.0, out=samples)
+    scores = samples @ sim['roster_weights'].T  # (trials, weeks, users)
+
+    home_scores = scores[:, sim['week_index'], sim['home']]
+    away_scores = scores[:, sim['week_index'], sim['away']]
+    wins = (sim['wins'] + (home_scores > away_scores) @ sim['home_onehot']
+            + (away_scores > home_scores) @ sim['away_onehot'])
+    points = sim['points'] + scores.sum(axis=1)
+
+    # Same order as StandingsLedger: wins, then points, then join order
+    join_order = np.broadcast_to(np.arange(n_users), (trials, n_users))
+    ranked = np.lexsort((join_order, -points, -wins), axis=-1)
+
+    playoff_counts = np.zeros(n_users, dtype=np.int64)
+    title_counts = np.zeros(n_users, dtype=np.int64)
+    n_playoff = sim['playoff_teams']
+    if n_playoff:
+        seeds = ranked[:, :n_playoff]
+        playoff_counts = np.bincount(seeds.ravel(), minlength=n_users)
+        # Single elimination, best seed left meets worst seed left each round
+        while seeds.shape[1] > 1:
+            week = rng.normal(sim['mu'], sim['sd'], size=(trials, len(sim['mu'])))
+            np.maximum(week, 0.0, out=week)
+            week_scores = week @ sim['roster_weights'].T
+            half = seeds.shape[1] // 2
+            top, bottom = seeds[:, :half], seeds[:, ::-1][:, :half]
+            top_scores = np.take_along_axis(week_scores, top, axis=1)
+            bottom_scores = np.take_along_axis(week_scores, bottom, axis=1)
+            seeds = np.where(top_scores >= bottom_scores, top, bottom)
+        title_counts = np.bincount(seeds[:, 0], minlength=n_users)
+    return playoff_counts, title_counts, wins.sum(axis=0), points.sum(axis=0)
+
+
+class SeasonSimulator:
+    """
+    Monte Carlo playoff and title odds for a league
+
+    Each trial samples every rostered player's points for every remaining week
+    from their projection (normal, clipped at 0), scores all rosters with one
+    matrix product, settles the remaining matchups, ranks the final standings
+    like StandingsLedger and plays a single-elimination playoff among the top
+    seeds. Trials run in seeded batches; with more than one worker the batches
+    are spread over processes, with the same result for the same seed.
+    """
+
+    def __init__(self, user_ids, wins, points, remaining, rosters, projections, playoff_teams=None):
+        """
+        Args:
+            user_ids: users in join order
+            wins, points: {user_id: current wins / total points}
+            remaining: [[(team1, team2), ...] per remaining week], byes left out
+            rosters: {user_id: lineup} used for every remaining week (see RosterMatrix)
+            projections: DataFrame with player, team_code, projected_points and points_std
+            playoff_teams: top seeds in the playoff (rounded down to a power of two)
+        """
+        self.user_ids = list(user_ids)
+        positions = {user_id: i for i, user_id in enumerate(self.user_ids)}
+        n_users = len(self.user_ids)
+
+        roster_matrix = RosterMatrix(self.user_ids, rosters)
+        roster_weights = np.zeros(roster_matrix.shape)
+        np.add.at(roster_weights, (roster_matrix.user_index, roster_matrix.player_index), roster_matrix.weights)
+
+        keys = list(zip(projections['player'], projections['team_code']))
+        mu = dict(zip(keys, projections['projected_points'].tolist()))
+        sd = dict(zip(keys, projections['points_std'].tolist()))
+
+        week_index, home, away = [], [], []
+        for week, pairs in enumerate(remaining):
+            for team1, team2 in pairs:
+                week_index.append(week)
+                home.append(positions[team1])
+                away.append(positions[team2])
+
+        playoff_teams = min(SIMULATION_SETTINGS['playoff_teams'] if playoff_teams is None else playoff_teams,
+                            n_users)
+        self.sim = {
+            'n_weeks': len(remaining),
+            'mu': np.array([mu.get(key, 0.0) for key in roster_matrix.player_keys]),
+            'sd': np.array([sd.get(key, 0.0) for key in roster_matrix.player_keys]),
+            'roster_weights': roster_weights,
+            'week_index': np.asarray(week_index, dtype=np.int64),
+            'home': np.asarray(home, dtype=np.int64),
+            'away': np.asarray(away, dtype=np.int64),
+            'home_onehot': np.eye(n_users)[home].reshape(len(home), n_users),
+            'away_onehot': np.eye(n_users)[away].reshape(len(away), n_users),
+            'wins': np.array([wins.get(user_id, 0) for user_id in self.user_ids], dtype=np.float64),
+            'points': np.array([points.get(user_id, 0) for user_id in self.user_ids], dtype=np.float64),
+            'playoff_teams': 2 ** int(np.log2(playoff_teams)) if playoff_teams >= 1 else 0,
+        }
+
+    @classmethod
+    def for_league(cls, league, projections, playoff_teams=None):
+        """
+        Simulator for a FantasyLeague's remaining season
+
+        Remaining weeks are the schedule's weeks without scores yet (or, without a
+        schedule, the stored weeks with unplayed matchups). Every user plays them
+        with their latest saved lineup.
+        """
+        manager = league.matchup_manager
+        if manager.schedule is not None:
+            start = manager.schedule.start_week
+            weeks = range(start, start + manager.schedule.n_weeks)
+        else:
+            weeks = sorted({m['week'] for m in manager.matchups if not m.get('completed')})
+        remaining = [[(m['team1'], m['team2']) for m in manager.get_weekly_matchups(week) if m.get('team2')]
+                     for week in weeks if week not in manager.scores]
+
+        standings = league.get_standings()
+        rosters = {}
+        for user_id, user_data in league.users.items():
+            lineups = user_data.get('lineups', {})
+            if lineups:
+                rosters[user_id] = lineups[max(lineups)]
+        return cls(list(league.users), {row['user_id']: row['wins'] for row in standings},
+                   {row['user_id']: row['total_points'] for row in standings},
+                   remaining, rosters, projections, playoff_teams)
+
+    def simulate(self, trials=None, seed=None, workers=None):
+        """
+        Run the trials
+
+        Returns:
+            {user_id: {'playoff_odds', 'title_odds', 'mean_wins', 'mean_points'}}
+        """
+        trials = trials or SIMULATION_SETTINGS['trials']
+        chunk = SIMULATION_SETTINGS['chunk_trials']
+        sizes = [min(chunk, trials - start) for start in range(0, trials, chunk)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        tasks = [(child, size, self.sim) for child, size in zip(seeds, sizes)]
+
+        workers = workers or SIMULATION_SETTINGS['workers'] or os.cpu_count() or 1
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                results = list(executor.map(_simulate_chunk, tasks))
+        else:
+            results = [_simulate_chunk(task) for task in tasks]
+
+        playoff, title, wins, points = (np.sum(values, axis=0) for values in zip(*results))
+        return {
+            user_id: {
+                'playoff_odds': float(playoff[i] / trials),
+                'title_odds': float(title[i] / trials),
+                'mean_wins': float(wins[i] / trials),
+                'mean_points': float(points[i] / trials),
+            }
+            for i, user_id in enumerate(self.user_ids)
+        }
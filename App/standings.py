@@ -0,0 +1,130 @@
+# App/standings.py
+import bisect
+
+
+class StandingsLedger:
+    """
+    Running league standings, updated as scores and matchup results come in
+
+    Each user's totals are the sum of recorded contributions: one score per
+    (week, user) and one result per matchup. Recording the same week or matchup
+    again replaces its earlier contribution, so score corrections are applied
+    as a difference instead of a recompute.
+
+    Rank order is kept in a sorted list of (-wins, -points, join order, user_id)
+    keys: an update moves one key with two binary searches, rank(user_id) is a
+    binary search, and standings() returns the cached table until something changes.
+    """
+
+    def __init__(self, users=None):
+        self.users = {}  # {user_id: {'name', 'team_name'}}
+        self.totals = {}  # {user_id: {'total_points', 'wins', 'losses'}}
+        self.week_scores = {}  # {(week, user_id): points}
+        self.results = {}  # {(week, team1, team2): (team1 outcome, team2 outcome)}
+        self._keys = {}  # {user_id: rank key}
+        self._order = []  # rank keys, sorted
+        self._joined = 0
+        self._table = None
+        for user_id, user_data in (users or {}).items():
+            self.add_user(user_id, user_data)
+
+    @classmethod
+    def from_history(cls, users, scores, matchups):
+        """Ledger for a league's stored scores ({week: {user_id: points}}) and matchups"""
+        ledger = cls(users)
+        for week, week_scores in scores.items():
+            for user_id, points in week_scores.items():
+                ledger.record_score(week, user_id, points)
+        for matchup in matchups:
+            ledger.record_matchup(matchup)
+        return ledger
+
+    def __len__(self):
+        return len(self.users)
+
+    def add_user(self, user_id, user_data=None):
+        if user_id in self.users:
+            return
+        user_data = user_data or {}
+        self.users[user_id] = {'name': user_data.get('name', 'Unknown'),
+                               'team_name': user_data.get('team_name', 'Unknown')}
+        self.totals[user_id] = {'total_points': 0, 'wins': 0, 'losses': 0}
+        self._keys[user_id] = (0, 0, self._joined, user_id)
+        self._joined += 1
+        bisect.insort(self._order, self._keys[user_id])
+        self._table = None
+
+    def remove_user(self, user_id):
+        if user_id not in self.users:
+            return
+        self._order.pop(bisect.bisect_left(self._order, self._keys.pop(user_id)))
+        del self.users[user_id]
+        del self.totals[user_id]
+        self._table = None
+
+    def _update(self, user_id, points=0, wins=0, losses=0):
+        """Apply a change to a user's totals and move their rank key"""
+        if user_id not in self.users or not (points or wins or losses):
+            return
+        totals = self.totals[user_id]
+        totals['total_points'] += points
+        totals['wins'] += wins
+        totals['losses'] += losses
+
+        old_key = self._keys[user_id]
+        self._order.pop(bisect.bisect_left(self._order, old_key))
+        new_key = (-totals['wins'], -totals['total_points'], old_key[2], user_id)
+        bisect.insort(self._order, new_key)
+        self._keys[user_id] = new_key
+        self._table = None
+
+    def record_score(self, week, user_id, points):
+        """Set a user's score for a week (a correction replaces the earlier score)"""
+        previous = self.week_scores.get((week, user_id), 0)
+        self.week_scores[(week, user_id)] = points
+        self._update(user_id, points=points - previous)
+
+    def record_matchup(self, matchup):
+        """
+        Count a matchup's result; incomplete matchups and byes count nothing
+
+        Recording a matchup again (e.g. after a score correction) replaces its
+        earlier result.
+        """
+        key = (matchup['week'], matchup['team1'], matchup.get('team2'))
+        outcome = (None, None)
+        if matchup.get('completed') and matchup.get('team2'):
+            if matchup['team1_score'] > matchup['team2_score']:
+                outcome = ('W', 'L')
+            elif matchup['team1_score'] < matchup['team2_score']:
+                outcome = ('L', 'W')
+
+        previous = self.results.get(key, (None, None))
+        if outcome == previous:
+            return
+        self.results[key] = outcome
+        for user_id, old, new in zip(key[1:], previous, outcome):
+            self._update(user_id, wins=(new == 'W') - (old == 'W'), losses=(new == 'L') - (old == 'L'))
+
+    def rank(self, user_id):
+        """1-based position of a user in the standings"""
+        return bisect.bisect_left(self._order, self._keys[user_id]) + 1
+
+    def standings(self):
+        """Standings rows, best first (same fields as MatchupManager.get_standings)"""
+        if self._table is None:
+            table = []
+            for key in self._order:
+                user_id = key[3]
+                totals = self.totals[user_id]
+                table.append({
+                    'user_id': user_id,
+                    'name': self.users[user_id]['name'],
+                    'team_name': self.users[user_id]['team_name'],
+                    'total_points': totals['total_points'],
+                    'wins': totals['wins'],
+                    'losses': totals['losses'],
+                    'win_pct': totals['wins'] / max(totals['wins'] + totals['losses'], 1)
+                })
+            self._table = table
+        return self._table
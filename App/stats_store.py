@@ -0,0 +1,325 @@
+# App/stats_store.py
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+from App.config import STAT_COLUMNS
+from App.scoring import scoring_engine
+
+# Layout of the player rows used by load_default_matches()
+MATCH_ROW_COLUMNS = ['jersey', 'player', 'team_code', 'goals', 'assists', 'steals',
+                     'blocks', 'saves', 'position', 'team_full']
+
+CATEGORICAL_COLUMNS = ['team_code', 'position', 'team_full', 'match_id', 'match_name']
+
+
+class PlayerStatStore:
+    """
+    Columnar, typed store of player match stats
+
+    Built once at ingest and shared by every accessor:
+    - stats: int32 matrix (rows x stat_columns)
+    - team_code / position / team_full / match_id / match_name: categorical codes
+    - player_id: integer id per (player, team_code)
+    - match_rows: {match_id: slice} of contiguous rows per match
+    - points: (rows x rule sets) matrix from the ScoringEngine; fantasy_points
+      is the column view of the first rule set
+    """
+
+    def __init__(self, stat_columns=None, scoring=None):
+        self.stat_columns = list(stat_columns or STAT_COLUMNS)
+        self.scoring = scoring or scoring_engine
+        self.stats = np.zeros((0, len(self.stat_columns)), dtype=np.int32)
+        self.points = self.scoring.score(self.stats, self.stat_columns)
+        self.fantasy_points = self.scoring.rule_set_column(self.points)
+        self.jersey = np.empty(0, dtype=object)
+        self.player_id = np.empty(0, dtype=np.int32)
+        self.categoricals = {name: pd.Categorical([]) for name in CATEGORICAL_COLUMNS}
+        self.player_keys = {}  # {(player, team_code): player_id}
+        self.player_names = []  # player_id -> player name
+        self.match_rows = {}  # {match_id: slice(start, stop)}
+        self._frame = None
+        self._player_rows = {}  # {match_id or None: player_id -> row array}
+
+    def __len__(self):
+        return len(self.player_id)
+
+    @classmethod
+    def from_matches(cls, all_matches, scoring=None):
+        """Build a store from the {match_id: match_info} dict used by MatchDataManager"""
+        store = cls(scoring=scoring)
+        store.add_matches(
+            (match_id, match['name'], store.columns_from_rows(match['players']))
+            for match_id, match in all_matches.items()
+        )
+        return store
+
+    @staticmethod
+    def columns_from_rows(rows):
+        """Convert literal player rows (MATCH_ROW_COLUMNS layout) to a column dict"""
+        columns = {name: [row[i] for row in rows] for i, name in enumerate(MATCH_ROW_COLUMNS)}
+        return columns
+
+    def add_matches(self, matches, points=None):
+        """
+        Append matches to the store in one concatenation
+
+        Only the new rows are scored; rows already in the store keep their points.
+
+        Args:
+            matches: iterable of (match_id, match_name, columns) where columns is a dict
+                     with jersey, player, team_code, position, team_full and stat columns
+            points: optional points matrix (new rows x rule sets) already computed
+                    for these rows with the store's scoring engine
+        """
+        batches = []
+        match_rows = {}
+        start = len(self)
+
+        # Everything is built aside first, so a rejected batch leaves the store untouched
+        for match_id, match_name, columns in matches:
+            n_rows = len(columns['player'])
+            if match_id in self.match_rows or match_id in match_rows:
+                raise ValueError(f"Match {match_id} is already in the store")
+            match_rows[match_id] = slice(start, start + n_rows)
+            start += n_rows
+
+            batch = dict(columns)
+            batch['match_id'] = [match_id] * n_rows
+            batch['match_name'] = [match_name] * n_rows
+            batches.append(batch)
+
+        if not batches:
+            return
+
+        new_stats = np.vstack([self.stat_matrix(batch) for batch in batches])
+        if points is None:
+            points = self.scoring.score(new_stats, self.stat_columns)
+        jersey = [np.asarray(batch['jersey'], dtype=object) for batch in batches]
+        categoricals = {
+            name: pd.api.types.union_categoricals(
+                [self.categoricals[name], pd.Categorical([value for batch in batches for value in batch[name]])]
+            )
+            for name in CATEGORICAL_COLUMNS
+        }
+
+        self.match_rows.update(match_rows)
+        self.stats = np.vstack([self.stats, new_stats])
+        self.jersey = np.concatenate([self.jersey] + jersey)
+        self.categoricals.update(categoricals)
+
+        new_ids = [
+            self._player_id(player, team_code)
+            for batch in batches
+            for player, team_code in zip(batch['player'], batch['team_code'])
+        ]
+        self.player_id = np.concatenate([self.player_id, np.asarray(new_ids, dtype=np.int32)])
+
+        self.points = np.vstack([self.points, points.astype(self.points.dtype, copy=False)])
+        self.fantasy_points = self.scoring.rule_set_column(self.points)
+        self._frame = None
+        self._player_rows = {}
+
+    def rescore(self, scoring=None):
+        """Recompute points for every rule set with one matrix product"""
+        if scoring is not None:
+            self.scoring = scoring
+        self.points = self.scoring.score(self.stats, self.stat_columns)
+        self.fantasy_points = self.scoring.rule_set_column(self.points)
+        self._frame = None
+        self._player_rows = {}
+
+    def apply_deltas(self, deltas):
+        """
+        Apply live per-player stat deltas in place
+
+        Only the changed rows are rescored (points += delta @ weights). Players of
+        a match that isn't in the store yet are added as a new match; a player
+        missing from a match already in the store can't be placed in its
+        contiguous rows and is returned instead.
+
+        Args:
+            deltas: dicts from LivePoller with match_id, match_name, player,
+                    team_code, jersey, position, team_full and stats {column: change}
+
+        Returns:
+            list of the deltas that couldn't be applied
+        """
+        rows = []
+        changes = []
+        new_matches = {}
+        unplaced = []
+
+        for delta in deltas:
+            match_id = delta['match_id']
+            if match_id not in self.match_rows:
+                new_matches.setdefault(match_id, []).append(delta)
+                continue
+
+            row = self._match_row(match_id, delta['player'], delta['team_code'])
+            if row < 0:
+                unplaced.append(delta)
+                continue
+            rows.append(row)
+            changes.append([delta['stats'].get(name, 0) for name in self.stat_columns])
+
+        # New matches first: add_matches either takes all of them or raises without
+        # changing the store, so a failure can't leave the in-place changes half applied
+        if new_matches:
+            self.add_matches([
+                (match_id, match_deltas[0]['match_name'], self._delta_columns(match_deltas))
+                for match_id, match_deltas in new_matches.items()
+            ])
+
+        if rows:
+            rows = np.asarray(rows)
+            change = np.asarray(changes, dtype=np.int32)
+            np.add.at(self.stats, rows, change)
+            np.add.at(self.points, rows, self.scoring.score(change, self.stat_columns).astype(self.points.dtype))
+            self._frame = None
+            self._player_rows = {}
+        return unplaced
+
+    def _match_row(self, match_id, player, team_code):
+        """Row of a player within one match, -1 if absent"""
+        player_id = self.player_keys.get((player, team_code))
+        if player_id is None:
+            return -1
+        match_slice = self.match_rows[match_id]
+        found = np.flatnonzero(self.player_id[match_slice] == player_id)
+        return int(match_slice.start + found[0]) if len(found) else -1
+
+    def _delta_columns(self, deltas):
+        """Column batch for a new match from its first deltas (changes from zero)"""
+        columns = {name: [delta[name] for delta in deltas]
+                   for name in ['jersey', 'player', 'team_code', 'position', 'team_full']}
+        for name in self.stat_columns:
+            columns[name] = [delta['stats'].get(name, 0) for delta in deltas]
+        return columns
+
+    def stat_matrix(self, columns):
+        """Stack a batch's stat columns into an int32 matrix, missing stats as 0"""
+        n_rows = len(columns['player'])
+        matrix = np.zeros((n_rows, len(self.stat_columns)), dtype=np.int32)
+        for j, name in enumerate(self.stat_columns):
+            if name in columns:
+                matrix[:, j] = columns[name]
+        return matrix
+
+    def _player_id(self, player, team_code):
+        """Get or assign the integer id for a (player, team_code) pair"""
+        key = (player, team_code)
+        if key not in self.player_keys:
+            self.player_keys[key] = len(self.player_names)
+            self.player_names.append(player)
+        return self.player_keys[key]
+
+    def stat(self, name):
+        """Column view of one stat"""
+        return self.stats[:, self.stat_columns.index(name)]
+
+    def decoded(self, name):
+        """Decode a categorical column to plain values"""
+        return np.asarray(self.categoricals[name], dtype=object)
+
+    def sorted_rows(self, rows, keys):
+        """
+        Order row positions by the given columns, all descending
+
+        Ties keep ingest order, matching DataFrame.sort_values on the same keys.
+        """
+        rows = np.asarray(rows)
+        columns = [self.fantasy_points if key == 'fantasy_points' else self.stat(key) for key in keys]
+        # np.lexsort sorts by the last key first and is stable
+        return rows[np.lexsort([-column[rows] for column in reversed(columns)])]
+
+    def player_index(self, match_id=None):
+        """
+        Index from player_id to row position, maintained per ingest
+
+        When a player has several rows (one per match) the index points at the
+        best one by fantasy points. Players without a row map to -1.
+
+        Args:
+            match_id: restrict the index to one match's rows, or None for all rows
+        """
+        if match_id not in self._player_rows:
+            if match_id is None:
+                rows = np.arange(len(self))
+            else:
+                match_slice = self.match_rows[match_id]
+                rows = np.arange(match_slice.start, match_slice.stop)
+
+            order = self.sorted_rows(rows, ['fantasy_points', 'goals', 'assists', 'steals', 'saves'])
+            ids = self.player_id[order]
+            _, first = np.unique(ids, return_index=True)
+
+            player_rows = np.full(len(self.player_names), -1, dtype=np.int64)
+            player_rows[ids[first]] = order[first]
+            player_rows.setflags(write=False)
+            self._player_rows[match_id] = player_rows
+        return self._player_rows[match_id]
+
+    def frame(self):
+        """Full store as a DataFrame in ingest order (built once per ingest)"""
+        if self._frame is None:
+            data = {
+                'jersey': self.jersey,
+                'player': np.asarray(self.player_names, dtype=object)[self.player_id],
+                'team_code': self.decoded('team_code'),
+            }
+            for j, name in enumerate(self.stat_columns):
+                data[name] = self.stats[:, j].astype(np.int64)
+            data['position'] = self.decoded('position')
+            data['team_full'] = self.decoded('team_full')
+            data['fantasy_points'] = self.fantasy_points
+            data['match_id'] = self.decoded('match_id')
+            data['match_name'] = self.decoded('match_name')
+            data['player_id'] = self.player_id
+            self._frame = pd.DataFrame(data)
+        return self._frame
+
+    def points_frame(self):
+        """Points for every rule set, one column each, in ingest order"""
+        return pd.DataFrame(self.points, columns=self.scoring.rule_set_names)
+
+
+class PlayerPointsLookup(Mapping):
+    """
+    Read-only {(player, team_code): fantasy points} mapping over a store's player index
+
+    Keys may also be integer player ids. Drop-in replacement for the dicts built by
+    LineupManager.get_player_points_dict().
+    """
+
+    def __init__(self, store, match_id=None):
+        self.store = store
+        self.player_rows = store.player_index(match_id)
+
+    def row(self, key):
+        """Row position for a (player, team_code) key or player id, -1 if absent"""
+        if isinstance(key, tuple):
+            player_id = self.store.player_keys.get(key)
+        else:
+            player_id = key
+        if player_id is None or not 0 <= player_id < len(self.player_rows):
+            return -1
+        return int(self.player_rows[player_id])
+
+    def __getitem__(self, key):
+        row = self.row(key)
+        if row < 0:
+            raise KeyError(key)
+        return self.store.fantasy_points[row].item()
+
+    def __contains__(self, key):
+        return self.row(key) >= 0
+
+    def __iter__(self):
+        names = self.store.player_names
+        team_codes = self.store.categoricals['team_code']
+        for player_id in np.flatnonzero(self.player_rows >= 0):
+            yield names[player_id], team_codes[self.player_rows[player_id]]
+
+    def __len__(self):
+        return int(np.count_nonzero(self.player_rows >= 0))
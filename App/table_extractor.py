@@ -0,0 +1,133 @@
+# App/table_extractor.py
+import re
+
+from App.config import PLAYER_TABLE_HEADERS, GOALKEEPER_TABLE_HEADERS
+
+TABLE_HEADERS = {
+    'field': PLAYER_TABLE_HEADERS,
+    'goalkeeper': GOALKEEPER_TABLE_HEADERS,
+}
+
+
+def header_column_name(label):
+    """Column name for a header that isn't in the header map, e.g. '18C' -> 'col_18c', '%' -> 'col_pct'"""
+    slug = re.sub(r'[^0-9a-z]+', '_', label.lower().replace('%', 'pct')).strip('_')
+    return f"col_{slug or 'blank'}"
+
+
+def parse_int(text):
+    """Digits of a cell as an int, 0 for empty cells"""
+    digits = re.sub(r'[^\d]', '', text)
+    return int(digits) if digits else 0
+
+
+def parse_made_attempted(text):
+    """"3/6" -> (3, 6); a bare number counts as made and attempted"""
+    if '/' in text:
+        made, attempted = text.split('/', 1)
+        return parse_int(made), parse_int(attempted)
+    value = parse_int(text)
+    return value, value
+
+
+def parse_seconds(text):
+    """"MM:SS" playing time -> seconds, empty cells (did not play) -> 0"""
+    if ':' in text:
+        minutes, seconds = text.split(':', 1)
+        return parse_int(minutes) * 60 + parse_int(seconds)
+    return parse_int(text) * 60
+
+
+class CompiledTableExtractor:
+    """
+    One-pass row extractor compiled from a stats table's header row
+
+    The header labels are mapped to columns once (see PLAYER_TABLE_HEADERS /
+    GOALKEEPER_TABLE_HEADERS), so each row is read by position with no lookups,
+    and only the cells of wanted columns are ever turned into text. Reordered or
+    added columns on the LEN pages keep working; headers that aren't mapped are
+    kept as text columns named col_<header>.
+    """
+
+    def __init__(self, header, role='field', columns=None):
+        """
+        Args:
+            header: header cell texts of the table, e.g. ['N.', 'PLAYER', 'MIN', 'TOTAL', ...]
+            role: 'field' or 'goalkeeper', selects the header map
+            columns: only extract these output columns (None for all)
+        """
+        header_map = TABLE_HEADERS[role]
+        self.header = [label.strip().upper() for label in header]
+        self.role = role
+        self.fields = []  # (cell index, output names, kind)
+
+        for index, label in enumerate(self.header):
+            names, kind = header_map.get(label, (header_column_name(label), 'text'))
+            names = names if isinstance(names, tuple) else (names,)
+            if columns is not None and not any(name in columns for name in names):
+                continue
+            self.fields.append((index, names, kind))
+
+        self.columns = [name for _, names, _ in self.fields for name in names]
+        self.jersey_index = self.header.index('N.') if 'N.' in self.header else None
+        self.min_cells = max([index for index, _, _ in self.fields] + [self.jersey_index or 0]) + 1
+
+    def extract(self, backend, table, rows=None):
+        """
+        Extract every player row of a table in one pass
+
+        Rows without a jersey number (header, team totals) are skipped.
+
+        Returns:
+            dict of column -> list of values
+        """
+        if rows is None:
+            rows = backend.rows(table)[1:]
+        text = backend.text
+        fields = self.fields
+        jersey_index = self.jersey_index
+        min_cells = self.min_cells
+
+        out = {name: [] for name in self.columns}
+        appenders = [(index, kind, [out[name].append for name in names]) for index, names, kind in fields]
+
+        for cells in rows:
+            if len(cells) < min_cells:
+                continue
+            if jersey_index is not None and not text(cells[jersey_index]).isdigit():
+                continue
+
+            for index, kind, append in appenders:
+                value = text(cells[index])
+                if kind == 'int':
+                    append[0](parse_int(value))
+                elif kind == 'made_attempted':
+                    made, attempted = parse_made_attempted(value)
+                    append[0](made)
+                    append[1](attempted)
+                elif kind == 'minutes':
+                    append[0](parse_seconds(value))
+                else:
+                    append[0](value)
+        return out
+
+
+# Extractors compiled so far, one per (header, role, columns) layout
+_extractors = {}
+
+
+def compile_extractor(header, role='field', columns=None):
+    """Extractor for a header row, compiled once per table layout"""
+    key = (tuple(header), role, tuple(columns) if columns is not None else None)
+    if key not in _extractors:
+        _extractors[key] = CompiledTableExtractor(header, role, columns)
+    return _extractors[key]
+
+
+def extract_table(backend, table, role='field', columns=None):
+    """Extract a stats table using its own header row, returns column -> values ({} for an empty table)"""
+    rows = backend.rows(table)
+    if not rows:
+        return {}
+    extractor = compile_extractor([backend.text(cell) for cell in rows[0]], role, columns)
+    return extractor.extract(backend, table, rows[1:])
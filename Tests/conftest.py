@@ -0,0 +1,20 @@
+# Tests/conftest.py
+import numpy as np
+import pytest
+
+
+def make_random_lineups(pool, n_users, seed=0):
+    """{user_id: lineup} of nine distinct random pool players per user"""
+    rng = np.random.default_rng(seed)
+    players = pool[['player', 'team_code', 'position']].to_dict('records')
+    return {
+        f"user_{i}": {'players': [players[j] for j in rng.choice(len(players), 9, replace=False)],
+                      'set_time': ''}
+        for i in range(n_users)
+    }
+
+
+@pytest.fixture
+def random_lineups():
+    """Shared lineup factory: random_lineups(pool, n_users, seed=0)"""
+    return make_random_lineups
@@ -0,0 +1,113 @@
+# Tests/test_archive.py
+import os
+
+import pytest
+
+from App.match_storage import MatchStatStorage
+from App.page_archive import PageArchive, archive_key, match_id_for, reparse_archive
+from App.scraper import LENScraper
+from Tests.test_fetching import MatchPageServer
+from Tests.test_parsing import MATCH_URL, read_stats_page
+
+
+def object_files(archive):
+    found = []
+    for dirpath, _, filenames in os.walk(os.path.join(archive.root, 'objects')):
+        found.extend(os.path.join(dirpath, name) for name in filenames)
+    return found
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'zstd'])
+def test_archive_round_trip_compressed(tmp_path, compression):
+    if compression == 'zstd':
+        pytest.importorskip('zstandard')
+    archive = PageArchive(str(tmp_path), compression=compression)
+    content = read_stats_page()
+
+    entry = archive.store(MATCH_URL, content)
+
+    assert entry['compression'] == compression
+    assert entry['stored_size'] < entry['size']
+    assert archive.read(MATCH_URL) == content
+    assert entry['params'] == {'c': 'ASM', 'g': '1', 't': 'A01', 's1': 'NBG', 's2': 'JAD', 'sch': '02122025'}
+
+
+def test_archive_deduplicates_by_content(tmp_path):
+    archive = PageArchive(str(tmp_path), compression='gzip')
+    content = read_stats_page()
+    other_url = MATCH_URL.replace('g=1', 'g=2')
+
+    archive.store(MATCH_URL, content)
+    archive.store(MATCH_URL, content)  # unchanged refetch
+    archive.store(other_url, content)  # same body under another key
+    assert len(archive) == 2
+    assert len(object_files(archive)) == 1
+    with open(archive.index_path) as f:
+        assert len(f.readlines()) == 2
+
+    archive.store(MATCH_URL, content + b'<!-- updated -->')
+    assert len(object_files(archive)) == 2
+
+    # A fresh instance reads the index back, the latest entry per key wins
+    reopened = PageArchive(str(tmp_path))
+    assert reopened.read(MATCH_URL).endswith(b'<!-- updated -->')
+    assert reopened.read(other_url) == content
+    assert [entry['url'] for entry in reopened.find(s1='NBG', g='2')] == [other_url]
+
+
+def test_reparse_archive_rebuilds_storage_offline(tmp_path):
+    archive = PageArchive(str(tmp_path / 'pages'), compression='gzip')
+    archive.store(MATCH_URL, read_stats_page(), week=3)
+    storage = MatchStatStorage(str(tmp_path / 'stats'))
+
+    written = reparse_archive(archive, storage, season='2526')
+
+    assert written == [(3, 'nbg_jad_g1_02122025')]
+    info, columns = storage.read_match('2526', 3, match_id_for(MATCH_URL))
+    assert info['score'] == '15-10'
+    assert info['date'] == '2025-12-02'
+    assert info['teams'] == ['VK NOVI BEOGRAD', 'VK JADRAN SPLIT']
+    assert int(columns['saves'].sum()) == 15
+    assert int(columns['shots'].sum()) >= 25
+
+
+def test_reparse_keeps_repeat_fixtures_and_skips_unknown_weeks(tmp_path):
+    archive = PageArchive(str(tmp_path / 'pages'), compression='gzip')
+    rematch = MATCH_URL.replace('g=1', 'g=9').replace('sch=02122025', 'sch=10022026')
+    unassigned = MATCH_URL.replace('s1=NBG&s2=JAD', 's1=FTC&s2=BRE')
+    archive.store(MATCH_URL, read_stats_page(), week=3)
+    archive.store(rematch, read_stats_page(), week=8)
+    archive.store(unassigned, read_stats_page())
+    storage = MatchStatStorage(str(tmp_path / 'stats'))
+
+    written = reparse_archive(archive, storage, season='2526')
+
+    assert sorted(written) == [(3, match_id_for(MATCH_URL)), (8, match_id_for(rematch))]
+    assert match_id_for(MATCH_URL) != match_id_for(rematch)
+    assert storage.weeks('2526') == [3, 8]
+
+
+def test_reparse_skips_pages_whose_match_ids_collide(tmp_path):
+    archive = PageArchive(str(tmp_path / 'pages'), compression='gzip')
+    other_group = MATCH_URL.replace('t=A01', 't=B01')
+    archive.store(MATCH_URL, read_stats_page(), week=3)
+    archive.store(other_group, read_stats_page(), week=4)
+    rematch = MATCH_URL.replace('g=1', 'g=9')
+    archive.store(rematch, read_stats_page(), week=5)
+    storage = MatchStatStorage(str(tmp_path / 'stats'))
+
+    # Same clubs, game and date in two groups: neither is written under the shared id
+    assert reparse_archive(archive, storage, season='2526') == [(5, match_id_for(rematch))]
+    assert storage.weeks('2526') == [5]
+
+
+def test_scraper_archives_fetched_match_pages(tmp_path):
+    archive = PageArchive(str(tmp_path), compression='gzip')
+    with MatchPageServer() as server:
+        scraper = LENScraper(base_url=server.base_url, archive=archive)
+        urls = [server.match_url(game) for game in range(1, 4)]
+        list(scraper.fetch_match_pages(urls))
+
+    assert sorted(archive.entries()) == sorted(archive_key(url) for url in urls)
+    assert len(object_files(archive)) == 1
+    assert archive.read(urls[0]) == server.body
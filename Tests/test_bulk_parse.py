@@ -0,0 +1,81 @@
+# Tests/test_bulk_parse.py
+import gzip
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from App.bulk_parse import bulk_parse, bulk_parse_to_store, directory_jobs
+from Tests.test_fetching import MATCH_PAGE
+from Tests.test_parsing import read_stats_page
+
+TEAM_PAIRS = [('NBG', 'JAD'), ('FTC', 'BRE'), ('OLY', 'RAD'), ('PRO', 'BAR'), ('OSC', 'MAR')]
+
+
+def saved_pages(directory):
+    """Saved copies of the stats page under five match URLs, one gzipped, plus a page without stats"""
+    urls = {}
+    for game, (home, away) in enumerate(TEAM_PAIRS, start=1):
+        name = f"match_{game}.html"
+        urls[name] = (f"https://championsleague.europeanaquatics.org/match-details-2526/"
+                      f"?c=ASM&g={game}&t=A01&gr=2&s1={home}&s2={away}&st=2&sch=02122025")
+        if game == 2:
+            name += '.gz'
+            urls[name] = urls.pop(name[:-3])
+            (directory / name).write_bytes(gzip.compress(read_stats_page()))
+        else:
+            (directory / name).write_bytes(read_stats_page())
+    shutil.copy(MATCH_PAGE, directory / 'match_page_full.html')
+    (directory / 'urls.json').write_text(json.dumps(urls))
+    return urls
+
+
+def test_directory_jobs_use_saved_urls(tmp_path):
+    saved_pages(tmp_path)
+    jobs = directory_jobs(str(tmp_path))
+
+    assert [job[0] for job in jobs] == [f"{home}_{away}_g{game}_02122025".lower()
+                                        for game, (home, away) in enumerate(TEAM_PAIRS, start=1)] + ['match_page_full']
+
+
+def test_workers_return_compact_batches(tmp_path):
+    saved_pages(tmp_path)
+    results = list(bulk_parse(directory_jobs(str(tmp_path)), max_workers=2))
+
+    match_id, info, columns = results[1]
+    assert match_id == 'ftc_bre_g2_02122025'
+    assert info['score'] == '15-10' and info['teams'] == ['VK NOVI BEOGRAD', 'VK JADRAN SPLIT']
+    assert columns['goals'].dtype == np.int32
+    assert set(columns['team_code']) == {'FTC', 'BRE'}
+    assert not any(name.startswith('col_') for name in columns)
+
+    # The page without stats tables comes back empty
+    assert results[-1] == ('match_page_full', None, None)
+
+
+def test_parallel_parse_matches_serial(tmp_path):
+    saved_pages(tmp_path)
+    jobs = directory_jobs(str(tmp_path))
+
+    serial, serial_infos = bulk_parse_to_store(jobs, max_workers=1)
+    parallel, parallel_infos = bulk_parse_to_store(jobs, max_workers=3)
+
+    assert list(parallel.match_rows) == [job[0] for job in jobs[:-1]]
+    assert parallel_infos == serial_infos
+    pd.testing.assert_frame_equal(parallel.frame(), serial.frame())
+    assert parallel.frame().groupby('match_id')['goals'].sum().tolist() == [25] * 5
+
+
+def test_workers_parse_without_dataframes(tmp_path, monkeypatch):
+    from App.scraper import LENScraper
+
+    def no_frames(*args, **kwargs):
+        raise AssertionError("workers should parse straight to columns")
+
+    monkeypatch.setattr(LENScraper, 'parse_match_html', no_frames)
+    saved_pages(tmp_path)
+    results = list(bulk_parse(directory_jobs(str(tmp_path)), max_workers=1))
+
+    assert [info['score'] for _, info, _ in results[:-1]] == ['15-10'] * 5
+    assert len(results[0][2]['player']) == 27 and results[0][2]['goals'].dtype == np.int32
@@ -0,0 +1,139 @@
+# Tests/test_data_manager.py
+import numpy as np
+import pytest
+
+from App.config import SCORING_RULES
+from App.data_manager import MatchDataManager
+from App.match_storage import MatchStatStorage
+from App.scoring import ScoringEngine
+
+
+def test_all_players_sorted_by_points():
+    manager = MatchDataManager()
+    df = manager.get_all_players_dataframe()
+
+    assert len(df) == len(manager.store)
+    assert df['fantasy_points'].is_monotonic_decreasing
+    assert list(df.index) == list(range(len(df)))
+
+
+def test_accessors_reuse_store_views():
+    manager = MatchDataManager()
+
+    assert manager.get_all_players_dataframe() is manager.get_player_pool()
+    assert manager.get_match_dataframe('nbg_jad') is manager.get_match_dataframe('nbg_jad')
+
+
+def test_match_dataframe_matches_store_rows():
+    manager = MatchDataManager()
+    df = manager.get_match_dataframe('ftc_bre')
+    rows = manager.store.match_rows['ftc_bre']
+
+    assert len(df) == rows.stop - rows.start
+    assert set(df['team_code']) == {'FTC', 'BRE'}
+    manhercz = df[df['player'] == 'MANHERCZ Krisztian Peter'].iloc[0]
+    assert manhercz['fantasy_points'] == 3 * 5 + 2 * 3 + 1 * 2 + 1 * 2
+
+
+def test_store_assigns_player_ids_per_team():
+    manager = MatchDataManager()
+    store = manager.store
+
+    cuk = store.player_keys[('CUK Milos (C)', 'NBG')]
+    assert store.player_names[cuk] == 'CUK Milos (C)'
+    assert np.count_nonzero(store.player_id == cuk) == 1
+    assert store.stats.dtype == np.int32
+
+
+def test_scoring_engine_uses_scoring_rules():
+    engine = ScoringEngine()
+    weights = engine.weight_matrix(['goals', 'saves', 'exclusions_drawn'])
+
+    assert weights[:, 0].tolist() == [SCORING_RULES['Goal'], SCORING_RULES['Save'],
+                                      SCORING_RULES['Exclusion Drawn']]
+
+
+def test_scoring_engine_scores_rule_sets_in_one_pass():
+    engine = ScoringEngine({
+        'standard': {'Goal': 5, 'Assist': 3},
+        'keepers': {'Save': 1, 'Block': 0.5},
+    })
+    stats = np.array([[2, 1, 0, 0], [0, 0, 10, 2]], dtype=np.int32)
+    points = engine.score(stats, ['goals', 'assists', 'saves', 'blocks'])
+
+    assert points.tolist() == [[13, 0], [0, 11]]
+    assert engine.rule_set_column(points, 'keepers').base is points
+
+
+def test_points_lookup_shares_player_index():
+    manager = MatchDataManager()
+    lookup = manager.get_points_lookup()
+    player_id = manager.store.player_keys[('IRVING Maxwell Bruce', 'REC')]
+
+    assert lookup[('IRVING Maxwell Bruce', 'REC')] == 41
+    assert lookup[player_id] == 41
+    assert lookup.get(('IRVING Maxwell Bruce', 'NBG'), 0) == 0
+    assert manager.get_points_lookup('all') is lookup
+    assert ('IRVING Maxwell Bruce', 'REC') not in manager.get_points_lookup('nbg_jad')
+
+
+def test_weekly_totals_use_index():
+    manager = MatchDataManager()
+    total, details = manager.calculate_weekly_totals([
+        ('CUK Milos (C)', 'NBG'),
+        ('IRVING Maxwell Bruce', 'REC'),
+        ('UNKNOWN Player', 'NBG'),
+    ])
+
+    assert total == 61
+    assert [d['match'] for d in details] == ['Novi Beograd vs Jadran', 'Jadran HN vs Pro Recco']
+
+
+def test_storage_loads_only_requested_weeks(tmp_path):
+    storage = MatchStatStorage(str(tmp_path))
+    defaults = MatchDataManager(storage=storage)
+    storage.import_matches(defaults.all_matches, week=1)
+    storage.import_matches({'nbg_jad_w2': defaults.all_matches['nbg_jad']}, week=2)
+
+    manager = MatchDataManager(storage=storage)
+    assert storage.weeks() == [1, 2]
+    assert manager.loaded_weeks == [2]
+    assert manager.get_match_ids() == ['nbg_jad_w2']
+
+    assert manager.load_weeks([1])
+    assert len(manager.store) == len(defaults.store)
+    assert manager.get_points_lookup()[('CUK Milos (C)', 'NBG')] == 20
+    assert not manager.load_weeks([7])
+    assert manager.loaded_weeks == [1]
+
+
+def test_storage_reads_stats_memory_mapped(tmp_path):
+    storage = MatchStatStorage(str(tmp_path))
+    defaults = MatchDataManager(storage=storage)
+    storage.import_matches(defaults.all_matches)
+
+    info, columns = storage.read_match('2526', 1, 'ftc_bre')
+    assert info['teams'] == ['FTC Telekom', 'Brescia']
+    assert columns['goals'].dtype == np.int32
+    assert not columns['goals'].flags['OWNDATA']
+
+
+def test_rejected_batches_leave_store_unchanged():
+    manager = MatchDataManager()
+    store = manager.store
+    before = (len(store), dict(store.match_rows), store.stats.copy(), store.points.copy())
+    columns = store.columns_from_rows(manager.all_matches['nbg_jad']['players'])
+
+    with pytest.raises(ValueError):
+        store.add_matches([('new_match', 'New', columns), ('nbg_jad', 'Again', columns)])
+
+    # A live batch whose new match can't be built doesn't apply its other changes either
+    cuk = {'match_id': 'nbg_jad', 'match_name': '', 'player': 'CUK Milos (C)', 'team_code': 'NBG',
+           'stats': {'goals': 1}}
+    broken = {'match_id': 'other', 'match_name': '', 'player': 'X', 'team_code': 'NBG', 'stats': {'goals': 1}}
+    with pytest.raises(KeyError):
+        store.apply_deltas([cuk, broken])
+
+    assert len(store) == before[0] and store.match_rows == before[1]
+    assert np.array_equal(store.stats, before[2]) and np.array_equal(store.points, before[3])
+    assert len(store.frame()) == before[0]
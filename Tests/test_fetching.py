@@ -0,0 +1,276 @@
+# Tests/test_fetching.py
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from App.config import SCRAPER_SETTINGS, WEEK_ROUNDS
+from App.http_cache import HTTPCache
+from App.match_storage import MatchStatStorage
+from App.scrape_manifest import ScrapeManifest
+from App.scraper import LENScraper
+from Tests.test_parsing import read_stats_page
+
+MATCH_PAGE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'App', 'match_page_full.html')
+
+
+class MatchPageServer:
+    """
+    Local stand-in for the LEN site serving match_page_full.html for every path
+
+    pages: optional {path prefix: body} served instead for matching paths
+    """
+
+    def __init__(self, delay=0.0, etag='"v1"', pages=None):
+        with open(MATCH_PAGE, 'rb') as f:
+            self.body = f.read()
+        self.pages = pages or {}
+        self.delay = delay
+        self.etag = etag
+        self.requests = []
+        self.not_modified = 0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append(self.path)
+                    server.active += 1
+                    server.peak = max(server.peak, server.active)
+                try:
+                    time.sleep(server.delay)
+                    if server.etag and self.headers.get('If-None-Match') == server.etag:
+                        with server.lock:
+                            server.not_modified += 1
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    body = next((page for prefix, page in server.pages.items() if self.path.startswith(prefix)),
+                                server.body)
+                    self.send_response(200)
+                    if server.etag:
+                        self.send_header('ETag', server.etag)
+                    self.send_header('Content-Type', 'text/html; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server.lock:
+                        server.active -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def match_url(self, game, status=2, home='NBG', away='JSP', round_number=2):
+        return (f"{self.base_url}/match-details-2526/?c=ASM&g={game}&t=A01&gr={round_number}"
+                f"&s1={home}&s2={away}&st={status}&sch=02122025")
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def slow_server():
+    with MatchPageServer(delay=0.2) as server:
+        yield server
+
+
+def test_match_pages_fetched_in_parallel(slow_server):
+    scraper = LENScraper(base_url=slow_server.base_url, max_workers=8)
+    urls = [slow_server.match_url(game) for game in range(1, 9)]
+
+    results = dict(scraper.parse_match_pages(urls))
+
+    assert set(results) == set(urls)
+    assert len(slow_server.requests) == 8
+    assert slow_server.peak > 1
+
+
+def test_concurrency_cap_is_respected(slow_server):
+    scraper = LENScraper(base_url=slow_server.base_url, max_workers=8)
+    urls = [slow_server.match_url(game) for game in range(1, 7)]
+
+    fetched = list(scraper.fetch_match_pages(urls, max_workers=2))
+
+    assert len(fetched) == 6
+    assert all(error is None for _, _, error in fetched)
+    assert slow_server.peak <= 2
+
+
+def test_fetch_timeout_reports_error():
+    with MatchPageServer(delay=1.0) as server:
+        scraper = LENScraper(base_url=server.base_url, timeout=0.2, max_retries=0)
+        (url, content, error), = scraper.fetch_match_pages([server.match_url(1)])
+
+    assert content is None
+    assert error.reason == 'timeout'
+
+
+def test_live_match_revalidated_with_conditional_get(tmp_path):
+    with MatchPageServer() as server:
+        scraper = LENScraper(base_url=server.base_url, cache=HTTPCache(str(tmp_path)))
+        url = server.match_url(1, status=1)
+
+        first = scraper.fetch_page(url)
+        second = scraper.fetch_page(url)
+
+    assert first == second == server.body
+    assert len(server.requests) == 2
+    assert server.not_modified == 1
+
+
+def test_finished_match_served_from_cache(tmp_path, monkeypatch):
+    cache = HTTPCache(str(tmp_path))
+    with MatchPageServer(pages={'/match-details': read_stats_page()}) as server:
+        scraper = LENScraper(base_url=server.base_url, cache=cache)
+        url = server.match_url(1, status=2)
+
+        first = scraper.parse_match_page(url)
+        results = dict(scraper.parse_match_pages([url, server.match_url(2, status=2)]))
+
+        assert len(first) > 0
+        assert cache.read_parsed(url).equals(first)
+        assert results[url].equals(first)
+        assert set(results) == {url, server.match_url(2, status=2)}
+        assert len(server.requests) == 2
+
+        # A new parser version ignores older parses, the stored body is parsed again
+        monkeypatch.setitem(SCRAPER_SETTINGS, 'parser_version', SCRAPER_SETTINGS['parser_version'] + 1)
+        assert cache.read_parsed(url) is None
+        assert scraper.parse_match_page(url).equals(first)
+        assert cache.read_parsed(url) is not None
+    assert len(server.requests) == 2
+
+
+def test_empty_parse_not_cached(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    with MatchPageServer() as server:
+        scraper = LENScraper(base_url=server.base_url, cache=cache)
+        url = server.match_url(1, status=2)
+
+        # match_page_full.html has no stat tables
+        assert scraper.parse_match_page(url).empty
+        assert cache.is_final(url)
+        assert cache.read_parsed(url) is None
+
+
+def results_page(urls):
+    links = ''.join(f'<a href="{url}">match</a>' for url in urls)
+    return f"<html><body>{links}</body></html>".encode()
+
+
+def match_requests(server):
+    return [path for path in server.requests if path.startswith('/match-details')]
+
+
+def test_refresh_fetches_only_new_and_live_matches(tmp_path):
+    with MatchPageServer(etag=None) as server:
+        stats_page = read_stats_page()
+        final_url = server.match_url(1, status=2, home='NBG', away='JAD')
+        live_url = server.match_url(2, status=1, home='FTC', away='BRE')
+        server.pages = {'/match-results': results_page([final_url, live_url]), '/match-details': stats_page}
+        scraper = LENScraper(base_url=server.base_url)
+        manifest = ScrapeManifest(str(tmp_path / 'manifest.json'))
+
+        first = scraper.refresh_week(1, manifest)
+        assert set(first) == {final_url, live_url}
+        assert len(match_requests(server)) == 2
+
+        # Unchanged live page: fetched again but not re-parsed, final match not fetched
+        assert scraper.refresh_week(1, manifest) == {}
+        assert len(match_requests(server)) == 3
+
+        server.pages['/match-details'] = stats_page + b'<!-- goal -->'
+        assert list(scraper.refresh_week(1, manifest)) == [live_url]
+
+        # The live match finishes: the manifest persists and the week is complete
+        final_live_url = live_url.replace('st=1', 'st=2')
+        server.pages['/match-results'] = results_page([final_url, final_live_url])
+        scraper.refresh_week(1, manifest)
+        reloaded = ScrapeManifest(str(tmp_path / 'manifest.json'))
+        assert reloaded.week_final(1)
+
+        requests_before = len(server.requests)
+        assert scraper.refresh_week(1, reloaded) == {}
+        assert len(server.requests) == requests_before
+
+
+def test_data_manager_refresh_stores_changed_matches(tmp_path):
+    from App.data_manager import MatchDataManager
+
+    with MatchPageServer(etag=None) as server:
+        stats_page = read_stats_page()
+        url = server.match_url(1, status=1, home='NBG', away='JAD')
+        server.pages = {'/match-results': results_page([url]), '/match-details': stats_page}
+
+        manager = MatchDataManager(storage=MatchStatStorage(str(tmp_path / 'stats')))
+        scraper = LENScraper(base_url=server.base_url)
+        manifest = ScrapeManifest(str(tmp_path / 'manifest.json'))
+
+        assert manager.refresh_week(1, scraper, manifest) == ['nbg_jad_g1_02122025']
+        assert manager.loaded_weeks == [1]
+        assert manager.get_match_info('nbg_jad_g1_02122025')['score'] == '15-10'
+        assert manager.refresh_week(1, scraper, manifest) == []
+
+
+def test_refresh_keeps_only_the_weeks_rounds(tmp_path, monkeypatch):
+    from App.data_manager import MatchDataManager
+
+    # App numbering: round 2 (the sample NBG - JSP round) is week 1, round 3 week 2
+    monkeypatch.setitem(WEEK_ROUNDS, 2, ['3'])
+    with MatchPageServer(etag=None) as server:
+        round_1 = server.match_url(1, home='NBG', away='JAD', round_number=1)
+        week_1 = [server.match_url(game, home='FTC', away='BRE', round_number=2) for game in (2, 3)]
+        week_2 = [server.match_url(4, home='OLY', away='RAD', round_number=3)]
+        server.pages = {'/match-results': results_page([round_1] + week_1 + week_2),
+                        '/match-details': read_stats_page()}
+        storage = MatchStatStorage(str(tmp_path / 'stats'))
+        manager = MatchDataManager(storage=storage)
+        scraper = LENScraper(base_url=server.base_url)
+        manifest = ScrapeManifest(str(tmp_path / 'manifest.json'))
+
+        assert [match['match_url'] for match in scraper.get_weekly_matches(1)] == week_1
+        assert len(scraper.get_weekly_matches()) == 4
+        assert scraper.get_weekly_matches(3) == []  # no rounds configured
+        updated_1 = manager.refresh_week(1, scraper, manifest)
+        updated_2 = manager.refresh_week(2, scraper, manifest)
+
+    assert sorted(updated_1) == sorted(manifest.get(url)['match_id'] for url in week_1)
+    assert updated_2 == [manifest.get(week_2[0])['match_id']]
+    assert manifest.get(round_1) is None
+    assert storage.weeks('2526') == [1, 2]
+    assert sorted(storage.match_ids('2526', 1)) == sorted(updated_1)
+
+
+def test_unparsed_final_match_is_fetched_again(tmp_path):
+    with MatchPageServer(etag=None) as server:
+        url = server.match_url(1, status=2, home='NBG', away='JAD')
+        # match_page_full.html (no stat tables) for the match page
+        server.pages = {'/match-results': results_page([url])}
+        cache = HTTPCache(str(tmp_path / 'cache'))
+        scraper = LENScraper(base_url=server.base_url, cache=cache)
+        manifest = ScrapeManifest(str(tmp_path / 'manifest.json'))
+
+        assert scraper.refresh_week(1, manifest) == {}
+        assert not manifest.get(url)['final'] and not manifest.week_final(1)
+        assert not cache.is_final(url)
+
+        server.pages['/match-details'] = read_stats_page()
+        assert list(scraper.refresh_week(1, manifest)) == [url]
+        assert manifest.get(url)['final'] and manifest.week_final(1)
+    assert len(match_requests(server)) == 2
@@ -0,0 +1,146 @@
+# Tests/test_lineup_solver.py
+import itertools
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from App.config import POSITION_FLEXIBILITY
+from App.data_manager import data_manager
+from App.lineup_manager import lineup_manager
+from App.lineup_solver import LineupSolver
+
+
+def random_pool(seed, n_field=8):
+    rng = np.random.default_rng(seed)
+    positions = ['goalkeeper'] * 3 + ['center'] * 2 + ['field'] * n_field
+    return pd.DataFrame({
+        'player': [f"p{i}" for i in range(len(positions))],
+        'team_code': rng.choice(['AAA', 'BBB', 'CCC'], len(positions)),
+        'position': positions,
+        'points': rng.integers(0, 20, len(positions)).astype(float),
+    })
+
+
+def brute_force(pool, club_cap=None, locked=()):
+    """Best starter points over every valid roster holding the locked rows, None when there is none"""
+    positions = pool['position'].tolist()
+    clubs = pool['team_code'].tolist()
+    points = pool['points'].tolist()
+    by_position = {p: [i for i, q in enumerate(positions) if q == p] for p in ('goalkeeper', 'center', 'field')}
+    best = None
+    for gk, center, fields in itertools.product(itertools.combinations(by_position['goalkeeper'], 1),
+                                                itertools.combinations(by_position['center'], 1),
+                                                itertools.combinations(by_position['field'], 5)):
+        starters = gk + center + fields
+        rest = [i for i in range(len(pool)) if i not in starters]
+        for bench in itertools.combinations(rest, 2):
+            roster = starters + bench
+            if not set(locked) <= set(roster):
+                continue
+            counts = Counter(positions[i] for i in roster)
+            if any(counts[p] > n for p, n in POSITION_FLEXIBILITY['max_per_position'].items()):
+                continue
+            if club_cap and max(Counter(clubs[i] for i in roster).values()) > club_cap:
+                continue
+            total = sum(points[i] for i in starters)
+            best = total if best is None else max(best, total)
+    return best
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('club_cap', [None, 3, 4])
+def test_matches_brute_force(seed, club_cap):
+    pool = random_pool(seed)
+    result = LineupSolver().solve(pool, 'points', club_cap=club_cap)
+    expected = brute_force(pool, club_cap)
+
+    if expected is None:
+        assert result is None
+    else:
+        assert result['points'] == expected
+        if club_cap:
+            assert max(Counter(p['team_code'] for p in result['roster']).values()) <= club_cap
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('club_cap', [None, 3, 9])
+def test_locked_players_match_brute_force(seed, club_cap):
+    pool = random_pool(seed)
+    # The weakest field player and goalkeeper: locks keep them on the roster, not in the lineup
+    field = pool[pool['position'] == 'field']['points'].idxmin()
+    goalkeeper = pool[pool['position'] == 'goalkeeper']['points'].idxmin()
+    pool.loc[field, 'points'] = 0.0
+    for rows in ([field], [field, goalkeeper]):
+        keys = list(zip(pool['player'][rows], pool['team_code'][rows]))
+        result = LineupSolver().solve(pool, 'points', club_cap=club_cap, locked=keys)
+        expected = brute_force(pool, club_cap, locked=rows)
+
+        if expected is None:
+            assert result is None
+        else:
+            assert result['points'] == expected
+            assert set(keys) <= {(p['player'], p['team_code']) for p in result['roster']}
+
+
+@pytest.mark.parametrize('club_cap', [None, 2])
+def test_real_pool_gives_valid_roster(club_cap):
+    pool = data_manager.get_player_pool()
+    result = lineup_manager.optimal_roster(pool, club_cap=club_cap)
+
+    assert lineup_manager.validate_roster(result['roster'])[0]
+    if club_cap:
+        assert max(Counter(p['team_code'] for p in result['roster']).values()) <= club_cap
+
+    # Every starter beats every unpicked player of the same position (no cap)
+    if club_cap is None:
+        picked = {(p['player'], p['team_code']) for p in result['roster']}
+        for starter in result['starters']:
+            others = pool[(pool['position'] == starter['position'])
+                          & np.array([key not in picked for key in zip(pool['player'], pool['team_code'])])]
+            assert (others['fantasy_points'] <= starter['fantasy_points']).all()
+
+
+def test_locked_and_excluded_players():
+    pool = data_manager.get_player_pool()
+    best = lineup_manager.optimal_roster(pool)
+    worst_gk = pool[pool['position'] == 'goalkeeper'].nsmallest(1, 'fantasy_points').iloc[0]
+    top = best['starters'][1]
+
+    locked = [(worst_gk['player'], worst_gk['team_code'])]
+    excluded = [(top['player'], top['team_code'])]
+    result = lineup_manager.optimal_roster(pool, locked=locked, excluded=excluded)
+
+    keys = {(p['player'], p['team_code']) for p in result['roster']}
+    assert locked[0] in keys and excluded[0] not in keys
+    assert result['points'] < best['points']
+
+    # Locked alone, the weak goalkeeper sits on the (unscored) bench and costs nothing
+    result = lineup_manager.optimal_roster(pool, locked=locked)
+    assert locked[0] in {(p['player'], p['team_code']) for p in result['bench']}
+    assert result['points'] == best['points']
+
+    # Three locked goalkeepers can't fit the two allowed
+    goalkeepers = pool[pool['position'] == 'goalkeeper'].head(3)
+    assert lineup_manager.optimal_roster(pool, locked=list(zip(goalkeepers['player'], goalkeepers['team_code']))) is None
+
+
+def test_batch_matches_single_solves():
+    pool = data_manager.get_player_pool().drop_duplicates(['player', 'team_code']).reset_index(drop=True)
+    solver = LineupSolver()
+    position_codes = pool['position'].map({p: i for i, p in enumerate(solver.positions)}).to_numpy()
+    rng = np.random.default_rng(0)
+    projections = rng.gamma(2.0, 3.0, size=(5000, len(pool)))
+
+    starters, bench, points = solver.solve_batch(position_codes, projections)
+
+    assert starters.shape == (5000, 7) and bench.shape == (5000, 2)
+    for team in (0, 1234, 4999):
+        single = solver.solve(pool.assign(projection=projections[team]), 'projection')
+        assert points[team] == pytest.approx(single['points'])
+        assert set(pool['player'].iloc[starters[team]]) == {p['player'] for p in single['starters']}
+
+    # A pool without goalkeepers can't fill the lineup
+    short = position_codes != solver.positions.index('goalkeeper')
+    assert solver.solve_batch(position_codes[short], projections[:, short]) is None
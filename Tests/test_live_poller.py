@@ -0,0 +1,121 @@
+# Tests/test_live_poller.py
+import time
+
+from App.config import SCORING_RULES
+from App.data_manager import MatchDataManager
+from App.live_poller import LivePoller
+from App.match_storage import MatchStatStorage
+from App.scraper import LENScraper
+from Tests.test_fetching import MatchPageServer
+from Tests.test_parsing import read_stats_page
+
+CUK_GOALS = b'<td>CUK Milos (C)</td><td>21:26</td><td>4/4</td>'
+CUK_SCORES_AGAIN = b'<td>CUK Milos (C)</td><td>21:26</td><td>5/5</td>'
+
+
+def live_server():
+    server = MatchPageServer(etag=None, pages={'/match-details': read_stats_page()})
+    return server
+
+
+def test_poller_emits_only_changes():
+    with live_server() as server:
+        poller = LivePoller(LENScraper(base_url=server.base_url))
+        url = server.match_url(1, status=1, home='PRO', away='BAR')
+
+        first = poller.poll_once([url])
+        assert len(first) == 27  # every player is new on the first poll
+        cuk = next(delta for delta in first if delta['player'] == 'CUK Milos (C)')
+        assert cuk['stats']['goals'] == 4 and cuk['team_code'] == 'PRO'
+        assert cuk['match_id'] == 'pro_bar_g1_02122025'
+
+        assert poller.poll_once([url]) == []
+
+        server.pages['/match-details'] = read_stats_page().replace(CUK_GOALS, CUK_SCORES_AGAIN)
+        delta, = poller.poll_once([url])
+        assert delta['player'] == 'CUK Milos (C)'
+        assert delta['stats'] == {'goals': 1, 'shots': 1}
+        assert delta['points'] == SCORING_RULES['Goal']
+
+
+def without_cuk(page):
+    """Stats page with CUK's row taken out, like a corrected box score"""
+    start = page.index(b'<tr><td>5</td><td>CUK Milos (C)</td>')
+    return page[:start] + page[page.index(b'</tr>', start) + len(b'</tr>'):]
+
+
+def test_player_dropped_from_page_gives_back_points(tmp_path):
+    manager = MatchDataManager(storage=MatchStatStorage(str(tmp_path)))
+    with live_server() as server:
+        poller = LivePoller(LENScraper(base_url=server.base_url))
+        url = server.match_url(1, status=1, home='PRO', away='BAR')
+        first = poller.poll_once([url])
+        manager.apply_live_deltas(first)
+        cuk = next(delta for delta in first if delta['player'] == 'CUK Milos (C)')
+
+        server.pages['/match-details'] = without_cuk(read_stats_page())
+        delta, = poller.poll_once([url])
+
+    assert (delta['player'], delta['team_code']) == ('CUK Milos (C)', 'PRO')
+    assert delta['stats'] == {name: -change for name, change in cuk['stats'].items()}
+    assert delta['points'] == -cuk['points']
+    assert manager.apply_live_deltas([delta]) == []
+    assert manager.get_points_lookup('pro_bar_g1_02122025')[('CUK Milos (C)', 'PRO')] == 0
+
+
+def test_finished_match_polled_once_more_then_dropped():
+    with live_server() as server:
+        poller = LivePoller(LENScraper(base_url=server.base_url))
+        poller.poll_once([server.match_url(1, status=1)])
+        poller.poll_once([server.match_url(1, status=2)])
+        fetched = len(server.requests)
+
+        assert poller.poll_once([server.match_url(1, status=2)]) == []
+        assert len(server.requests) == fetched
+
+
+def test_background_poller_delivers_deltas():
+    with live_server() as server:
+        poller = LivePoller(LENScraper(base_url=server.base_url), interval=0.05)
+        received = []
+        url = server.match_url(1, status=1)
+        poller.start(lambda: [url], received.extend)
+
+        deadline = time.time() + 5
+        while not received and time.time() < deadline:
+            time.sleep(0.02)
+        server.pages['/match-details'] = read_stats_page().replace(CUK_GOALS, CUK_SCORES_AGAIN)
+        while len(received) < 28 and time.time() < deadline:
+            time.sleep(0.02)
+        poller.stop(timeout=2)
+
+    assert len(received) == 28
+    assert received[-1]['stats'] == {'goals': 1, 'shots': 1}
+
+
+def test_deltas_update_store_incrementally(tmp_path):
+    manager = MatchDataManager(storage=MatchStatStorage(str(tmp_path)))
+    rows_before = len(manager.store)
+
+    with live_server() as server:
+        poller = LivePoller(LENScraper(base_url=server.base_url))
+        url = server.match_url(1, status=1, home='PRO', away='BAR')
+
+        assert manager.apply_live_deltas(poller.poll_once([url])) == []
+        assert len(manager.store) == rows_before + 27
+        assert manager.get_match_info('pro_bar_g1_02122025')['score'] == '15-10'
+        points_before = manager.get_points_lookup('pro_bar_g1_02122025')[('CUK Milos (C)', 'PRO')]
+        stats_before = manager.store.stats.copy()
+
+        server.pages['/match-details'] = read_stats_page().replace(CUK_GOALS, CUK_SCORES_AGAIN)
+        manager.apply_live_deltas(poller.poll_once([url]))
+
+    assert manager.get_match_info('pro_bar_g1_02122025')['score'] == '16-10'
+    assert manager.get_points_lookup('pro_bar_g1_02122025')[('CUK Milos (C)', 'PRO')] == points_before + SCORING_RULES['Goal']
+    assert (manager.store.stats != stats_before).sum() == 2  # goals and shots of one row
+    top = manager.get_match_dataframe('pro_bar_g1_02122025').iloc[0]
+    assert top['player'] == 'CUK Milos (C)' and top['goals'] == 5
+
+    # The store matches one rebuilt from scratch
+    manager.store.rescore()
+    assert manager.get_points_lookup('pro_bar_g1_02122025')[('CUK Milos (C)', 'PRO')] == points_before + SCORING_RULES['Goal']
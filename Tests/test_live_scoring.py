@@ -0,0 +1,117 @@
+# Tests/test_live_scoring.py
+import threading
+
+import numpy as np
+
+from App.data_manager import MatchDataManager
+from App.live_scoring import LiveScoringService
+from App.matchup_manager import MatchupManager
+from App.roster_scoring import RosterMatrix
+from App.standings import StandingsLedger
+
+WEEK = 2
+
+
+def live_leagues(random_lineups, n_leagues, n_users=6, seed=0):
+    manager = MatchDataManager()
+    pool = manager.get_player_pool()
+    service = LiveScoringService(WEEK)
+    leagues = {}
+    for league in range(n_leagues):
+        lineups = random_lineups(pool, n_users, seed=seed + league)
+        users = {user_id: {'name': user_id, 'team_name': user_id} for user_id in lineups}
+        matchups = MatchupManager()
+        matchups.add_matchups(matchups.create_round_robin_matchups(list(users), WEEK))
+        service.add_league(league, matchups, users, lineups)
+        leagues[league] = (matchups, users, lineups)
+    return manager, service, leagues
+
+
+def goal(player, team_code, points=5):
+    return {'match_id': 'm', 'player': player, 'team_code': team_code, 'stats': {'goals': 1}, 'points': points}
+
+
+def test_deltas_match_full_rescore(random_lineups):
+    manager, service, leagues = live_leagues(random_lineups, 20)
+    points = dict(manager.get_points_lookup())
+    service.seed(points)
+
+    rng = np.random.default_rng(1)
+    keys = list(points)
+    for _ in range(5):
+        batch = [goal(*keys[i], points=int(rng.integers(1, 6))) for i in rng.choice(len(keys), 8)]
+        service.apply_deltas(batch)
+        for delta in batch:
+            points[(delta['player'], delta['team_code'])] += delta['points']
+
+    for league, (matchups, users, lineups) in leagues.items():
+        expected = RosterMatrix(list(users), lineups).score(points)
+        assert matchups.scores[WEEK] == expected
+        for matchup in matchups.get_weekly_matchups(WEEK):
+            assert matchup['team1_score'] == expected[matchup['team1']]
+            assert matchup['team2_score'] == expected[matchup['team2']]
+        rebuilt = StandingsLedger.from_history(users, matchups.scores, matchups.matchups).standings()
+        assert matchups.get_standings(users, matchups.matchups) == rebuilt
+
+
+def test_goal_only_touches_rosters_owning_the_scorer(random_lineups):
+    manager, service, leagues = live_leagues(random_lineups, 50)
+    service.seed(manager.get_points_lookup())
+    published = []
+    service.subscribe(lambda week, updates: published.append(updates))
+
+    scorer = ('CUK Milos (C)', 'NBG')
+    owners = {(league, user_id) for league, (_, users, lineups) in leagues.items() for user_id in users
+              if scorer in {(p['player'], p['team_code']) for p in lineups[user_id]['players']}}
+    assert owners
+    before = {owner: service.score(*owner) for owner in owners}
+
+    updates = service.apply_deltas([goal(*scorer), goal('NOBODY', 'NBG')])
+
+    touched = {(league, user_id) for league, update in updates.items() for user_id in update['scores']}
+    assert touched == owners and published == [updates]
+    starters = {owner for owner in owners
+                if [(p['player'], p['team_code']) for p in leagues[owner[0]][2][owner[1]]['players']].index(scorer) < 7}
+    for owner in owners:
+        assert service.score(*owner) == before[owner] + (5 if owner in starters else 0)
+    assert service.apply_deltas([goal('NOBODY', 'NBG')]) == {}
+
+
+def test_new_league_seeds_only_its_rosters(random_lineups):
+    manager, service, leagues = live_leagues(random_lineups, 3)
+    points = manager.get_points_lookup()
+    service.seed(points)
+    versions = {league: matchups.score_version for league, (matchups, _, _) in leagues.items()}
+
+    matchups, users, lineups = live_leagues(random_lineups, 1, seed=9)[2][0]
+    service.add_league('late', matchups, users, lineups)
+    updates = service.seed(points, league_id='late')
+
+    assert list(updates) == ['late']
+    assert matchups.scores[WEEK] == RosterMatrix(list(users), lineups).score(points)
+    assert {league: m.score_version for league, (m, _, _) in leagues.items()} == versions
+    assert matchups.score_version == 1
+
+
+def test_subscribers_may_call_back_into_the_service(random_lineups):
+    manager, service, leagues = live_leagues(random_lineups, 20)
+    service.seed(manager.get_points_lookup())
+    versions = {league: matchups.score_version for league, (matchups, _, _) in leagues.items()}
+    scorer = ('CUK Milos (C)', 'NBG')
+    seen = []
+
+    def rescore(week, updates):
+        seen.append(updates)
+        if len(seen) == 1:
+            service.apply_deltas([goal(*scorer)])  # re-enters the service from a callback
+
+    service.subscribe(rescore)
+    worker = threading.Thread(target=service.apply_deltas, args=([goal(*scorer)],), daemon=True)
+    worker.start()
+    worker.join(timeout=5)
+
+    assert not worker.is_alive() and len(seen) == 2
+    assert seen[0] and set(seen[0]) == set(seen[1])
+    # Every publish bumps the league's score version (dropping cached playoff odds)
+    for league in seen[0]:
+        assert leagues[league][0].score_version == versions[league] + 2
@@ -0,0 +1,48 @@
+# Tests/test_matchup_index.py
+from App.matchup_manager import MatchupManager
+
+
+def scheduled(n_users, weeks):
+    manager = MatchupManager()
+    user_ids = [f"user_{i}" for i in range(n_users)]
+    for week in weeks:
+        manager.add_matchups(manager.create_round_robin_matchups(user_ids, week))
+    return manager, user_ids
+
+
+def scan(matchups, week, user_id=None):
+    found = [m for m in matchups if m['week'] == week]
+    if user_id is None:
+        return found
+    return next((m for m in found if user_id in (m['team1'], m['team2'])), None)
+
+
+def test_lookups_match_list_scan():
+    manager, user_ids = scheduled(9, range(1, 5))
+
+    for week in range(1, 6):
+        assert manager.get_weekly_matchups(week) == scan(manager.matchups, week)
+        for user_id in user_ids:
+            assert manager.get_user_matchup(user_id, week) is scan(manager.matchups, week, user_id)
+
+
+def test_remove_week_keeps_indexes_consistent():
+    manager, user_ids = scheduled(6, [1, 2, 3])
+    removed = manager.remove_week(2)
+
+    assert len(removed) == 3
+    assert [m['week'] for m in manager.matchups] == [1] * 3 + [3] * 3
+    assert manager.get_weekly_matchups(2) == []
+    assert manager.get_user_matchup('user_0', 2) is None
+    assert manager.get_user_matchup('user_0', 3)['week'] == 3
+    assert manager.remove_week(2) == []
+
+
+def test_assigned_or_appended_lists_are_reindexed():
+    source, _ = scheduled(4, [1])
+    manager = MatchupManager()
+    manager.matchups = list(source.matchups)
+    assert len(manager.get_weekly_matchups(1)) == 2
+
+    manager.matchups.append(dict(source.matchups[0], week=2))
+    assert manager.get_user_matchup('user_0', 2)['week'] == 2
@@ -0,0 +1,126 @@
+# Tests/test_parsing.py
+import os
+
+import pytest
+
+from App.data_manager import MatchDataManager
+from App.document_index import MatchDocumentIndex
+from App.html_backends import available_backends, get_backend
+from App.scraper import LENScraper
+from App.table_extractor import compile_extractor, extract_table
+
+STATS_PAGE = os.path.join(os.path.dirname(__file__), 'fixtures', 'match_stats.html')
+MATCH_URL = ("https://championsleague.europeanaquatics.org/match-details-2526/"
+             "?c=ASM&g=1&t=A01&gr=2&s1=NBG&s2=JAD&st=2&sch=02122025")
+
+
+def read_stats_page():
+    with open(STATS_PAGE, 'rb') as f:
+        return f.read()
+
+
+def expected_rows(team_code):
+    manager = MatchDataManager.__new__(MatchDataManager)
+    manager.load_default_matches()
+    return [row for row in manager.all_matches['nbg_jad']['players'] if row[2] == team_code]
+
+
+def stats_tables(backend):
+    return backend.tables(backend.parse(read_stats_page()))
+
+
+@pytest.fixture(params=available_backends())
+def backend(request):
+    return get_backend(request.param)
+
+
+def test_header_driven_extraction_matches_known_stats(backend):
+    field_table = stats_tables(backend)[0]
+    columns = extract_table(backend, field_table, 'field')
+
+    rows = expected_rows('NBG')
+    assert columns['jersey'] == [row[0] for row in rows]
+    assert columns['player'] == [row[1] for row in rows]
+    assert columns['goals'] == [row[3] for row in rows]
+    assert columns['assists'] == [row[4] for row in rows]
+    assert columns['steals'] == [row[5] for row in rows]
+    assert columns['blocks'] == [row[6] for row in rows]
+
+    # The rest of the table comes along: shots from TOTAL, playing time from MIN
+    assert all(shots >= goals for goals, shots in zip(columns['goals'], columns['shots']))
+    assert columns['seconds_played'][0] == 32 * 60
+    assert 'turnover_fouls' in columns and 'exclusions' in columns
+    # Unmapped headers are kept as text
+    assert 'col_18c' in columns and 'col_pct' in columns
+
+
+def test_goalkeeper_table_total_is_saves(backend):
+    gk_table = stats_tables(backend)[1]
+    columns = extract_table(backend, gk_table, 'goalkeeper')
+
+    assert columns['player'] == ['GLUSAC Milan', 'PAJKOVIC Petar']
+    assert columns['saves'] == [10, 0]
+    assert columns['shots_faced'] == [20, 0]
+    assert 'goals' not in columns
+
+
+def test_reordered_columns_read_by_header(backend):
+    html = (
+        "<table><tr><th>PLAYER</th><th>ST</th><th>N.</th><th>NEW</th><th>AS</th><th>TOTAL</th></tr>"
+        "<tr><td>CUK Milos</td><td>2</td><td>5</td><td>x</td><td>1</td><td>4/6</td></tr>"
+        "<tr><td>TOTAL</td><td>2</td><td></td><td></td><td>1</td><td>4/6</td></tr></table>"
+    )
+    table = backend.tables(backend.parse(html))[0]
+    columns = extract_table(backend, table)
+
+    assert columns == {
+        'player': ['CUK Milos'], 'steals': [2], 'jersey': ['5'], 'col_new': ['x'],
+        'assists': [1], 'goals': [4], 'shots': [6],
+    }
+
+
+def test_extractor_compiled_once_per_layout():
+    header = ['N.', 'PLAYER', 'TOTAL', 'AS']
+    assert compile_extractor(header) is compile_extractor(list(header))
+    assert compile_extractor(header) is not compile_extractor(header, 'goalkeeper')
+
+    limited = compile_extractor(header, columns=['jersey', 'assists'])
+    assert limited.columns == ['jersey', 'assists']
+
+
+def test_document_index_assigns_team_and_role(backend):
+    document = backend.parse(read_stats_page())
+    index = MatchDocumentIndex(backend, document, 'NBG', 'JAD')
+
+    assert index.team_names == {'home': 'VK NOVI BEOGRAD', 'away': 'VK JADRAN SPLIT'}
+    assert [(entry['team_code'], entry['role']) for entry in index.tables] == [
+        ('NBG', 'field'), ('NBG', 'goalkeeper'), ('JAD', 'field'), ('JAD', 'goalkeeper'),
+    ]
+    assert len(index.lookup('JAD', 'goalkeeper')) == 1
+    assert index.lookup('FTC') == []
+
+
+def test_document_index_without_team_headings_uses_table_order(backend):
+    table = "<table class='stats-table'><tr><th>N.</th><th>PLAYER</th></tr><tr><td>1</td><td>X</td></tr></table>"
+    html = f"<div>layout</div><table><tr><td>menu</td></tr></table>{table}<h4>GOALKEEPERS</h4>{table}{table}"
+    index = MatchDocumentIndex(backend, backend.parse(html), 'NBG', 'JAD')
+
+    assert [(entry['team_code'], entry['role']) for entry in index.tables] == [
+        ('NBG', 'field'), ('NBG', 'goalkeeper'), ('JAD', 'goalkeeper'),
+    ]
+
+
+@pytest.mark.parametrize('parser', available_backends())
+def test_parse_match_html_splits_teams(parser):
+    scraper = LENScraper(parser=parser)
+    df = scraper.parse_match_html(read_stats_page(), MATCH_URL)
+
+    totals = df.groupby('team_code')[['goals', 'saves']].sum()
+    assert totals.loc['NBG', 'goals'] == 15 and totals.loc['JAD', 'goals'] == 10
+    assert totals.loc['NBG', 'saves'] == 10 and totals.loc['JAD', 'saves'] == 5
+
+    keepers = df[df['position'] == 'goalkeeper']
+    assert sorted(keepers['player']) == ['CELAR Martin', 'GLUSAC Milan', 'PAJKOVIC Petar']
+    assert len(df) == len(expected_rows('NBG')) + len(expected_rows('JAD'))
+    assert list(df.columns[:11]) == ['jersey', 'player', 'team_code', 'goals', 'assists', 'steals',
+                                     'blocks', 'saves', 'position', 'team_full', 'match_date']
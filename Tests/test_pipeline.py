@@ -0,0 +1,71 @@
+# Tests/test_pipeline.py
+import numpy as np
+
+from App.match_storage import MatchStatStorage
+from App.page_archive import match_id_for
+from App.pipeline import run_week, stream_week
+from App.scraper import LENScraper
+from App.stats_store import PlayerStatStore
+from Tests.test_fetching import MatchPageServer, results_page
+from Tests.test_parsing import MATCH_URL, read_stats_page
+
+
+def week_server(n_matches, delay=0.0):
+    server = MatchPageServer(etag=None, delay=delay)
+    urls = [server.match_url(game, home='NBG', away=f"T{game:02d}") for game in range(n_matches)]
+    server.pages = {'/match-results': results_page(urls + urls[:1]), '/match-details': read_stats_page()}
+    return server, urls
+
+
+def test_parse_match_columns_matches_frame():
+    scraper = LENScraper()
+    columns = scraper.parse_match_columns(read_stats_page(), MATCH_URL)
+    df = scraper.parse_match_html(read_stats_page(), MATCH_URL)
+
+    assert list(columns) == list(df.columns)
+    assert {name: list(values) for name, values in df.items()} == columns
+    assert scraper.parse_match_columns(b'<html></html>', MATCH_URL) == {}
+
+
+def test_stream_week_scores_and_stores_each_match(tmp_path):
+    server, urls = week_server(3)
+    storage = MatchStatStorage(str(tmp_path))
+    store = PlayerStatStore()
+    with server:
+        scraper = LENScraper(base_url=server.base_url)
+        batches = list(stream_week(scraper, 1, store=store, storage=storage))
+
+    match_ids = sorted(match_id_for(url) for url in urls)
+    assert sorted(batch['match_id'] for batch in batches) == match_ids
+    assert sorted(storage.match_ids('2526', 1)) == match_ids
+    assert len(store) == sum(len(batch['columns']['player']) for batch in batches)
+    for batch in batches:
+        rows = store.match_rows[batch['match_id']]
+        assert np.array_equal(store.points[rows], batch['points'])
+        assert batch['match_info']['score'] == '15-10'
+    # Duplicate links on the results page are fetched once
+    assert len([path for path in server.requests if path.startswith('/match-details')]) == 3
+
+
+def test_first_batch_arrives_before_round_is_downloaded():
+    server, urls = week_server(6, delay=0.2)
+    with server:
+        scraper = LENScraper(base_url=server.base_url, max_workers=2)
+        batches = stream_week(scraper)
+        first = next(batches)
+        fetched_at_first = len([path for path in server.requests if path.startswith('/match-details')])
+        rest = list(batches)
+
+    assert first['match_id'].startswith('nbg_t')
+    # Only the pages in flight were requested when the first batch came out
+    assert fetched_at_first <= 4
+    assert len(rest) == 5
+
+
+def test_run_week_matches_batch_scoring():
+    server, urls = week_server(2)
+    with server:
+        store, infos = run_week(LENScraper(base_url=server.base_url))
+
+    assert set(infos) == {match_id_for(url) for url in urls}
+    assert np.array_equal(store.points, store.scoring.score(store.stats, store.stat_columns))
@@ -0,0 +1,84 @@
+# Tests/test_projections.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from App.data_manager import MatchDataManager
+from App.match_storage import MatchStatStorage
+from App.projections import ProjectionEngine
+
+STATS = ['goals', 'assists', 'saves']
+
+
+def synthetic_weeks(n_weeks=6, n_players=30, seed=0):
+    """Per-week column dicts; some players skip weeks, player 0 plays twice in week 2"""
+    rng = np.random.default_rng(seed)
+    positions = ['goalkeeper', 'center'] + ['field'] * (n_players - 2)
+    weeks = []
+    for week in range(1, n_weeks + 1):
+        players = [i for i in range(n_players) if rng.random() < 0.8]
+        if week == 2:
+            players.append(0)
+        weeks.append({
+            'player': [f"p{i}" for i in players],
+            'team_code': ['AAA' if i % 2 else 'BBB' for i in players],
+            'position': [positions[i] for i in players],
+            **{name: rng.integers(0, 5, len(players)) for name in STATS},
+        })
+    return weeks
+
+
+def test_matches_pandas_window_operations():
+    weeks = synthetic_weeks()
+    engine = ProjectionEngine(stat_columns=STATS, window=3, halflife=2.0)
+    for week, columns in enumerate(weeks, start=1):
+        engine.add_week(week, [columns])
+
+    history = pd.concat([pd.DataFrame(columns) for columns in weeks], ignore_index=True)
+    grouped = history.groupby(['player', 'team_code'], sort=False)[STATS]
+    rolling = grouped.rolling(3, min_periods=1).mean().groupby(level=[0, 1]).last()
+    ewma = grouped.apply(lambda g: g.ewm(halflife=2.0).mean().iloc[-1])
+
+    index = pd.MultiIndex.from_tuples(engine.players)
+    assert np.allclose(engine.rolling_mean(), rolling.loc[index].to_numpy())
+    assert np.allclose(engine.ewma(), ewma.loc[index].to_numpy())
+    assert engine.matches[engine.player_keys[('p0', 'BBB')]] == grouped.size()[('p0', 'BBB')]
+
+
+def test_projection_shrinks_toward_position_baseline():
+    engine = ProjectionEngine(stat_columns=STATS, prior_matches=2)
+    engine.add_week(1, [{'player': ['a', 'b'], 'team_code': ['X', 'X'], 'position': ['field', 'field'],
+                         'goals': [6, 0], 'assists': [0, 0], 'saves': [0, 0]}])
+
+    frame = engine.frame().set_index('player')
+    # Baseline is 3 goals; one match against two prior matches
+    assert frame.loc['a', 'goals'] == pytest.approx((6 + 2 * 3) / 3)
+    assert frame.loc['b', 'goals'] == pytest.approx((0 + 2 * 3) / 3)
+    assert frame.loc['a', 'projected_points'] == pytest.approx(5 * 4)
+    assert (frame['points_std'] > 0).all()
+
+
+def test_manager_folds_in_new_weeks_only(tmp_path):
+    storage = MatchStatStorage(str(tmp_path))
+    defaults = MatchDataManager(storage=storage)
+    storage.import_matches(defaults.all_matches, week=1)
+
+    manager = MatchDataManager(storage=storage)
+    first = manager.get_projections()
+    engine = manager.projections
+    assert engine.weeks == [1]
+    assert manager.get_projections() is first
+
+    storage.import_matches({'nbg_jad_w2': defaults.all_matches['nbg_jad']}, week=2)
+    second = manager.get_projections()
+    assert manager.projections is engine and engine.weeks == [1, 2]
+
+    # Same result as replaying the whole history
+    replay = MatchDataManager(storage=storage)
+    assert np.allclose(second['projected_points'], replay.get_projections()['projected_points'])
+    cuk = second.set_index(['player', 'team_code']).loc[('CUK Milos (C)', 'NBG')]
+    assert cuk['matches'] == 2
+
+    pool = manager.get_projection_pool()
+    assert len(pool) == len(manager.get_player_pool())
+    assert pool['projected_points'].notna().all()
@@ -0,0 +1,171 @@
+# Tests/test_request_layer.py
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from App.request_layer import CircuitBreaker, RequestFailed, RequestLayer, TokenBucket
+from App.scraper import LENScraper
+
+
+class FaultServer:
+    """
+    Local server that injects faults
+
+    faults: {path: [action, ...]} consumed one per request, where an action is a
+    status code to answer with or 'hang' (sleep past the client timeout). Paths
+    without faults left get a 200.
+    """
+
+    def __init__(self, faults=None, hang=1.0):
+        self.faults = {path: list(actions) for path, actions in (faults or {}).items()}
+        self.hang = hang
+        self.requests = []
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append(self.path)
+                    actions = server.faults.get(self.path.split('?')[0], [])
+                    action = actions.pop(0) if actions else 200
+
+                if action == 'hang':
+                    time.sleep(server.hang)
+                    action = 200
+                body = b'<html>ok</html>'
+                self.send_response(action)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def request_layer(**options):
+    settings = dict(timeout=0.3, rate=1000, burst=100, max_retries=3, backoff_base=0.01, backoff_max=0.05,
+                    breaker_failures=50, breaker_reset=60)
+    settings.update(options)
+    return RequestLayer(requests.Session(), **settings)
+
+
+def test_retries_5xx_until_success():
+    with FaultServer({'/page': [503, 502, 500]}) as server:
+        layer = request_layer()
+        response = layer.get(f"{server.base_url}/page")
+
+    assert response.status_code == 200
+    assert len(server.requests) == 4
+    assert layer.failures == {}
+
+
+def test_gives_up_with_reason():
+    with FaultServer({'/page': [503] * 10, '/missing': [404]}) as server:
+        layer = request_layer(max_retries=2)
+        with pytest.raises(RequestFailed) as failed:
+            layer.get(f"{server.base_url}/page")
+        assert failed.value.reason == 'http_503'
+        assert failed.value.attempts == 3
+
+        # Client errors aren't retried
+        with pytest.raises(RequestFailed) as missing:
+            layer.get(f"{server.base_url}/missing")
+        assert missing.value.reason == 'http_404'
+        assert server.requests.count('/missing') == 1
+
+    assert layer.failures == {f"{server.base_url}/page": 'http_503', f"{server.base_url}/missing": 'http_404'}
+
+
+def test_timeouts_are_retried():
+    with FaultServer({'/slow': ['hang']}, hang=1.0) as server:
+        layer = request_layer(timeout=0.2)
+        response = layer.get(f"{server.base_url}/slow")
+
+    assert response.status_code == 200
+    assert len(server.requests) == 2
+
+
+def test_circuit_opens_and_fails_fast():
+    with FaultServer({'/page': [503] * 4}) as server:
+        layer = request_layer(max_retries=1, breaker_failures=4, breaker_reset=0.3)
+        url = f"{server.base_url}/page"
+        for _ in range(2):
+            with pytest.raises(RequestFailed):
+                layer.get(url)
+
+        with pytest.raises(RequestFailed) as rejected:
+            layer.get(f"{server.base_url}/other")
+        assert rejected.value.reason == 'circuit_open'
+        assert len(server.requests) == 4
+
+        # After the reset timeout one probe goes through and closes the circuit
+        time.sleep(0.35)
+        assert layer.get(url).status_code == 200
+        assert layer.breaker(url).state == 'closed'
+
+
+def test_half_open_failure_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+
+def test_probe_raising_unexpected_error_releases_breaker():
+    class BrokenSession:
+        def get(self, url, **kwargs):
+            raise requests.TooManyRedirects("redirect loop")
+
+    layer = RequestLayer(BrokenSession(), max_retries=0, breaker_failures=1, breaker_reset=0.05)
+    url = "http://len.test/page"
+    breaker = layer.breaker(url)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    with pytest.raises(requests.TooManyRedirects):
+        layer.get(url)
+    assert breaker.state == 'half-open' and not breaker.probing
+    assert breaker.allow()
+
+
+def test_token_bucket_paces_requests():
+    bucket = TokenBucket(rate=20, burst=2)
+    start = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+    # 2 from the burst, 4 more at 20/s
+    assert time.perf_counter() - start >= 4 / 20 * 0.9
+
+
+def test_scraper_reports_failed_pages():
+    with FaultServer({'/match-details-2526/': [503] * 10}) as server:
+        scraper = LENScraper(base_url=server.base_url, max_retries=1)
+        scraper.requests.backoff_base = 0.01
+        url = f"{server.base_url}/match-details-2526/?c=ASM&g=1&s1=NBG&s2=JSP&st=2"
+
+        (_, content, error), = scraper.fetch_match_pages([url])
+
+    assert content is None
+    assert error.reason == 'http_503'
+    assert scraper.failures == {url: 'http_503'}
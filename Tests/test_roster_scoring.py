@@ -0,0 +1,135 @@
+# Tests/test_roster_scoring.py
+import numpy as np
+import pytest
+
+from App.data_manager import MatchDataManager
+from App.matchup_manager import MatchupManager
+from App.roster_scoring import RosterMatrix
+
+
+def loop_score(lineup, points, weights):
+    return sum((weights['starter'] if slot < 7 else weights['bench'])
+               * points.get((player['player'], player['team_code']), 0)
+               for slot, player in enumerate(lineup['players']))
+
+
+def test_matches_per_user_loop_with_bench_weight(random_lineups):
+    manager = MatchDataManager()
+    points = manager.get_points_lookup()
+    lineups = random_lineups(manager.get_player_pool(), 50)
+    weights = {'starter': 1, 'bench': 0.5}
+
+    scores = RosterMatrix(list(lineups) + ['no_lineup'], lineups, weights=weights).score(points)
+
+    for user_id, lineup in lineups.items():
+        assert scores[user_id] == loop_score(lineup, points, weights)
+    assert scores['no_lineup'] == 0
+
+
+def test_matchup_scores_read_league_lineups(random_lineups):
+    manager = MatchDataManager()
+    points = manager.get_points_lookup()
+    lineups = random_lineups(manager.get_player_pool(), 2)
+    matchups = MatchupManager()
+    matchups.matchups = matchups.create_round_robin_matchups(['user_0', 'user_1'], week=3)
+
+    scores = matchups.calculate_matchup_scores(3, ['user_0', 'user_1'], lineups, points)
+
+    expected = loop_score(lineups['user_0'], points, {'starter': 1, 'bench': 0})
+    assert scores['user_0'] == expected and isinstance(scores['user_0'], int)
+    matchup = matchups.get_user_matchup('user_0', 3)
+    assert matchup['team1_score' if matchup['team1'] == 'user_0' else 'team2_score'] == expected
+    assert matchup['completed']
+
+    # Lineups keyed by week are read too
+    nested = {user_id: {3: lineup} for user_id, lineup in lineups.items()}
+    assert matchups.calculate_matchup_scores(3, ['user_0', 'user_1'], nested, points) == scores
+
+
+def test_ten_thousand_rosters_score_at_once(random_lineups):
+    manager = MatchDataManager()
+    lineups = random_lineups(manager.get_player_pool(), 10000)
+    roster_matrix = RosterMatrix(list(lineups), lineups)
+    points = roster_matrix.points_vector(manager.get_points_lookup())
+
+    scores = roster_matrix.score_vector(points)
+
+    assert roster_matrix.shape[0] == 10000 and len(scores) == 10000
+    weights = {'starter': 1, 'bench': 0}
+    for user_id in ('user_0', 'user_9999'):
+        expected = loop_score(lineups[user_id], manager.get_points_lookup(), weights)
+        assert scores[list(lineups).index(user_id)] == pytest.approx(expected)
+
+
+def loop_auto_sub_score(lineup, points, played, compatible):
+    """Reference auto-substitution, one roster at a time"""
+    players = lineup['players']
+    counted = [slot < 7 for slot in range(len(players))]
+    replaced = set()
+    for bench_slot in range(7, len(players)):
+        bench = players[bench_slot]
+        if not played.get((bench['player'], bench['team_code'])):
+            continue
+        for slot in range(7):
+            starter = players[slot]
+            if (slot not in replaced and not played.get((starter['player'], starter['team_code']))
+                    and bench['position'] in compatible[starter['position']]):
+                replaced.add(slot)
+                counted[slot], counted[bench_slot] = False, True
+                break
+    return sum(points.get((p['player'], p['team_code']), 0) for p, c in zip(players, counted) if c)
+
+
+def test_auto_sub_matches_per_roster_loop(random_lineups):
+    manager = MatchDataManager()
+    points = manager.get_points_lookup()
+    lineups = random_lineups(manager.get_player_pool(), 500, seed=1)
+    rng = np.random.default_rng(2)
+    played = {key: bool(rng.random() < 0.7) for key in points}
+    compatible = {'goalkeeper': ['goalkeeper'], 'center': ['center', 'field'], 'field': ['field', 'center']}
+
+    scores = RosterMatrix(list(lineups), lineups).score(points, played)
+
+    for user_id, lineup in lineups.items():
+        assert scores[user_id] == loop_auto_sub_score(lineup, points, played, compatible)
+
+
+def test_bench_replaces_compatible_starters_who_did_not_play():
+    def player(name, position):
+        return {'player': name, 'team_code': 'AAA', 'position': position}
+
+    starters = [player('gk', 'goalkeeper'), player('c', 'center')] + [player(f"f{i}", 'field') for i in range(5)]
+    lineup = {'players': starters + [player('bench_f', 'field'), player('bench_gk', 'goalkeeper')]}
+    everyone = {(p['player'], 'AAA') for p in lineup['players']}
+    roster_matrix = RosterMatrix(['u'], {'u': lineup})
+
+    # Goalkeeper and a field player have no row: both bench players come in
+    points = dict.fromkeys(everyone - {('gk', 'AAA'), ('f3', 'AAA')}, 10)
+    assert roster_matrix.score(points, points.keys())['u'] == 70
+    assert roster_matrix.substitutes[0].tolist() == [8, -1, -1, -1, -1, 7, -1]
+    assert roster_matrix.score(points)['u'] == 50
+
+    # A field player can't replace the goalkeeper, and a bench player who didn't play stays out
+    points = dict.fromkeys(everyone - {('gk', 'AAA'), ('bench_gk', 'AAA')}, 10)
+    assert roster_matrix.score(points, points.keys())['u'] == 60
+    assert (roster_matrix.substitutes == -1).all()
+
+
+def test_played_lookup_uses_minutes_when_recorded():
+    manager = MatchDataManager()
+    assert all(manager.get_played_lookup().values())
+
+    # Minutes arrive for one match, one of its players stays at 0 seconds
+    store = manager.store
+    rows = store.match_rows['nbg_jad']
+    frame = store.frame().iloc[rows]
+    benched = (frame['player'].iloc[0], frame['team_code'].iloc[0])
+    manager.apply_live_deltas([
+        {'match_id': 'nbg_jad', 'match_name': '', 'player': player, 'team_code': team_code,
+         'stats': {'seconds_played': 1920}}
+        for player, team_code in zip(frame['player'].iloc[1:], frame['team_code'].iloc[1:])
+    ])
+
+    played = manager.get_played_lookup()
+    assert played[benched] is False
+    assert sum(not value for value in played.values()) == 1
@@ -0,0 +1,78 @@
+# Tests/test_schedule.py
+import time
+
+import numpy as np
+import pytest
+
+from App.matchup_manager import MatchupManager
+from App.schedule import BYE, SeasonSchedule, generate_schedules, round_robin_template
+
+
+@pytest.mark.parametrize('n_teams', [2, 3, 4, 7, 10, 13])
+def test_every_pair_meets_once_with_balanced_byes_and_venues(n_teams):
+    pairs = round_robin_template(n_teams)
+    games = pairs[(pairs >= 0).all(axis=-1)]
+
+    met = {frozenset(game) for game in games.tolist()}
+    assert len(games) == len(met) == n_teams * (n_teams - 1) // 2
+    for week in pairs:
+        teams = week[week >= 0]
+        assert len(teams) == len(set(teams.tolist())) == n_teams
+
+    byes = pairs[pairs[..., 1] == BYE][:, 0]
+    assert sorted(byes.tolist()) == (list(range(n_teams)) if n_teams % 2 else [])
+
+    home = np.bincount(games[:, 0], minlength=n_teams)
+    away = np.bincount(games[:, 1], minlength=n_teams)
+    assert np.abs(home - away).max() <= 1
+
+
+def test_double_round_robin_swaps_venues():
+    single = round_robin_template(6)
+    double = round_robin_template(6, double=True)
+    assert len(double) == 2 * len(single)
+    assert np.array_equal(double[len(single):], single[..., ::-1])
+
+
+def test_week_and_user_lookups():
+    users = [f"user_{i}" for i in range(5)]
+    schedule = SeasonSchedule.generate(users, start_week=2)
+
+    assert schedule.week_matchups(1) == []
+    for week in range(2, 2 + 2 * schedule.n_weeks):
+        week_matchups = schedule.week_matchups(week)
+        assert sum(m['is_bye'] for m in week_matchups) == 1
+        for user_id in users:
+            matchup = schedule.user_matchup(user_id, week)
+            assert user_id in (matchup['team1'], matchup['team2'])
+            assert {k: v for k, v in matchup.items() if k != 'created_at'} in [
+                {k: v for k, v in m.items() if k != 'created_at'} for m in week_matchups]
+
+
+def test_manager_reads_weeks_from_schedule():
+    manager = MatchupManager()
+    users = ['a', 'b', 'c', 'd']
+    manager.create_season_schedule(users, seed=1)
+
+    pairings = {week: {frozenset((m['team1'], m['team2'])) for m in manager.get_weekly_matchups(week)}
+                for week in (1, 2, 3)}
+    assert len(set.union(*pairings.values())) == 6
+
+    # Created weeks come from the stored matchups, the rest from the schedule
+    manager.add_matchups(manager.create_round_robin_matchups(users, 1))
+    assert manager.get_weekly_matchups(1)[0] is manager.matchups[0]
+    scheduled = manager.schedule.user_matchup('a', 2)
+    assert manager.get_user_matchup('a', 2)['team2'] == scheduled['team2']
+
+
+def test_thousands_of_leagues_share_templates():
+    leagues = {league: [f"{league}_{i}" for i in range(8 + league % 5)] for league in range(5000)}
+
+    start = time.perf_counter()
+    schedules = generate_schedules(leagues, double=True, seed=0)
+    elapsed = time.perf_counter() - start
+
+    assert len(schedules) == 5000
+    assert schedules[0].pairings is schedules[5].pairings
+    assert schedules[0].user_ids != leagues[0]
+    assert elapsed < 2.0
@@ -0,0 +1,89 @@
+# Tests/test_scraper_metrics.py
+import json
+import urllib.request
+
+import pytest
+
+from App.request_layer import RequestFailed
+from App.scraper import LENScraper
+from App.scraper_metrics import Histogram, ScraperMetrics
+from Tests.test_fetching import MatchPageServer
+from Tests.test_parsing import MATCH_URL, expected_rows, read_stats_page
+from Tests.test_request_layer import FaultServer
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('h', 'help', (1, 5))
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value)
+
+    samples = {(name, labels.get('le')): value for name, labels, value in histogram.samples()}
+    assert samples[('h_bucket', '1')] == 2
+    assert samples[('h_bucket', '5')] == 3
+    assert samples[('h_bucket', '+Inf')] == 4
+    assert samples[('h_count', None)] == 4
+    assert samples[('h_sum', None)] == 14.5
+
+
+def test_requests_record_phases_and_size():
+    metrics = ScraperMetrics()
+    with MatchPageServer(etag=None) as server:
+        scraper = LENScraper(base_url=server.base_url, metrics=metrics)
+        urls = [server.match_url(game) for game in (1, 2)]
+        results = list(scraper.fetch_match_pages(urls, max_workers=1))
+
+    host = server.base_url.split('//')[1]
+    assert metrics.requests.value(host=host, status=200) == 2
+    assert metrics.response_bytes.count() == 2
+    assert metrics.response_bytes.snapshot()[0]['sum'] == sum(len(content) for _, content, _ in results)
+    for phase in ('total', 'connect', 'tls', 'wait', 'transfer'):
+        assert metrics.request_seconds.count(phase=phase) == 2
+    # The second request reuses the pooled connection
+    connect = metrics.request_seconds.snapshot()[0]
+    assert connect['labels'] == {'phase': 'connect'} and connect['sum'] > 0
+
+
+def test_retries_and_failures_counted():
+    metrics = ScraperMetrics()
+    with FaultServer({'/page': [503] * 10}) as server:
+        scraper = LENScraper(base_url=server.base_url, max_retries=2, metrics=metrics)
+        scraper.requests.backoff_base = 0.01
+        with pytest.raises(RequestFailed):
+            scraper.requests.get(f"{server.base_url}/page")
+
+    host = server.base_url.split('//')[1]
+    assert metrics.requests.value(host=host, status=503) == 3
+    assert metrics.retries.value(host=host) == 2
+    assert metrics.failures.value(host=host, reason='http_503') == 1
+
+
+def test_parse_records_tables_and_rows_per_team():
+    metrics = ScraperMetrics()
+    scraper = LENScraper(metrics=metrics)
+    scraper.parse_match_html(read_stats_page(), MATCH_URL)
+    scraper.parse_match_html(b'<html><body>no stats</body></html>', MATCH_URL)
+
+    assert metrics.parse_seconds.count() == 2
+    assert metrics.tables_found.snapshot()[0]['sum'] == 4
+    assert metrics.rows_extracted.value(team='NBG') == len(expected_rows('NBG'))
+    assert metrics.rows_extracted.value(team='JAD') == len(expected_rows('JAD'))
+    assert metrics.pages_parsed.value(outcome='rows') == 1
+    assert metrics.pages_parsed.value(outcome='empty') == 1
+
+
+def test_exposition_endpoints():
+    metrics = ScraperMetrics()
+    metrics.observe_parse(0.02, 4, {'NBG': 14})
+    server = metrics.serve(port=0)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        text = urllib.request.urlopen(f"{base}/metrics").read().decode()
+        snapshot = json.loads(urllib.request.urlopen(f"{base}/metrics.json").read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert '# TYPE scraper_parse_seconds histogram' in text
+    assert 'scraper_parse_seconds_bucket{le="0.025"} 1' in text
+    assert 'scraper_rows_extracted_total{team="NBG"} 14' in text
+    assert snapshot['scraper_rows_extracted_total'] == [{'labels': {'team': 'NBG'}, 'value': 14}]
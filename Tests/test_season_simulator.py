@@ -0,0 +1,76 @@
+# Tests/test_season_simulator.py
+import pandas as pd
+import pytest
+
+from App.matchup_manager import MatchupManager
+from App.season_simulator import SeasonSimulator
+
+
+def roster(points):
+    """Lineup of players named after their projected points"""
+    return {'players': [{'player': f"p{points}_{slot}", 'team_code': 'AAA'} for slot in range(9)]}
+
+
+def projections(means, sd=2.0):
+    keys = [(f"p{mean}_{slot}", 'AAA') for mean in means for slot in range(9)]
+    return pd.DataFrame({'player': [key[0] for key in keys], 'team_code': [key[1] for key in keys],
+                         'projected_points': [float(key[0][1:].split('_')[0]) for key in keys],
+                         'points_std': sd})
+
+
+class League:
+    """The parts of FantasyLeague the simulator reads, without a Streamlit session"""
+
+    def __init__(self, strengths):
+        self.users = {user_id: {'name': user_id, 'team_name': user_id, 'lineups': {1: roster(points)}}
+                      for user_id, points in strengths.items()}
+        self.matchup_manager = MatchupManager()
+
+    def get_standings(self):
+        return self.matchup_manager.get_standings(self.users, self.matchup_manager.matchups)
+
+
+def test_odds_are_probabilities_and_favor_stronger_rosters():
+    strengths = {'a': 6, 'b': 5.5, 'c': 5, 'd': 4.5, 'e': 4, 'f': 3.5}
+    league = League(strengths)
+    league.matchup_manager.create_season_schedule(list(strengths), seed=3)
+
+    odds = SeasonSimulator.for_league(league, projections(strengths.values(), sd=3.0)).simulate(trials=4000, seed=0)
+
+    assert sum(o['playoff_odds'] for o in odds.values()) == pytest.approx(4)
+    assert sum(o['title_odds'] for o in odds.values()) == pytest.approx(1)
+    assert odds['a']['title_odds'] > odds['c']['title_odds'] > odds['f']['title_odds']
+    # Five remaining weeks of three games, each with one winner
+    assert sum(o['mean_wins'] for o in odds.values()) == pytest.approx(3 * 5, abs=0.05)
+    assert odds['a']['mean_points'] == pytest.approx(5 * 7 * 6, rel=0.02)
+
+
+def test_played_weeks_count_and_decided_seasons_are_certain():
+    league = League({'a': 5, 'b': 5})
+    manager = league.matchup_manager
+    manager.create_season_schedule(['a', 'b'])
+    manager.add_matchups(manager.create_round_robin_matchups(['a', 'b'], 1))
+    version = manager.score_version
+    manager.calculate_matchup_scores(1, ['a', 'b'], {'a': roster(5), 'b': {'players': []}},
+                                     {key: 5 for key in zip(projections([5])['player'], ['AAA'] * 9)})
+
+    # Cached odds (FantasyLeague.get_playoff_odds) are keyed on the score version
+    assert manager.score_version == version + 1
+
+    simulator = SeasonSimulator.for_league(league, projections([5]), playoff_teams=1)
+    assert simulator.sim['n_weeks'] == 0
+    odds = simulator.simulate(trials=100, seed=0)
+    # One playoff seed: the decided leader takes it and the title
+    assert odds['a'] == {'playoff_odds': 1.0, 'title_odds': 1.0, 'mean_wins': 1.0, 'mean_points': 35.0}
+    assert odds['b']['playoff_odds'] == 0.0 and odds['b']['title_odds'] == 0.0
+
+
+def test_same_seed_same_odds_across_workers():
+    strengths = {f"u{i}": 2 + i for i in range(8)}
+    league = League(strengths)
+    league.matchup_manager.create_season_schedule(list(strengths), double=True, seed=1)
+    simulator = SeasonSimulator.for_league(league, projections(strengths.values()))
+
+    single = simulator.simulate(trials=20000, seed=7, workers=1)
+    assert simulator.simulate(trials=20000, seed=7, workers=2) == single
+
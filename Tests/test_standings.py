@@ -0,0 +1,89 @@
+# Tests/test_standings.py
+import random
+
+from App.matchup_manager import MatchupManager
+from App.standings import StandingsLedger
+
+
+def full_recompute(users, scores, matchups):
+    """Standings the way get_standings computed them before the ledger"""
+    standings = []
+    for user_id, user_data in users.items():
+        total_points = sum(week_scores[user_id] for week_scores in scores.values() if user_id in week_scores)
+        wins = losses = 0
+        for m in matchups:
+            if not (m.get('completed') and m.get('team2')) or user_id not in (m['team1'], m['team2']):
+                continue
+            mine, theirs = ('team1_score', 'team2_score') if m['team1'] == user_id else ('team2_score', 'team1_score')
+            wins += m[mine] > m[theirs]
+            losses += m[mine] < m[theirs]
+        standings.append({'user_id': user_id, 'name': user_data['name'], 'team_name': user_data['team_name'],
+                          'total_points': total_points, 'wins': wins, 'losses': losses,
+                          'win_pct': wins / max(wins + losses, 1)})
+    standings.sort(key=lambda x: (x['wins'], x['total_points']), reverse=True)
+    return standings
+
+
+def league(n_users):
+    return {f"user_{i}": {'name': f"Manager {i}", 'team_name': f"Team {i}"} for i in range(n_users)}
+
+
+def play_week(manager, users, week, rng):
+    manager.add_matchups(manager.create_round_robin_matchups(list(users), week))
+    lineups = {user_id: [{'player': f"P{rng.randrange(6)}", 'team_code': 'NBG'}] for user_id in users}
+    points = {(f"P{i}", 'NBG'): rng.randrange(0, 4) for i in range(6)}
+    manager.calculate_matchup_scores(week, list(users), lineups, points)
+
+
+def test_ledger_tracks_full_recompute_week_by_week():
+    rng = random.Random(3)
+    users = league(7)
+    manager = MatchupManager()
+    manager.get_standings(users, manager.matchups)
+
+    for week in range(1, 6):
+        order = list(users)
+        rng.shuffle(order)
+        play_week(manager, {user_id: users[user_id] for user_id in order}, week, rng)
+        assert manager.get_standings(users, manager.matchups) == full_recompute(users, manager.scores,
+                                                                                 manager.matchups)
+
+
+def test_score_correction_replaces_earlier_result():
+    users = league(2)
+    ledger = StandingsLedger(users)
+    matchup = {'week': 1, 'team1': 'user_0', 'team2': 'user_1', 'team1_score': 30, 'team2_score': 20,
+               'completed': True}
+    ledger.record_score(1, 'user_0', 30)
+    ledger.record_score(1, 'user_1', 20)
+    ledger.record_matchup(matchup)
+    assert ledger.rank('user_0') == 1
+
+    # Stat correction: user_1 actually scored 35
+    ledger.record_score(1, 'user_1', 35)
+    ledger.record_matchup(dict(matchup, team2_score=35))
+
+    first, second = ledger.standings()
+    assert (first['user_id'], first['wins'], first['losses'], first['total_points']) == ('user_1', 1, 0, 35)
+    assert (second['user_id'], second['wins'], second['losses'], second['total_points']) == ('user_0', 0, 1, 30)
+    assert ledger.rank('user_0') == 2
+
+
+def test_standings_cached_until_an_update():
+    ledger = StandingsLedger(league(3))
+    table = ledger.standings()
+    assert ledger.standings() is table
+
+    ledger.record_score(1, 'user_2', 5)
+    assert ledger.standings() is not table
+    assert ledger.standings()[0]['user_id'] == 'user_2'
+
+
+def test_new_user_rebuilds_ledger():
+    users = league(2)
+    manager = MatchupManager()
+    manager.scores = {1: {'user_0': 10, 'user_1': 12}}
+    assert [row['user_id'] for row in manager.get_standings(users, [])] == ['user_1', 'user_0']
+
+    users['user_2'] = {'name': 'New', 'team_name': 'New Team'}
+    assert len(manager.get_standings(users, [])) == 3
@@ -0,0 +1,81 @@
+# benchmark_parsers.py
+"""
+Parse benchmark for the HTML parser backends
+
+Parses a saved match stats page repeatedly with every installed backend
+through the scraper's own parse (tree build, header-driven table extraction,
+goalkeeper merge) and reports ms per page, player rows and peak memory.
+Each backend runs in its own process so peak RSS isn't shared between them.
+
+Usage: python benchmark_parsers.py [iterations] [html_file] [match_url]
+"""
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from multiprocessing import get_context
+
+from App.html_backends import available_backends
+from App.scraper import LENScraper
+from App.scraper_metrics import ScraperMetrics
+
+# Stats page of NBG - JAD (27 player rows) and the URL it was saved from
+DEFAULT_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Tests', 'fixtures', 'match_stats.html')
+DEFAULT_URL = ("https://championsleague.europeanaquatics.org/match-details-2526/"
+               "?c=ASM&g=1&t=A01&gr=2&s1=NBG&s2=JAD&st=2&sch=02122025")
+
+
+def parse_once(scraper, content, match_url):
+    """The scraper's full page parse, {column: values}"""
+    return scraper.parse_match_columns(content, match_url)
+
+
+def run_backend(name, content, match_url, iterations):
+    scraper = LENScraper(parser=name, metrics=ScraperMetrics())
+    columns = parse_once(scraper, content, match_url)  # warm up
+    if not columns.get('player'):
+        raise ValueError(f"{name}: no player rows extracted, not a match stats page?")
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        columns = parse_once(scraper, content, match_url)
+    elapsed = time.perf_counter() - start
+
+    # Python-heap peak of a single parse (C parsers keep their tree outside it)
+    tracemalloc.start()
+    parse_once(scraper, content, match_url)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'backend': name,
+        'ms_per_page': elapsed * 1000 / iterations,
+        'rows': len(columns['player']),
+        'traced_peak_kb': traced_peak / 1024,
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def benchmark(iterations=300, html_file=DEFAULT_PAGE, match_url=DEFAULT_URL):
+    with open(html_file, 'rb') as f:
+        content = f.read()
+
+    results = []
+    ctx = get_context('spawn')
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for name in available_backends():
+            results.append(pool.apply(run_backend, (name, content, match_url, iterations)))
+    return results
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    html_file = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PAGE
+    match_url = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_URL
+
+    print(f"Parsing {html_file} ({os.path.getsize(html_file) / 1024:.0f} KB) x {iterations}")
+    print(f"{'backend':<12} {'ms/page':>9} {'rows':>7} {'py peak KB':>11} {'max RSS KB':>11}")
+    for result in benchmark(iterations, html_file, match_url):
+        print(f"{result['backend']:<12} {result['ms_per_page']:>9.2f} {result['rows']:>7} "
+              f"{result['traced_peak_kb']:>11.0f} {result['max_rss_kb']:>11}")
@@ -0,0 +1,104 @@
+# benchmark_scoring.py
+"""
+Timing benchmark for the vectorised scoring paths
+
+Kept out of the unit tests so wall-clock limits don't make CI flaky. Times
+batch lineup solving, sparse roster scoring and the Monte Carlo season
+simulation on the built-in Week 1 pool and reports ms per run next to the
+budget each path is expected to stay under.
+
+Usage: python benchmark_scoring.py [repeats]
+"""
+import sys
+import time
+
+import numpy as np
+
+from App.data_manager import MatchDataManager
+from App.lineup_solver import LineupSolver
+from App.roster_scoring import RosterMatrix
+from App.schedule import SeasonSchedule
+from App.season_simulator import SeasonSimulator
+
+
+def random_lineups(pool, n_users, seed=0):
+    """n_users lineups of nine random pool players"""
+    rng = np.random.default_rng(seed)
+    players = pool[['player', 'team_code', 'position']].to_dict('records')
+    return {f"user_{i}": {'players': [players[j] for j in rng.choice(len(players), 9, replace=False)]}
+            for i in range(n_users)}
+
+
+def time_best(run, repeats):
+    """Best wall-clock seconds of repeats calls"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_lineup_batch(manager, teams=5000):
+    pool = manager.get_player_pool().drop_duplicates(['player', 'team_code']).reset_index(drop=True)
+    solver = LineupSolver()
+    position_codes = pool['position'].map({p: i for i, p in enumerate(solver.positions)}).to_numpy()
+    projections = np.random.default_rng(0).gamma(2.0, 3.0, size=(teams, len(pool)))
+
+    def run():
+        starters, _, _ = solver.solve_batch(position_codes, projections)
+        assert starters.shape == (teams, 7)
+    return run
+
+
+def bench_roster_scores(manager, users=10000):
+    lineups = random_lineups(manager.get_player_pool(), users)
+    roster_matrix = RosterMatrix(list(lineups), lineups)
+    points = roster_matrix.points_vector(manager.get_points_lookup())
+
+    def run():
+        assert len(roster_matrix.score_vector(points)) == users
+    return run
+
+
+def bench_season_simulation(manager, users=8, trials=20000):
+    user_ids = [f"user_{i}" for i in range(users)]
+    rosters = random_lineups(manager.get_player_pool(), users)
+    schedule = SeasonSchedule.generate(user_ids, double=True, seed=1)
+    remaining = [[(user_ids[home], user_ids[away]) for home, away in schedule.week_pairings(week).tolist()]
+                 for week in range(1, schedule.n_weeks + 1)]
+    simulator = SeasonSimulator(user_ids, {}, {}, remaining, rosters, manager.get_projections())
+
+    def run():
+        assert len(simulator.simulate(trials=trials, seed=7, workers=1)) == users
+    return run
+
+
+# (name, setup, budget in seconds)
+BENCHMARKS = [
+    ('lineup solve_batch, 5000 teams', bench_lineup_batch, 2.0),
+    ('roster scores, 10000 rosters', bench_roster_scores, 0.05),
+    ('season simulation, 20000 trials', bench_season_simulation, 5.0),
+]
+
+
+def benchmark(repeats=5):
+    manager = MatchDataManager()
+    results = []
+    for name, setup, budget in BENCHMARKS:
+        run = setup(manager)
+        run()  # warm up
+        results.append({'name': name, 'seconds': time_best(run, repeats), 'budget': budget})
+    return results
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"{'benchmark':<36} {'ms':>10} {'budget ms':>10}")
+    over = 0
+    for result in benchmark(repeats):
+        status = '' if result['seconds'] <= result['budget'] else '  OVER BUDGET'
+        over += bool(status)
+        print(f"{result['name']:<36} {result['seconds'] * 1000:>10.2f} {result['budget'] * 1000:>10.0f}{status}")
+    sys.exit(1 if over else 0)
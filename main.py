@@ -61,12 +61,26 @@ with st.sidebar:
     if 'refresh_counter' not in st.session_state:
         st.session_state.refresh_counter = 0
     if st.button("🔄 **Refresh Data**", type="primary", use_container_width=True):
-        st.session_state.refresh_counter += 1
+        # Incremental: only new, live or changed matches of the week are fetched and parsed
+        with st.spinner("Checking for new match stats..."):
+            updated = data_manager.refresh_week(current_week)
+        if updated:
+            st.session_state.refresh_counter += 1
+        st.session_state.refresh_note = (f"Updated {len(updated)} match(es)" if updated
+                                         else "No new match stats")
         st.rerun()
+    if 'refresh_note' in st.session_state:
+        st.caption(st.session_state.refresh_note)
+
+
+# Only the selected week is read from match storage (no-op when it isn't stored)
+data_manager.load_weeks([current_week])
+if selected_match_id != "all" and data_manager.get_match_info(selected_match_id) is None:
+    selected_match_id = "all"
 
 
 @st.cache_data
-def load_selected_match_data(match_id, refresh_counter=0):
+def load_selected_match_data(match_id, week, refresh_counter=0):
     # Add cache version to ensure fresh data on restart
     _ = CACHE_VERSION
     if match_id == "all":
@@ -75,13 +89,13 @@ def load_selected_match_data(match_id, refresh_counter=0):
         return data_manager.get_match_dataframe(match_id)
 
 @st.cache_data
-def load_player_pool(refresh_counter=0):
+def load_player_pool(week, refresh_counter=0):
     _ = CACHE_VERSION
     return data_manager.get_player_pool()
 
 # Load data
-match_data = load_selected_match_data(selected_match_id, st.session_state.refresh_counter)
-player_pool = load_player_pool(st.session_state.refresh_counter)
+match_data = load_selected_match_data(selected_match_id, current_week, st.session_state.refresh_counter)
+player_pool = load_player_pool(current_week, st.session_state.refresh_counter)
 
 
 # Display match info
@@ -304,9 +318,11 @@ with tab3:
 
     # Calculate scores button
     if st.button("📊 Calculate Week Scores", type="primary", key="calc_scores_btn"):
-        player_points = lineup_manager.get_player_points_dict(match_data)
+        player_points = data_manager.get_points_lookup(selected_match_id)
         if player_points:
-            weekly_scores = league_manager.calculate_weekly_scores(week_to_view, player_points)
+            # Same played lookup as the league page, so auto-subs give the same scores
+            weekly_scores = league_manager.calculate_weekly_scores(week_to_view, player_points,
+                                                                   data_manager.get_played_lookup())
             st.success(f"✅ Calculated scores for {len(weekly_scores)} teams!")
 
     # Show matchups
@@ -364,9 +380,10 @@ def render_matchup_display_with_scores():
     col_calc, col_gen = st.columns(2)
     with col_calc:
         if st.button("📊 Calculate Week Scores", type="primary", use_container_width=True, key="calc_scores_btn"):
-            player_points = lineup_manager.get_player_points_dict(match_data)
+            player_points = data_manager.get_points_lookup(selected_match_id)
             if player_points:
-                weekly_scores = league_manager.calculate_weekly_scores(week_to_view, player_points)
+                weekly_scores = league_manager.calculate_weekly_scores(week_to_view, player_points,
+                                                                       data_manager.get_played_lookup())
                 st.success(f"✅ Calculated scores for {len(weekly_scores)} teams!")
                 st.rerun()
 